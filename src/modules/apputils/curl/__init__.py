@@ -17,19 +17,22 @@
 #
 #
 
-import re, json, base64, gzip, zlib
+import re, base64, codecs
 
 from datetime import datetime, timezone
-from io import BytesIO
+from io import BufferedReader, BytesIO
 from enum import Enum
 from asyncio.events import AbstractEventLoop
-from typing import Dict, IO, Mapping, Optional, Tuple, List, Union
+from typing import Callable, Dict, IO, Iterator, Mapping, Optional, Tuple, List, Union
 from http.client import HTTPResponse
 from urllib.request import HTTPPasswordMgrWithDefaultRealm, HTTPBasicAuthHandler, HTTPRedirectHandler, Request, \
   build_opener
 from urllib.error import URLError, HTTPError
 from urllib.parse import urlencode
 
+from ..jsonbackend import loads as json_loads, dumpb as json_dumpb
+from .stream import DEFAULT_CHUNK_SIZE, DecompressingReader, content_codec, decompress
+
 
 class CurlRequestType(Enum):
   GET = "GET"
@@ -89,15 +92,32 @@ class CURLCookie(object):
 
 
 class CURLResponse(object):
-  def __init__(self, director_open_result: Union[HTTPResponse, HTTPError], is_stream: bool = False):
+  def __init__(self, director_open_result: Union[HTTPResponse, HTTPError], is_stream: bool = False,
+               release: Callable[[bool], None] = None):
+    """
+    :param director_open_result: response of the server
+    :param is_stream: do not read the content, it would be read from the stream or raw properties instead
+    :param release: called once the response body was read or the stream closed, with flag if the connection
+                    could be re-used for another request (the body was read completely)
+    """
     self._code: int = director_open_result.getcode()
     self._headers: Dict[str, Union[str, List[str]]] = self._parse_headers(director_open_result.info())
     self._content_encoding: Union[None, str] = None
     self._is_stream = is_stream
     self._director_result = director_open_result
+    self._release: Optional[Callable[[bool], None]] = release
+    self._stream: Optional[BufferedReader] = None
 
     if not self._is_stream:
-      self._content = director_open_result.read()
+      try:
+        self._content = director_open_result.read()
+      finally:
+        self.__release(release is not None and director_open_result.isclosed())
+
+  def __release(self, reusable: bool):
+    if self._release is not None:
+      release, self._release = self._release, None
+      release(reusable)
 
   def __decode_response(self, data: Union[bytes, str]) -> Union[bytes, str]:
     data = self.__decode_compressed(data)
@@ -107,15 +127,18 @@ class CURLResponse(object):
       return data
 
   def __decode_compressed(self, data: Union[bytes, str]) -> bytes:
-    if isinstance(data, bytes) and "Content-Encoding" in self._headers:
-
-      if "gzip" in self._headers["Content-Encoding"] or 'x-gzip' in self._headers["Content-Encoding"]:
-        data = gzip.GzipFile(fileobj=BytesIO(data)).read()
-      elif "deflate" in self._headers["Content-Encoding"]:
-        data = zlib.decompress(data)
+    if isinstance(data, bytes):
+      return decompress(data, self.__codec)
 
     return data
 
+  @property
+  def __codec(self) -> Optional[str]:
+    content_encoding = self._headers.get("Content-Encoding")
+    if isinstance(content_encoding, list):
+      content_encoding = ", ".join(content_encoding)
+    return content_codec(content_encoding)
+
   @property
   def content_encoding(self) -> str:
     if self._content_encoding is not None:
@@ -162,20 +185,66 @@ class CURLResponse(object):
     if not self._is_stream:
       return
 
+    reusable = False  # unknown, if the stream was read till the end before it was closed outside
     if not self._director_result.closed:
+      reusable = self._director_result.isclosed()  # http.client response releases the socket at the end of body
       self._director_result.close()
+    if self._stream is not None:
+      self._stream.close()
+
+    self.__release(reusable)
 
   @property
   def raw(self) -> Union[str, HTTPResponse]:
     return self.content
 
+  @property
+  def stream(self) -> BufferedReader:
+    """
+    File-like object with decompressed body of the response. In the stream mode the body is read from the server
+    and inflated on demand, call close_stream() once done.
+    """
+    if not self._is_stream:
+      return BufferedReader(DecompressingReader(BytesIO(self._content), self.__codec), DEFAULT_CHUNK_SIZE)
+
+    if self._stream is None:
+      self._stream = BufferedReader(DecompressingReader(self._director_result, self.__codec), DEFAULT_CHUNK_SIZE)
+    return self._stream
+
+  def iter_content(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Read decompressed body of the response by chunks, the stream is closed at the end
+    """
+    stream = self.stream
+    try:
+      while chunk := stream.read1(chunk_size):
+        yield chunk
+    finally:
+      self.close_stream()
+
+  def iter_lines(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Read decompressed body of the response line by line, without the line endings
+    """
+    decoder = codecs.getincrementaldecoder(self.content_encoding)()
+    tail = ""
+    for chunk in self.iter_content(chunk_size):
+      lines = (tail + decoder.decode(chunk)).split("\n")
+      tail = lines.pop()
+      for line in lines:
+        yield line[:-1] if line.endswith("\r") else line
+
+    tail += decoder.decode(b"", final=True)
+    if tail:
+      yield tail[:-1] if tail.endswith("\r") else tail
+
   def from_json(self) -> Union[Dict, None]:
     """
     :return: Return parsed json object from the response, if possible.
              If operation fail, will be returned None
     """
     try:
-      return json.loads(self.content)
+      return json_loads(self.content)
     except ValueError:
       return None
 
@@ -257,7 +326,7 @@ def __detect_str_type(data) -> str:
 
 def __parse_content(data) -> Tuple[bytes, Dict[str, str]]:
   if isinstance(data, dict) or isinstance(data, list) or isinstance(data, set) or isinstance(data, tuple):
-    response_data = __encode_str(json.dumps(data))
+    response_data = json_dumpb(data, fast=True)  # formatting of the request body does not matter
     response_headers = {"Content-Type": "application/json; charset=UTF-8"}
   elif type(data) is str:
     response_data = __encode_str(data)
@@ -282,40 +351,40 @@ async def curl_async(loop: AbstractEventLoop,
                      timeout: int = None,
                      use_gzip: bool = True,
                      use_stream: bool = False,
-                     follow_redirect: bool = True) -> CURLResponse:
+                     follow_redirect: bool = True,
+                     session: Union["AsyncCurlSession", "CurlSession"] = None) -> CURLResponse:
+  """
+  Make request to web resource on the event loop, arguments are the same as for curl()
+
+  By default the request is made by curl() in the loop executor, over the keep-alive connection if CurlSession
+  passed. With AsyncCurlSession the request is made natively with asyncio streams on the loop thread (see
+  apputils.curl.aio), which doesn't need executor threads, but doesn't use the proxy environment variables.
+  """
+  from .aio import AsyncCurlSession
+
+  if isinstance(session, AsyncCurlSession):
+    return await session.request(url, params, auth, req_type, data, headers, cookies, timeout, use_gzip, use_stream,
+                                 follow_redirect)
+
   return await loop.run_in_executor(
     None,
     curl,
-    url, params, auth, req_type, data, headers, cookies, timeout, use_gzip, use_stream, follow_redirect
+    url, params, auth, req_type, data, headers, cookies, timeout, use_gzip, use_stream, follow_redirect, session
   )
 
 
-def curl(url: str,
-         params: Dict[str, str] = None,
-         auth: CURLAuth = None,
-         req_type: CurlRequestType = CurlRequestType.GET,
-         data: Union[str, bytes, dict] = None,
-         headers: Dict[str, str] = None,
-         cookies: List[CURLCookie] = None,
-         timeout: int = None,
-         use_gzip: bool = True,
-         use_stream: bool = False,
-         follow_redirect: bool = True) -> CURLResponse:
+def _prepare_request(url: str,
+                     params: Dict[str, str] = None,
+                     auth: CURLAuth = None,
+                     req_type: CurlRequestType = CurlRequestType.GET,
+                     data: Union[str, bytes, dict] = None,
+                     headers: Dict[str, str] = None,
+                     cookies: List[CURLCookie] = None,
+                     use_gzip: bool = True) -> Tuple[str, Dict[str, str], Optional[bytes]]:
   """
-  Make request to web resource
+  Build final url, request headers and body, see curl() for the arguments
 
-  :param cookies: list of cookies to send alongside with the request
-  :param url: Url to endpoint
-  :param params: list of params after "?"
-  :param auth: authorization tokens
-  :param req_type: column_type of the request
-  :param data: data which need to be posted
-  :param headers: headers which would be posted with request
-  :param timeout: Request timeout
-  :param use_gzip: Accept gzip and deflate response from the server
-  :param use_stream: Do not parse content of response ans stream it via raw property
-  :param follow_redirect Do follow HTTP redirects or not
-  :return Response object
+  :return: url, headers, body
   """
   post_req = [CurlRequestType.POST, CurlRequestType.PUT]
   get_req = [CurlRequestType.GET, CurlRequestType.DELETE]
@@ -327,16 +396,12 @@ def curl(url: str,
     raise IOError("Wrong request column_type \"%s\" passed" % req_type)
 
   _headers = {}
-  handler_chain = []
-  req_args = {
-    "headers": _headers
-  }
+  _data = None
 
   if req_type in post_req and data is not None:
     _data, __header = __parse_content(data)
     _headers.update(__header)
     _headers["Content-Length"] = len(_data)
-    req_args["data"] = _data
 
   if use_gzip:
     if "Accept-Encoding" in _headers:
@@ -345,11 +410,6 @@ def curl(url: str,
     else:
       _headers["Accept-Encoding"] = "gzip, x-gzip, deflate"
 
-  if auth is not None and auth.force is False:
-    manager = HTTPPasswordMgrWithDefaultRealm()
-    manager.add_password("", url, auth.user, auth.password)
-    handler_chain.append(HTTPBasicAuthHandler(manager))
-
   if auth is not None and auth.force:
     _headers.update(auth.headers)
 
@@ -363,6 +423,55 @@ def curl(url: str,
 
     _headers["cookie"] = "; ".join(temp_cookies)
 
+  return url, _headers, _data
+
+
+def curl(url: str,
+         params: Dict[str, str] = None,
+         auth: CURLAuth = None,
+         req_type: CurlRequestType = CurlRequestType.GET,
+         data: Union[str, bytes, dict] = None,
+         headers: Dict[str, str] = None,
+         cookies: List[CURLCookie] = None,
+         timeout: int = None,
+         use_gzip: bool = True,
+         use_stream: bool = False,
+         follow_redirect: bool = True,
+         session: "CurlSession" = None) -> CURLResponse:
+  """
+  Make request to web resource
+
+  :param cookies: list of cookies to send alongside with the request
+  :param url: Url to endpoint
+  :param params: list of params after "?"
+  :param auth: authorization tokens
+  :param req_type: column_type of the request
+  :param data: data which need to be posted
+  :param headers: headers which would be posted with request
+  :param timeout: Request timeout
+  :param use_gzip: Accept gzip and deflate response from the server
+  :param use_stream: Do not parse content of response ans stream it via raw property
+  :param follow_redirect Do follow HTTP redirects or not
+  :param session: send the request over persistent connection of the session (see apputils.curl.pool)
+  :return Response object
+  """
+  if session is not None:
+    return session.request(url, params, auth, req_type, data, headers, cookies, timeout, use_gzip, use_stream,
+                           follow_redirect)
+
+  url, _headers, _data = _prepare_request(url, params, auth, req_type, data, headers, cookies, use_gzip)
+  handler_chain = []
+  req_args = {
+    "headers": _headers
+  }
+  if _data is not None:
+    req_args["data"] = _data
+
+  if auth is not None and auth.force is False:
+    manager = HTTPPasswordMgrWithDefaultRealm()
+    manager.add_password("", url, auth.user, auth.password)
+    handler_chain.append(HTTPBasicAuthHandler(manager))
+
   if not follow_redirect:
     handler_chain.append(HTTPRedirectFilter)
 
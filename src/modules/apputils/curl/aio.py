@@ -0,0 +1,324 @@
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Github: https://github.com/hapylestat/apputils
+#
+#
+
+"""
+Native asyncio HTTP/1.1 client for curl_async(), used when AsyncCurlSession is passed.
+
+Requests are made over asyncio streams on the event loop thread itself, so thousands of concurrent requests do
+not need thousand of executor threads. AsyncCurlSession keeps per-host pool of keep-alive connections:
+
+  async with AsyncCurlSession(max_per_host=50) as session:
+    responses = await asyncio.gather(*(curl_async(loop, url, session=session) for url in urls))
+
+Connections are made directly to the hosts, HTTP_PROXY/HTTPS_PROXY environment variables are not used. The
+response body is read completely (plain, Content-Length or chunked) before the response is returned, so with
+use_stream=True it is still buffered in memory; use curl_async() without the session for large downloads. The
+content decompression (gzip/deflate) is done by CURLResponse the same way as for curl().
+"""
+
+import asyncio
+import ssl
+import time
+
+from http.client import HTTPException, HTTPMessage, parse_headers
+from io import BytesIO
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from . import CURLAuth, CURLCookie, CURLResponse, CurlRequestType, _prepare_request
+from .pool import HostKey, _DEFAULT_PORTS, _IDEMPOTENT_METHODS, _split_url, _follow_up, _auth_headers
+
+_NO_BODY_CODES = (204, 304)
+_MAX_LINE = 65536
+
+
+class _BufferedResponse(BytesIO):
+  """
+  Response with already received body, provides the part of HTTPResponse interface used by CURLResponse
+  """
+  def __init__(self, code: int, headers: HTTPMessage, body: bytes):
+    super(_BufferedResponse, self).__init__(body)
+    self.status: int = code
+    self.headers: HTTPMessage = headers
+
+  def getcode(self) -> int:
+    return self.status
+
+  def info(self) -> HTTPMessage:
+    return self.headers
+
+  def isclosed(self) -> bool:
+    return True
+
+
+async def _read_line(reader: asyncio.StreamReader) -> bytes:
+  line = await reader.readline()
+  if len(line) > _MAX_LINE:
+    raise HTTPException("Response line is too long")
+  return line
+
+
+async def _read_head(reader: asyncio.StreamReader) -> Tuple[str, int, HTTPMessage]:
+  """
+  :return: http version, status code and headers of the response, informational (1xx) responses are skipped
+  """
+  while True:
+    status_line = await _read_line(reader)
+    if not status_line:
+      raise ConnectionResetError("Connection closed by the server before the response")
+
+    try:
+      version, code, *_ = status_line.decode("iso-8859-1").split(None, 2)
+      code = int(code)
+    except ValueError:
+      raise HTTPException(f"Bad status line: {status_line!r}") from None
+
+    lines: List[bytes] = []
+    while (line := await _read_line(reader)) not in (b"\r\n", b"\n", b""):
+      lines.append(line)
+    headers = parse_headers(BytesIO(b"".join(lines) + b"\r\n"))
+
+    if not 100 <= code < 200 or code == 101:
+      return version, code, headers
+
+
+async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+  body = bytearray()
+  while True:
+    size_line = await _read_line(reader)
+    try:
+      size = int(size_line.split(b";", 1)[0], 16)
+    except ValueError:
+      raise HTTPException(f"Bad chunk size: {size_line!r}") from None
+
+    if size == 0:
+      while (await _read_line(reader)) not in (b"\r\n", b"\n", b""):  # trailers
+        pass
+      return bytes(body)
+
+    body += await reader.readexactly(size)
+    await reader.readexactly(2)  # CRLF after the chunk
+
+
+async def _read_body(reader: asyncio.StreamReader, method: str, version: str, code: int,
+                     headers: HTTPMessage) -> Tuple[bytes, bool]:
+  """
+  :return: body of the response and flag if the connection could be re-used for another request
+  """
+  connection = (headers.get("Connection") or "").lower()
+  keep_alive = "close" not in connection and (version != "HTTP/1.0" or "keep-alive" in connection)
+
+  if method == "HEAD" or code in _NO_BODY_CODES:
+    return b"", keep_alive
+
+  if "chunked" in (headers.get("Transfer-Encoding") or "").lower():
+    return await _read_chunked(reader), keep_alive
+
+  if (length := headers.get("Content-Length")) is not None:
+    try:
+      length = int(length)
+    except ValueError:
+      raise HTTPException(f"Bad Content-Length: {length}") from None
+    return await reader.readexactly(length), keep_alive
+
+  return await reader.read(), False  # body is delimited by the connection close
+
+
+def _encode_request(method: str, key: HostKey, path: str, headers: Dict[str, str], body: Optional[bytes]) -> bytes:
+  scheme, host, port = key
+  _headers = {"Host": host if port == _DEFAULT_PORTS[scheme] else f"{host}:{port}"}
+  _headers.update(headers)
+  if body is not None and not any(k.lower() == "content-length" for k in _headers):
+    _headers["Content-Length"] = len(body)
+
+  lines = [f"{method} {path} HTTP/1.1"]
+  lines.extend(f"{k}: {v}" for k, v in _headers.items())
+  request = ("\r\n".join(lines) + "\r\n\r\n").encode("iso-8859-1")
+  return request + body if body else request
+
+
+class AsyncCurlSession(object):
+  def __init__(self, max_per_host: int = 100, idle_timeout: float = 60.0, max_redirects: int = 10,
+               ssl_context: ssl.SSLContext = None):
+    """
+    :param max_per_host: maximum number of connections to one host, requests over the limit are waiting
+                         for a free connection
+    :param idle_timeout: close connections, which were not used for that amount of seconds
+    :param max_redirects: maximum number of redirects followed for one request
+    :param ssl_context: SSL context for the https connections, system default if not set
+    """
+    self._max_per_host: int = max_per_host
+    self._idle_timeout: float = idle_timeout
+    self._max_redirects: int = max_redirects
+    self._ssl_context: Optional[ssl.SSLContext] = ssl_context
+
+    # per host stack of (reader, writer, last use)
+    self._idle: Dict[HostKey, List[Tuple[asyncio.StreamReader, asyncio.StreamWriter, float]]] = {}
+    self._limits: Dict[HostKey, asyncio.Semaphore] = {}
+    self._active: Dict[HostKey, int] = {}  # per host number of connections in use
+    self._closed: bool = False
+
+  async def __aenter__(self) -> "AsyncCurlSession":
+    return self
+
+  async def __aexit__(self, exc_type, exc_val, exc_tb):
+    await self.close()
+
+  async def close(self):
+    """
+    Close all idle connections, connections in use are closed once released
+    """
+    self._closed = True
+    writers = [writer for connections in self._idle.values() for _, writer, _ in connections]
+    self._idle.clear()
+    for writer in writers:
+      writer.close()
+    await asyncio.gather(*(writer.wait_closed() for writer in writers), return_exceptions=True)
+
+  def stats(self) -> Dict[HostKey, Tuple[int, int]]:
+    """
+    :return: per host number of (connections in use, idle connections)
+    """
+    return {k: (self._active.get(k, 0), len(self._idle.get(k, ()))) for k in self._active.keys() | self._idle.keys()}
+
+  def _is_alive(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, last_used: float) -> bool:
+    """
+    Health check of the idle connection: it should not be expired and the server should not close it. The event
+    loop feeds EOF to the reader of idle keep-alive connection once the server closed it.
+    """
+    return time.monotonic() - last_used <= self._idle_timeout and not reader.at_eof() and not writer.is_closing()
+
+  async def _connect(self, key: HostKey) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    scheme, host, port = key
+    if scheme == "https":
+      return await asyncio.open_connection(host, port, ssl=self._ssl_context or ssl.create_default_context(),
+                                           limit=_MAX_LINE * 2)
+    return await asyncio.open_connection(host, port, limit=_MAX_LINE * 2)
+
+  async def _acquire(self, key: HostKey) -> Tuple[Optional[asyncio.StreamReader], Optional[asyncio.StreamWriter]]:
+    """
+    :return: reader and writer of the idle connection, or None if the new connection should be opened
+    """
+    if self._closed:
+      raise IOError("Session is closed")
+
+    if (limit := self._limits.get(key)) is None:
+      limit = self._limits[key] = asyncio.Semaphore(self._max_per_host)
+    await limit.acquire()
+    self._active[key] = self._active.get(key, 0) + 1
+
+    idle = self._idle.get(key)
+    while idle:
+      reader, writer, last_used = idle.pop()  # the most recently used is the most likely to be alive
+      if self._is_alive(reader, writer, last_used):
+        return reader, writer
+      writer.close()
+
+    return None, None
+
+  def _release(self, key: HostKey, reader: Optional[asyncio.StreamReader], writer: Optional[asyncio.StreamWriter],
+               reusable: bool):
+    self._active[key] -= 1
+    if writer is not None:
+      if reusable and not self._closed:
+        self._idle.setdefault(key, []).append((reader, writer, time.monotonic()))
+      else:
+        writer.close()
+    self._limits[key].release()
+
+  async def _exchange(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, method: str,
+                      request: bytes) -> Tuple[int, HTTPMessage, bytes, bool]:
+    writer.write(request)
+    await writer.drain()
+    version, code, headers = await _read_head(reader)
+    body, reusable = await _read_body(reader, method, version, code, headers)
+    return code, headers, body, reusable
+
+  async def _send(self, method: str, url: str, headers: Dict[str, str], body: Optional[bytes],
+                  use_stream: bool) -> CURLResponse:
+    key, path = _split_url(url)
+    request = _encode_request(method, key, path, headers, body)
+    reader, writer = await self._acquire(key)
+    reused, reusable = writer is not None, False
+    try:
+      try:
+        if not reused:
+          reader, writer = await self._connect(key)
+        code, _headers, content, reusable = await self._exchange(reader, writer, method, request)
+      except (ConnectionError, asyncio.IncompleteReadError):
+        if not reused or method not in _IDEMPOTENT_METHODS:  # the server could have processed it already
+          raise
+        # keep-alive connection was closed by the server in the meantime, trying the new one
+        writer.close()
+        reader, writer = await self._connect(key)
+        code, _headers, content, reusable = await self._exchange(reader, writer, method, request)
+    except (OSError, HTTPException, asyncio.IncompleteReadError, asyncio.LimitOverrunError) as e:
+      raise TimeoutError(str(e)) from e
+    finally:
+      self._release(key, reader, writer, reusable)
+
+    return CURLResponse(_BufferedResponse(code, _headers, content), is_stream=use_stream)
+
+  async def request(self,
+                    url: str,
+                    params: Dict[str, str] = None,
+                    auth: CURLAuth = None,
+                    req_type: CurlRequestType = CurlRequestType.GET,
+                    data: Union[str, bytes, dict] = None,
+                    headers: Dict[str, str] = None,
+                    cookies: List[CURLCookie] = None,
+                    timeout: int = None,
+                    use_gzip: bool = True,
+                    use_stream: bool = False,
+                    follow_redirect: bool = True) -> CURLResponse:
+    """
+    Make request to web resource over the pooled connection, arguments are the same as for curl()
+
+    :raises TimeoutError: if the response was not received in timeout or the connection failed
+    """
+    request = self._request(url, params, auth, req_type, data, headers, cookies, use_gzip, use_stream, follow_redirect)
+    if timeout is None:
+      return await request
+
+    try:
+      return await asyncio.wait_for(request, timeout)
+    except asyncio.TimeoutError as e:
+      if e.args:  # connection error of the request itself, asyncio.TimeoutError is TimeoutError since 3.11
+        raise
+      raise TimeoutError(f"No response from {url} in {timeout} seconds") from None
+
+  async def _request(self, url: str, params: Optional[Dict[str, str]], auth: Optional[CURLAuth],
+                     req_type: CurlRequestType, data: Union[str, bytes, dict, None], headers: Optional[Dict[str, str]],
+                     cookies: Optional[List[CURLCookie]], use_gzip: bool, use_stream: bool,
+                     follow_redirect: bool) -> CURLResponse:
+    url, _headers, body = _prepare_request(url, params, auth, req_type, data, headers, cookies, use_gzip)
+    method = req_type.value
+    origin, challenged = urlsplit(url).hostname, False
+
+    for _ in range(self._max_redirects + 1):
+      response = await self._send(method, url, _auth_headers(url, _headers, auth, origin, challenged), body,
+                                  use_stream)
+      next_request = _follow_up(response, url, method, _headers, body, auth, follow_redirect, origin, challenged)
+      if next_request is None:
+        return response
+
+      response.close_stream()
+      url, method, _headers, body, challenged = next_request
+
+    raise IOError(f"Too many redirects, the last one was to {url}")
@@ -0,0 +1,250 @@
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Github: https://github.com/hapylestat/apputils
+#
+#
+
+"""
+Concurrent batch requests.
+
+curl_many() runs the batch in the threads over shared CurlSession, curl_many_async() on the event loop over shared
+AsyncCurlSession. Both are limiting total number of requests in flight and number of requests to the same host,
+the results are returned in the order of the requests or as they complete:
+
+  for result in curl_many([f"https://api.example.com/item/{i}" for i in ids], max_concurrency=16):
+    if result.ok:
+      items.append(result.response.from_json())
+
+Failed request does not abort the batch, its exception is returned as the result error.
+
+Pooled connections are made directly to the hosts. Without the explicit session, requests which should go through
+the proxy (HTTP_PROXY/HTTPS_PROXY and NO_PROXY environment variables) are made by plain curl() and curl_async()
+instead, the same way as they are made outside of the batch. The sessions passed explicitly are used for all the
+requests, ignoring the proxy settings. The native client of curl_many_async() buffers the response bodies, see
+apputils.curl.aio.
+"""
+
+import asyncio
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Any, AsyncIterator, Deque, Dict, Iterable, Iterator, List, Mapping, Optional, Union
+from urllib.parse import urlsplit
+from urllib.request import getproxies, proxy_bypass
+
+from . import CURLResponse, curl, curl_async
+from .aio import AsyncCurlSession
+from .pool import CurlSession
+
+CurlRequestSpec = Union[str, Mapping[str, Any]]
+
+
+class CurlResult(object):
+  def __init__(self, index: int, request: CurlRequestSpec, response: CURLResponse = None,
+               error: Exception = None):
+    self._index: int = index
+    self._request: CurlRequestSpec = request
+    self._response: Optional[CURLResponse] = response
+    self._error: Optional[Exception] = error
+
+  @property
+  def index(self) -> int:
+    """
+    Position of the request in the batch
+    """
+    return self._index
+
+  @property
+  def request(self) -> CurlRequestSpec:
+    return self._request
+
+  @property
+  def response(self) -> Optional[CURLResponse]:
+    return self._response
+
+  @property
+  def error(self) -> Optional[Exception]:
+    return self._error
+
+  @property
+  def ok(self) -> bool:
+    """
+    The response was received, whatever its code is
+    """
+    return self._error is None
+
+  def __repr__(self):
+    state = f"error={self._error!r}" if self._error is not None else f"code={self._response.code}"
+    return f"<CurlResult #{self._index} {state}>"
+
+
+class _Task(object):
+  __slots__ = ("index", "request", "args", "host")
+
+  def __init__(self, index: int, request: CurlRequestSpec, defaults: Dict[str, Any]):
+    self.index: int = index
+    self.request: CurlRequestSpec = request
+    self.args: Dict[str, Any] = dict(defaults, url=request) if isinstance(request, str) else dict(defaults, **request)
+    if "url" not in self.args:
+      raise ValueError(f"Request #{index} has no url")
+    self.host: str = urlsplit(self.args["url"]).netloc.lower()
+
+
+class _Scheduler(object):
+  """
+  Picks requests to start within the total and per host limits, and orders finished results if needed
+  """
+  def __init__(self, requests: Iterable[CurlRequestSpec], defaults: Dict[str, Any], max_concurrency: int,
+               max_per_host: int, ordered: bool):
+    if max_concurrency < 1 or max_per_host < 1:
+      raise ValueError("max_concurrency and max_per_host should be positive")
+
+    self._max_concurrency: int = max_concurrency
+    self._max_per_host: int = max_per_host
+    self._ordered: bool = ordered
+    self._pending: Dict[str, Deque[_Task]] = {}
+    self._active: Dict[str, int] = {}
+    self._running: int = 0
+    self._finished: Dict[int, CurlResult] = {}
+    self._next_index: int = 0
+
+    for index, request in enumerate(requests):
+      task = _Task(index, request, defaults)
+      self._pending.setdefault(task.host, deque()).append(task)
+
+  def __bool__(self) -> bool:
+    return bool(self._pending) or self._running > 0
+
+  def ready(self) -> List[_Task]:
+    """
+    :return: requests to start now, taken from the hosts in turn
+    """
+    tasks: List[_Task] = []
+    progress = True
+    while progress and self._running < self._max_concurrency:
+      progress = False
+      for host in list(self._pending):
+        if self._running >= self._max_concurrency:
+          break
+        if self._active.get(host, 0) >= self._max_per_host:
+          continue
+
+        queue = self._pending[host]
+        tasks.append(queue.popleft())
+        if not queue:
+          del self._pending[host]
+        self._active[host] = self._active.get(host, 0) + 1
+        self._running += 1
+        progress = True
+
+    return tasks
+
+  def done(self, task: _Task, response: Optional[CURLResponse], error: Optional[Exception]) -> List[CurlResult]:
+    """
+    :return: results, which could be returned to the caller now
+    """
+    self._active[task.host] -= 1
+    self._running -= 1
+    result = CurlResult(task.index, task.request, response, error)
+    if not self._ordered:
+      return [result]
+
+    self._finished[task.index] = result
+    results: List[CurlResult] = []
+    while self._next_index in self._finished:
+      results.append(self._finished.pop(self._next_index))
+      self._next_index += 1
+    return results
+
+
+def _direct(url: str, proxies: Dict[str, str]) -> bool:
+  """
+  The request doesn't go through the proxy, so it could be sent over the pooled connection
+  """
+  parts = urlsplit(url)
+  return parts.scheme.lower() not in proxies or bool(proxy_bypass(parts.hostname or ""))
+
+
+def curl_many(requests: Iterable[CurlRequestSpec],
+              max_concurrency: int = 8,
+              max_per_host: int = 4,
+              ordered: bool = True,
+              session: CurlSession = None,
+              **kwargs) -> Iterator[CurlResult]:
+  """
+  Make batch of requests concurrently in the threads
+
+  :param requests: urls or dictionaries with curl() arguments of the each request
+  :param max_concurrency: maximum number of requests in flight
+  :param max_per_host: maximum number of requests in flight to the same host
+  :param ordered: return results in the order of the requests, otherwise as they complete
+  :param session: session to share connections with, temporary one used if not set for the requests which don't
+                  go through the proxy
+  :param kwargs: default curl() arguments for all the requests
+  :return: results of the requests, with the response or the error
+  """
+  scheduler = _Scheduler(requests, kwargs, max_concurrency, max_per_host, ordered)
+  _session = session or CurlSession(max_per_host=max_per_host)
+  proxies = {} if session is not None else getproxies()
+  executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="curl_many")
+  running: Dict[Future, _Task] = {}
+  try:
+    while scheduler:
+      for task in scheduler.ready():
+        task_session = _session if _direct(task.args["url"], proxies) else None
+        running[executor.submit(curl, session=task_session, **task.args)] = task
+
+      done, _ = wait(running, return_when=FIRST_COMPLETED)
+      for future in done:
+        error = future.exception()
+        yield from scheduler.done(running.pop(future), None if error else future.result(), error)
+  finally:
+    executor.shutdown(wait=True, cancel_futures=True)
+    if session is None:
+      _session.close()
+
+
+async def curl_many_async(requests: Iterable[CurlRequestSpec],
+                          max_concurrency: int = 100,
+                          max_per_host: int = 10,
+                          ordered: bool = True,
+                          session: AsyncCurlSession = None,
+                          **kwargs) -> AsyncIterator[CurlResult]:
+  """
+  Make batch of requests concurrently on the event loop, arguments are the same as for curl_many()
+  """
+  loop = asyncio.get_running_loop()
+  scheduler = _Scheduler(requests, kwargs, max_concurrency, max_per_host, ordered)
+  _session = session or AsyncCurlSession(max_per_host=max_per_host)
+  proxies = {} if session is not None else getproxies()
+  running: Dict[asyncio.Task, _Task] = {}
+  try:
+    while scheduler:
+      for task in scheduler.ready():
+        task_session = _session if _direct(task.args["url"], proxies) else None
+        running[asyncio.ensure_future(curl_async(loop, session=task_session, **task.args))] = task
+
+      done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+      for future in done:
+        error = future.exception()
+        for result in scheduler.done(running.pop(future), None if error else future.result(), error):
+          yield result
+  finally:
+    for future in running:
+      future.cancel()
+    await asyncio.gather(*running, return_exceptions=True)
+    if session is None:
+      await _session.close()
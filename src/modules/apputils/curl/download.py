@@ -0,0 +1,364 @@
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Github: https://github.com/hapylestat/apputils
+#
+#
+
+"""
+Download of the web resource into the file.
+
+The body is read with readinto() into one reusable buffer per connection and written from its memoryview straight
+to the preallocated file, without intermediate bytes objects. Not finished download is kept in "<path>.part" file,
+alongside with "<path>.part.json" state, and is resumed with HTTP Range requests next time. Large files could be
+split into the segments, downloaded in parallel:
+
+  bar = ProgressBar("Downloading", width=40)
+  curl_download(url, "image.iso", segments=4, progress=progress_bar_callback(bar))
+  bar.stop()
+"""
+
+import os
+import re
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
+from http.client import HTTPException
+from typing import Callable, Dict, List, Optional, Tuple
+
+from . import CURLAuth, CURLCookie, CURLResponse, curl
+from ..jsonbackend import loads as json_loads, dumpb as json_dumpb
+
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+_CONTENT_RANGE = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+|\*)")
+_STATE_SAVE_INTERVAL = 1.0
+
+
+class _RestartDownload(Exception):
+  """
+  The resource was changed or the server ignored Range request, partial download could not be continued
+  """
+
+
+class _Segment(object):
+  __slots__ = ("start", "position", "end")
+
+  def __init__(self, start: int, position: int, end: Optional[int]):
+    self.start: int = start
+    self.position: int = position
+    self.end: Optional[int] = end  # exclusive, None if the size of the resource is unknown
+
+  @property
+  def finished(self) -> bool:
+    return self.end is not None and self.position >= self.end
+
+
+def progress_bar_callback(bar) -> ProgressCallback:
+  """
+  :param bar: ProgressBar, started with the size of the download on the first call
+  :return: progress callback for curl_download()
+  """
+  started = False
+
+  def callback(done: int, total: Optional[int]):
+    nonlocal started
+    if not started:
+      bar.start(total or 0)
+      started = True
+    bar.progress(done)
+
+  return callback
+
+
+class _Download(object):
+  def __init__(self, url: str, path: str, request_args: dict, segments: int, min_segment_size: int,
+               chunk_size: int, retries: int, progress: Optional[ProgressCallback], progress_interval: float):
+    self._url: str = url
+    self._path: str = path
+    self._part_path: str = f"{path}.part"
+    self._state_path: str = f"{path}.part.json"
+    self._headers: Dict[str, str] = dict(request_args.get("headers") or {}, **{"Accept-Encoding": "identity"})
+    self._request_args: dict = {k: v for k, v in request_args.items() if k != "headers"}
+    self._max_segments: int = max(segments, 1)
+    self._min_segment_size: int = min_segment_size
+    self._chunk_size: int = chunk_size
+    self._retries: int = retries
+    self._progress: Optional[ProgressCallback] = progress
+    self._progress_interval: float = progress_interval
+
+    self._lock: threading.Lock = threading.Lock()
+    self._cancelled: bool = False
+    self._size: Optional[int] = None
+    self._ranges: bool = False  # the server supports range requests, so the download could be resumed
+    self._validator: Dict[str, str] = {}  # ETag or Last-Modified of the resource
+    self._segments: List[_Segment] = []
+
+  @property
+  def _done(self) -> int:
+    return sum(s.position - s.start for s in self._segments)
+
+  # state of the partial download
+
+  def _load_state(self) -> bool:
+    try:
+      with open(self._state_path, "rb") as f:
+        state = json_loads(f.read())
+    except (OSError, ValueError):
+      return False
+
+    # without the validator the changed resource could not be detected, so the parts would be mixed up
+    if state.get("url") != self._url or state.get("size") is None or not state.get("validator") \
+       or not os.path.exists(self._part_path) or os.path.getsize(self._part_path) != state["size"]:
+      return False
+
+    self._size = state["size"]
+    self._ranges = True
+    self._validator = state.get("validator") or {}
+    self._segments = [_Segment(*s) for s in state["segments"]]
+    return True
+
+  def _save_state(self):
+    if not self._ranges or self._size is None or not self._validator:
+      return
+
+    with self._lock:
+      segments = [[s.start, s.position, s.end] for s in self._segments]
+    with open(self._state_path, "wb") as f:
+      f.write(json_dumpb({"url": self._url, "size": self._size, "validator": self._validator, "segments": segments},
+                         fast=True))
+
+  def _remove_state(self):
+    for path in (self._state_path, self._part_path):
+      if os.path.exists(path):
+        os.remove(path)
+
+  # requests
+
+  def _request(self, segment: Optional[_Segment]) -> CURLResponse:
+    headers = dict(self._headers)
+    if segment is None:
+      headers["Range"] = "bytes=0-"
+    elif segment.end is not None:
+      headers["Range"] = f"bytes={segment.position}-{segment.end - 1}"
+      if validator := self._validator.get("ETag") or self._validator.get("Last-Modified"):
+        headers["If-Range"] = validator
+
+    response = curl(self._url, headers=headers, use_gzip=False, use_stream=True, **self._request_args)
+    if response.code in (200, 206):
+      return response
+
+    response.close_stream()
+    if response.code == 416 and segment is None:  # empty resource
+      return response
+    raise IOError(f"Download of {self._url} failed with HTTP {response.code}")
+
+  def _open(self, segment: _Segment) -> CURLResponse:
+    """
+    Request the rest of the segment
+    """
+    response = self._request(segment)
+    if segment.end is None:
+      return response
+
+    content_range = _CONTENT_RANGE.match(str(response.headers.get("Content-Range", "")))
+    if response.code != 206 or content_range is None or int(content_range.group(1)) != segment.position \
+       or content_range.group(3) != str(self._size):
+      response.close_stream()
+      raise _RestartDownload()
+    return response
+
+  def _probe(self) -> Tuple[CURLResponse, bool]:
+    """
+    Start the new download
+
+    :return: response for the whole resource and flag if the server supports range requests
+    """
+    response = self._request(None)
+    content_range = _CONTENT_RANGE.match(str(response.headers.get("Content-Range", "")))
+    ranges = response.code == 206 and content_range is not None and int(content_range.group(1)) == 0
+    if ranges and content_range.group(3) != "*":
+      self._size = int(content_range.group(3))
+    elif response.code == 416:
+      self._size = 0
+    elif not ranges and "Content-Length" in response.headers:
+      self._size = int(response.headers["Content-Length"])
+
+    self._validator = {k: response.headers[k] for k in ("ETag", "Last-Modified") if k in response.headers}
+    self._ranges = ranges and self._size is not None
+    return response, self._ranges
+
+  # body transfer
+
+  def _copy(self, response: CURLResponse, segment: _Segment):
+    buffer = memoryview(bytearray(self._chunk_size))
+    raw = response.raw
+    with open(self._part_path, "r+b", buffering=0) as f:  # written straight from the buffer, without copying
+      f.seek(segment.position)
+      while not self._cancelled and not segment.finished:
+        view = buffer if segment.end is None else buffer[:min(self._chunk_size, segment.end - segment.position)]
+        if not (n := raw.readinto(view)):
+          break
+        written = 0
+        while written < n:  # unbuffered write could be partial
+          written += f.write(view[written:n])
+        with self._lock:
+          segment.position += n
+
+    if segment.end is not None and not segment.finished and not self._cancelled:
+      raise IOError(f"Connection closed at {segment.position} byte, while {segment.end} expected")
+
+  def _fetch(self, segment: _Segment, response: CURLResponse = None):
+    failures = 0
+    while not self._cancelled and not segment.finished:
+      try:
+        if response is None:
+          response = self._open(segment)
+        self._copy(response, segment)
+        if segment.end is None:
+          return
+      except (OSError, HTTPException) as e:
+        failures += 1
+        if failures > self._retries or segment.end is None:
+          raise e if isinstance(e, OSError) else IOError(str(e) or type(e).__name__) from e
+      finally:
+        if response is not None:
+          response.close_stream()
+          response = None
+
+  def _split(self) -> List[_Segment]:
+    if self._size is None:
+      return [_Segment(0, 0, None)]
+
+    count = max(1, min(self._max_segments, self._size // max(self._min_segment_size, 1)))
+    bounds = [self._size * i // count for i in range(count + 1)]
+    return [_Segment(bounds[i], bounds[i], bounds[i + 1]) for i in range(count)]
+
+  def _prepare_file(self):
+    with open(self._part_path, "wb") as f:
+      if not self._size:
+        return
+      try:
+        os.posix_fallocate(f.fileno(), 0, self._size)
+      except (AttributeError, OSError):  # not available on the platform or not supported by the file system
+        f.truncate(self._size)
+
+  def _report(self):
+    if self._progress is not None:
+      self._progress(self._done, self._size)
+
+  def _run(self, first_response: Optional[CURLResponse]):
+    segments = [s for s in self._segments if not s.finished]
+    if first_response is not None and (not segments or segments[0].position != 0):
+      first_response.close_stream()
+      first_response = None
+    if not segments:
+      return
+
+    last_save = time.monotonic()
+    with ThreadPoolExecutor(max_workers=len(segments), thread_name_prefix="curl_download") as executor:
+      futures = [executor.submit(self._fetch, s, first_response if s.position == 0 else None) for s in segments]
+      try:
+        while True:
+          done, not_done = wait(futures, timeout=self._progress_interval, return_when=FIRST_EXCEPTION)
+          self._report()
+          for future in done:
+            if future.exception() is not None:
+              raise future.exception()
+          if not not_done:
+            break
+          if time.monotonic() - last_save >= _STATE_SAVE_INTERVAL:
+            self._save_state()
+            last_save = time.monotonic()
+      finally:
+        self._cancelled = any(not f.done() for f in futures)
+
+  def start(self, resume: bool) -> int:
+    first_response = None
+    if not (resume and self._load_state()):
+      first_response, ranges = self._probe()
+      self._segments = self._split() if ranges else [_Segment(0, 0, self._size)]
+      self._prepare_file()
+
+    try:
+      self._report()
+      self._run(first_response)
+    except _RestartDownload:
+      self._remove_state()
+      raise
+    except BaseException:
+      self._save_state()
+      raise
+
+    if self._size is None:
+      self._size = self._done
+    os.replace(self._part_path, self._path)
+    if os.path.exists(self._state_path):
+      os.remove(self._state_path)
+    return self._size
+
+
+def curl_download(url: str,
+                  path: str,
+                  params: Dict[str, str] = None,
+                  auth: CURLAuth = None,
+                  headers: Dict[str, str] = None,
+                  cookies: List[CURLCookie] = None,
+                  timeout: int = None,
+                  resume: bool = True,
+                  segments: int = 1,
+                  min_segment_size: int = 8 * 1024 * 1024,
+                  chunk_size: int = 1024 * 1024,
+                  retries: int = 3,
+                  progress: ProgressCallback = None,
+                  progress_interval: float = 0.1,
+                  session: "CurlSession" = None) -> int:
+  """
+  Download web resource into the file
+
+  :param url: Url of the resource
+  :param path: destination file, replaced once the download is finished
+  :param params: list of params after "?"
+  :param auth: authorization tokens
+  :param headers: headers which would be posted with request
+  :param cookies: list of cookies to send alongside with the request
+  :param timeout: timeout of the each request
+  :param resume: continue the previous not finished download of the same url to the same path, the state is
+                 kept only if the server supports range requests and sends ETag or Last-Modified of the resource
+  :param segments: maximum number of the parallel range requests for the single resource
+  :param min_segment_size: do not split the resource into the segments smaller than that
+  :param chunk_size: size of the read buffer of the each connection
+  :param retries: number of attempts to continue the segment after the connection failure
+  :param progress: called with number of downloaded bytes and the size of the resource (None if unknown),
+                   from the calling thread, see progress_bar_callback()
+  :param progress_interval: how often the progress callback is called, in seconds
+  :param session: send the requests over persistent connections of the session (see apputils.curl.pool)
+  :return: size of the downloaded file
+  :raises IOError: if the download failed, or the resource was changed during it twice in a row
+  """
+  request_args = {"params": params, "auth": auth, "headers": headers, "cookies": cookies, "timeout": timeout,
+                  "session": session}
+  args = (url, path, request_args, segments, min_segment_size, chunk_size, retries, progress, progress_interval)
+
+  try:
+    return _Download(*args).start(resume)
+  except _RestartDownload:
+    pass
+
+  try:
+    return _Download(*args).start(False)
+  except _RestartDownload:
+    raise IOError(f"Download of {url} failed: the resource was changed during the download") from None
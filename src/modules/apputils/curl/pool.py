@@ -0,0 +1,261 @@
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Github: https://github.com/hapylestat/apputils
+#
+#
+
+"""
+Persistent HTTP connections for curl().
+
+CurlSession keeps per-host pool of keep-alive http.client connections, which are re-used by the following
+requests to the same host instead of opening new TCP (and TLS) connection for each of them:
+
+  with CurlSession(max_per_host=4) as session:
+    for _ in range(1000):
+      curl("https://api.example.com/status", session=session)
+
+Connections are made directly to the hosts, HTTP_PROXY/HTTPS_PROXY environment variables are not used by the
+session requests.
+"""
+
+import select
+import ssl
+import threading
+import time
+
+from http.client import HTTPConnection, HTTPSConnection, HTTPException, BadStatusLine
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit, urljoin
+
+from . import CURLAuth, CURLCookie, CURLResponse, CurlRequestType, _prepare_request
+
+_REDIRECT_CODES = (301, 302, 303, 307, 308)
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+# requests which could be safely sent once again, if the server closed reused connection without the response
+_IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "PUT", "DELETE", "OPTIONS"))
+
+HostKey = Tuple[str, str, int]
+
+
+def _split_url(url: str) -> Tuple[HostKey, str]:
+  """
+  :return: pool key of the host and request path with the query
+  """
+  parts = urlsplit(url)
+  scheme = parts.scheme.lower()
+  if scheme not in _DEFAULT_PORTS:
+    raise IOError(f"Unsupported url scheme \"{parts.scheme}\"")
+
+  path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+  return (scheme, parts.hostname, parts.port or _DEFAULT_PORTS[scheme]), path
+
+
+def _follow_up(response: CURLResponse, url: str, method: str, headers: Dict[str, str], body: Optional[bytes],
+               auth: Optional[CURLAuth], follow_redirect: bool, origin: str,
+               challenged: bool) -> Optional[Tuple[str, str, Dict[str, str], bytes, bool]]:
+  """
+  Next request to make after the response: answer to 401 challenge or redirect
+
+  :param origin: host of the original url, credentials of the 401 challenge are sent only to it
+  :param challenged: the 401 challenge was already answered
+  :return: url, method, headers, body of the next request and challenged flag, or None if the response is final
+  """
+  if response.code == 401 and auth is not None and not auth.force and not challenged \
+     and "Authorization" not in headers and urlsplit(url).hostname == origin:
+    return url, method, headers, body, True
+
+  if follow_redirect and response.code in _REDIRECT_CODES and "Location" in response.headers:
+    new_url = urljoin(url, response.headers["Location"])
+    if urlsplit(new_url).hostname != urlsplit(url).hostname:  # credentials are not passed to the other host
+      headers = {k: v for k, v in headers.items() if k.lower() != "authorization"}
+    if response.code not in (307, 308):  # the same way as browsers and urllib are doing
+      method, body = CurlRequestType.GET.value, None
+      headers = {k: v for k, v in headers.items() if k not in ("Content-Type", "Content-Length")}
+    return new_url, method, headers, body, challenged
+
+  return None
+
+
+def _auth_headers(url: str, headers: Dict[str, str], auth: Optional[CURLAuth], origin: str,
+                  challenged: bool) -> Dict[str, str]:
+  """
+  Headers of the single request, with credentials of the answered 401 challenge if the url is on the origin host
+  """
+  if challenged and auth is not None and urlsplit(url).hostname == origin:
+    return dict(headers, **auth.get_auth_header())
+  return headers
+
+
+class CurlSession(object):
+  def __init__(self, max_per_host: int = 4, idle_timeout: float = 60.0, max_redirects: int = 10,
+               ssl_context: ssl.SSLContext = None):
+    """
+    :param max_per_host: maximum number of connections to one host, requests over the limit are waiting
+                         for a free connection
+    :param idle_timeout: close connections, which were not used for that amount of seconds
+    :param max_redirects: maximum number of redirects followed for one request
+    :param ssl_context: SSL context for the https connections, system default if not set
+    """
+    self._max_per_host: int = max_per_host
+    self._idle_timeout: float = idle_timeout
+    self._max_redirects: int = max_redirects
+    self._ssl_context: Optional[ssl.SSLContext] = ssl_context
+
+    self._lock: threading.Condition = threading.Condition()
+    self._idle: Dict[HostKey, List[Tuple[HTTPConnection, float]]] = {}  # per host stack of (connection, last use)
+    self._active: Dict[HostKey, int] = {}  # per host number of connections in use
+    self._closed: bool = False
+
+  def __enter__(self) -> "CurlSession":
+    return self
+
+  def __exit__(self, exc_type, exc_val, exc_tb):
+    self.close()
+
+  def close(self):
+    """
+    Close all idle connections, connections in use are closed once released
+    """
+    with self._lock:
+      self._closed = True
+      for connections in self._idle.values():
+        for conn, _ in connections:
+          conn.close()
+      self._idle.clear()
+      self._lock.notify_all()
+
+  def stats(self) -> Dict[HostKey, Tuple[int, int]]:
+    """
+    :return: per host number of (connections in use, idle connections)
+    """
+    with self._lock:
+      return {k: (self._active.get(k, 0), len(self._idle.get(k, ()))) for k in self._active.keys() | self._idle.keys()}
+
+  def _is_alive(self, conn: HTTPConnection, last_used: float) -> bool:
+    """
+    Health check of the idle connection: it should not be expired and the server should not close it. Idle
+    keep-alive socket becomes readable only if the server closed it or sent something unexpected.
+    """
+    if time.monotonic() - last_used > self._idle_timeout:
+      return False
+    if conn.sock is None:
+      return True
+    try:
+      readable, _, _ = select.select([conn.sock], [], [], 0)
+    except (OSError, ValueError):
+      return False
+    return not readable
+
+  def _new_connection(self, key: HostKey, timeout: Optional[float]) -> HTTPConnection:
+    scheme, host, port = key
+    if scheme == "https":
+      return HTTPSConnection(host, port, timeout=timeout, context=self._ssl_context)
+    return HTTPConnection(host, port, timeout=timeout)
+
+  def _acquire(self, key: HostKey, timeout: Optional[float]) -> Tuple[HTTPConnection, bool]:
+    """
+    :return: connection and flag if it is re-used one
+    :raises TimeoutError: if no connection become free in timeout
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    with self._lock:
+      while True:
+        if self._closed:
+          raise IOError("Session is closed")
+
+        idle = self._idle.get(key)
+        while idle:
+          conn, last_used = idle.pop()  # the most recently used is the most likely to be alive
+          if self._is_alive(conn, last_used):
+            self._active[key] = self._active.get(key, 0) + 1
+            return conn, True
+          conn.close()
+
+        if self._active.get(key, 0) < self._max_per_host:
+          self._active[key] = self._active.get(key, 0) + 1
+          break
+
+        remaining = None if deadline is None else deadline - time.monotonic()
+        if remaining is not None and remaining <= 0 or not self._lock.wait(remaining):
+          raise TimeoutError(f"No free connection to {key[1]}:{key[2]} in {timeout} seconds")
+
+    return self._new_connection(key, timeout), False
+
+  def _release(self, key: HostKey, conn: HTTPConnection, reusable: bool):
+    with self._lock:
+      self._active[key] -= 1
+      if reusable and not self._closed:
+        self._idle.setdefault(key, []).append((conn, time.monotonic()))
+      else:
+        conn.close()
+      self._lock.notify()
+
+  def _send(self, method: str, url: str, headers: Dict[str, str], body: Optional[bytes], timeout: Optional[float],
+            use_stream: bool) -> CURLResponse:
+    key, path = _split_url(url)
+    conn, reused = self._acquire(key, timeout)
+    try:
+      conn.timeout = timeout
+      if conn.sock is not None:
+        conn.sock.settimeout(timeout)
+      try:
+        conn.request(method, path, body=body, headers=headers)
+        response = conn.getresponse()
+      except (ConnectionError, BadStatusLine):
+        if not reused or method not in _IDEMPOTENT_METHODS:  # the server could have processed it already
+          raise
+        conn.close()  # keep-alive connection was closed by the server in the meantime, trying the new one
+        conn.request(method, path, body=body, headers=headers)
+        response = conn.getresponse()
+    except (OSError, HTTPException) as e:
+      self._release(key, conn, False)
+      raise TimeoutError(str(e)) from e
+    except BaseException:
+      self._release(key, conn, False)
+      raise
+
+    return CURLResponse(response, is_stream=use_stream, release=lambda reusable: self._release(key, conn, reusable))
+
+  def request(self,
+              url: str,
+              params: Dict[str, str] = None,
+              auth: CURLAuth = None,
+              req_type: CurlRequestType = CurlRequestType.GET,
+              data: Union[str, bytes, dict] = None,
+              headers: Dict[str, str] = None,
+              cookies: List[CURLCookie] = None,
+              timeout: int = None,
+              use_gzip: bool = True,
+              use_stream: bool = False,
+              follow_redirect: bool = True) -> CURLResponse:
+    """
+    Make request to web resource over the pooled connection, arguments are the same as for curl()
+    """
+    url, _headers, body = _prepare_request(url, params, auth, req_type, data, headers, cookies, use_gzip)
+    method = req_type.value
+    origin, challenged = urlsplit(url).hostname, False
+
+    for _ in range(self._max_redirects + 1):
+      response = self._send(method, url, _auth_headers(url, _headers, auth, origin, challenged), body, timeout,
+                            use_stream)
+      next_request = _follow_up(response, url, method, _headers, body, auth, follow_redirect, origin, challenged)
+      if next_request is None:
+        return response
+
+      response.close_stream()
+      url, method, _headers, body, challenged = next_request
+
+    raise IOError(f"Too many redirects, the last one was to {url}")
@@ -0,0 +1,162 @@
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# Github: https://github.com/hapylestat/apputils
+#
+#
+
+"""
+Incremental decompression of the response body.
+
+DecompressingReader reads compressed body from the response in chunks and inflates it with zlib.decompressobj
+with bounded output per step, so the memory use does not depend on the size of the body.
+"""
+
+import io
+import zlib
+
+from typing import IO, Optional
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+def content_codec(content_encoding: Optional[str]) -> Optional[str]:
+  """
+  :param content_encoding: value of Content-Encoding header
+  :return: "gzip", "deflate" or None if the body is not compressed
+  """
+  if not content_encoding:
+    return None
+  if "gzip" in content_encoding:  # includes x-gzip
+    return "gzip"
+  if "deflate" in content_encoding:
+    return "deflate"
+  return None
+
+
+def _decompressor(codec: str, raw: bool = False):
+  if codec == "gzip":
+    return zlib.decompressobj(16 + zlib.MAX_WBITS)
+  return zlib.decompressobj(-zlib.MAX_WBITS if raw else zlib.MAX_WBITS)
+
+
+class DecompressingReader(io.RawIOBase):
+  def __init__(self, fp: IO[bytes], codec: Optional[str], chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    :param fp: compressed body
+    :param codec: "gzip", "deflate" or None to pass the body as is
+    :param chunk_size: size of the compressed chunks read from fp and maximum size of inflated one
+    """
+    super(DecompressingReader, self).__init__()
+    self._fp: IO[bytes] = fp
+    self._codec: Optional[str] = codec
+    self._chunk_size: int = chunk_size
+    self._decompressor = _decompressor(codec) if codec else None
+    self._started: bool = False  # some servers are sending raw deflate stream without zlib header
+    self._pending: memoryview = memoryview(b"")
+    self._eof: bool = False
+
+  def readable(self) -> bool:
+    return True
+
+  def close(self):
+    if not self.closed:
+      self._fp.close()
+    super(DecompressingReader, self).close()
+
+  def _decompress(self, data: bytes) -> bytes:
+    try:
+      out = self._decompressor.decompress(data, self._chunk_size)
+    except zlib.error:
+      if self._codec != "deflate" or self._started:
+        raise
+      self._decompressor = _decompressor(self._codec, raw=True)
+      out = self._decompressor.decompress(data, self._chunk_size)
+
+    self._started = True
+    return out
+
+  def _fill(self):
+    """
+    Inflate next part of the body, could be empty
+    """
+    d = self._decompressor
+    if d is None:
+      data = self._fp.read(self._chunk_size)
+      self._eof = not data
+      self._pending = memoryview(data)
+      return
+
+    if d.eof and d.unused_data and self._codec == "gzip":  # the body could consist of several gzip members
+      data = d.unused_data
+      self._decompressor = _decompressor(self._codec)
+    elif d.unconsumed_tail and not d.eof:
+      data = d.unconsumed_tail
+    else:
+      data = self._fp.read(self._chunk_size)
+      if not data:
+        if self._started and not d.eof:
+          raise EOFError("Compressed stream ended prematurely")
+        self._eof = True
+        self._pending = memoryview(d.flush())
+        return
+
+    self._pending = memoryview(self._decompress(data))
+
+  def readall(self) -> bytes:
+    out = bytearray(self._pending)
+    self._pending = memoryview(b"")
+    while not self._eof:
+      self._fill()
+      out += self._pending
+    self._pending = memoryview(b"")
+    return bytes(out)
+
+  def readinto(self, b) -> int:
+    while not self._pending and not self._eof:
+      self._fill()
+
+    n = min(len(b), len(self._pending))
+    b[:n] = self._pending[:n]
+    self._pending = self._pending[n:]
+    return n
+
+
+def decompress(data: bytes, codec: Optional[str]) -> bytes:
+  """
+  Decompress the whole body at once
+
+  :raises EOFError: if the compressed stream is truncated
+  """
+  if codec is None:
+    return data
+
+  parts = []
+  while data:
+    d = _decompressor(codec)
+    try:
+      parts.append(d.decompress(data))
+    except zlib.error:
+      if codec != "deflate" or parts:
+        raise
+      d = _decompressor(codec, raw=True)
+      parts.append(d.decompress(data))
+    parts.append(d.flush())
+    if not d.eof:
+      raise EOFError("Compressed stream ended prematurely")
+    data = d.unused_data if codec == "gzip" else b""  # the body could consist of several gzip members
+
+  parts = [part for part in parts if part]
+  return parts[0] if len(parts) == 1 else b"".join(parts)
@@ -16,9 +16,8 @@
 #  Github: https://github.com/hapylestat/apputils
 #
 #
-from functools import reduce
-from types import FunctionType, MethodType, BuiltinMethodType
-from typing import get_type_hints, get_args, Union
+from types import FunctionType, MethodType, BuiltinMethodType, MemberDescriptorType
+from typing import get_type_hints, get_args, Union, Iterable, Generator, IO, Any, Callable
 from .transformations import transformations
 
 try:
@@ -41,12 +40,21 @@ def _get_union_args(tp) -> tuple:
   # Fallback for types.UnionType on some Python versions
   return getattr(tp, "__args__", ()) or ()
 
+import copy
 import enum
+import inspect
 import json
+import sys
+from datetime import date, time, timedelta
+
+from ..jsonbackend import loads as json_loads, dumps as json_dumps
+from .binary import packb, unpackb, is_packed_map
 
 try:
   import yaml
   YAML_ENABLED: bool = True
+  # libyaml based loader is several times faster, if PyYaml was built with it
+  _YAMLLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 except ImportError:
   YAML_ENABLED: bool = False
 
@@ -54,6 +62,640 @@ except ImportError:
 class SODumpType(enum.Enum):
   JSON = 1
   YAML = 2
+  BINARY = 3  # MessagePack
+
+
+def _parse_text(data: "str|bytes", _type: "SODumpType|None" = None) -> "tuple[object, SODumpType|None]":
+  """
+  Parse JSON, YAML or MessagePack document, parsing it only once.
+
+  Without explicit _type the format is guessed by the first character: JSON object always starts with '{', while
+  YAML mapping in most cases not. YAML flow mapping, which also starts with '{', is tried only if JSON parsing failed.
+  Packed map is recognized by the first byte, which is not valid at the start of utf-8 text.
+
+  :return: parsed document and its type, or the original data and None if nothing could parse it
+  :raises ValueError: with explicit _type, if the document could not be parsed
+  """
+  if _type == SODumpType.JSON:
+    return json_loads(data), SODumpType.JSON
+
+  if _type == SODumpType.BINARY or (_type is None and isinstance(data, bytes) and is_packed_map(data)):
+    return unpackb(data), SODumpType.BINARY
+
+  if _type == SODumpType.YAML:
+    if not YAML_ENABLED:
+      raise RuntimeError("PyYaml is not installed and it is required for YAML parsing")
+    try:
+      return yaml.load(data, Loader=_YAMLLoader), SODumpType.YAML
+    except yaml.YAMLError as e:
+      raise ValueError(f"Unable to parse YAML document: {e}") from e
+
+  if data.lstrip()[:1] in ("{", b"{") or not YAML_ENABLED:
+    try:
+      return json_loads(data), SODumpType.JSON
+    except json.JSONDecodeError:
+      pass
+
+  if YAML_ENABLED:
+    try:
+      return yaml.load(data, Loader=_YAMLLoader), SODumpType.YAML
+    except yaml.YAMLError:
+      pass
+
+  return data, None
+
+
+class _SchemaConverter(object):
+  """
+  Pre-resolved view of one annotation schema.
+
+  Splitting typing hints into origin type and arguments is done once per distinct schema, the result is
+  shared between all classes and fields using the same annotation.
+  """
+  __slots__ = ("schema", "type", "args", "property_type", "is_union", "is_list", "is_dict",
+               "expects_object", "items", "values", "error_type_name",
+               "candidates", "candidates_version", "discriminator_key", "discriminator")
+
+  def __init__(self, schema, discriminator_key: "str|None" = None):
+    is_typing_hint = (_type := getattr(schema, "__origin__", None)) is not None
+    _type = _type if is_typing_hint else schema
+    # For both typing.Union[X,Y] (origin=Union) and native X|Y, treat _type as the union schema itself
+    self.is_union: bool = _type is Union or _is_union(schema)
+    if self.is_union:
+      _type = schema
+
+    self.schema = schema
+    self.type = _type
+    self.args: list = list(get_args(schema)) if is_typing_hint or self.is_union else [] if _type is list else [schema]
+    self.property_type = self.args[0] if self.args else None
+    self.is_list: bool = _type is list
+    self.is_dict: bool = _type is dict
+    self.expects_object: bool = isinstance(self.property_type, type) and issubclass(self.property_type, SerializableObject)
+    self.error_type_name: str = " | ".join([getattr(t, "__name__", str(t)) for t in self.args]) if self.is_union \
+      else getattr(self.property_type, "__name__", str(self.property_type))
+
+    # nested converters are resolved on the first use, as they could reference not yet defined classes
+    self.items: "list[_SchemaConverter]|None" = None
+    self.values: "_SchemaConverter|None" = None
+
+    # union members, which could accept values of the given type
+    self.candidates: "dict[type, list[_SchemaConverter]]" = {}
+    self.candidates_version: int = transformations.version
+
+    # union members by the value of discriminator key in the data
+    self.discriminator_key: "str|None" = discriminator_key
+    self.discriminator: "dict[object, _SchemaConverter]|None" = None
+    if discriminator_key is not None:
+      if not self.is_union:
+        raise TypeError(f"Discriminator '{discriminator_key}' could be set only for the Union types, not for '{schema}'")
+
+      self.discriminator = {}
+      for t in _get_union_args(self.type):
+        if not (isinstance(t, type) and issubclass(t, SerializableObject)):
+          continue
+        if (value := _class_default(t, discriminator_key)) is None:
+          raise ValueError(f"Union member '{t.__name__}' has no default value of the discriminator "
+                           f"'{discriminator_key}'")
+
+        converter = _converter_for(t)
+        for key in (value, value.value) if isinstance(value, enum.Enum) else (value,):
+          if (other := self.discriminator.get(key)) is not None and other is not converter:
+            raise ValueError(f"Union members '{other.type.__name__}' and '{t.__name__}' have the same value "
+                             f"'{key}' of the discriminator '{discriminator_key}'")
+          self.discriminator[key] = converter
+
+  def accepts(self, value) -> bool:
+    """
+    Type-level check of the value, same as done by the de-serialization before conversion
+    """
+    return not self.property_type \
+      or self.is_union \
+      or isinstance(value, self.type) \
+      or transformations.find_deserializer(self.type, value) is not None \
+      or (self.expects_object and isinstance(value, dict))
+
+  def union_candidates(self, value) -> "list[_SchemaConverter]":
+    """
+    Union members able to accept the value by its type, in the declaration order. Computed once per value type.
+    """
+    if self.candidates_version != transformations.version:
+      self.candidates = {}
+      self.candidates_version = transformations.version
+
+    try:
+      return self.candidates[value.__class__]
+    except KeyError:
+      c = self.candidates[value.__class__] = [m for m in self.union_items if m.accepts(value)]
+      return c
+
+  def resolve_discriminator(self, value) -> "_SchemaConverter|None":
+    if isinstance(value, dict):
+      try:
+        return self.discriminator.get(value.get(self.discriminator_key))
+      except TypeError:  # not hashable value
+        return None
+    return None
+
+  @property
+  def union_items(self) -> "list[_SchemaConverter]":
+    if self.items is None:
+      self.items = [_converter_for(t) for t in _get_union_args(self.type)]
+    return self.items
+
+  @property
+  def dict_values(self) -> "_SchemaConverter|None":
+    if self.values is None and len(self.args) == 2:
+      self.values = _converter_for(self.args[1])
+    return self.values
+
+
+_converters: "dict[object, _SchemaConverter]" = {}
+
+
+def _converter_for(schema) -> _SchemaConverter:
+  # int | str equals to str | int, while the order of the members matters, repr() keeps it
+  key = schema if isinstance(schema, type) else (schema, repr(schema))
+  try:
+    return _converters[key]
+  except KeyError:
+    c = _converters[key] = _SchemaConverter(schema)
+    return c
+  except TypeError:  # not hashable schema, could not be cached
+    return _SchemaConverter(schema)
+
+
+_MISSING = object()
+
+
+def _serialize_transform(item, minimal: bool = False):
+  if item is None:
+    return None
+  elif isinstance(item, SerializableObject):
+    return item.serialize(minimal=minimal)
+  elif isinstance(item, (list, tuple, set)):
+    return [_serialize_transform(i, minimal=minimal) for i in item]
+  elif (t := transformations.find_serializer(item)) is not None and (r := t.serialize(item)) is not None:
+    if t.is_serialize_chain():
+      return _serialize_transform(r, minimal=minimal)
+    return r
+  elif isinstance(item, dict):
+    r_obj = {}
+    for k, v in list(item.items()):
+      if minimal and not v:
+        continue
+      r_obj[k] = _serialize_transform(v, minimal=minimal)
+    return r_obj
+
+  return item
+
+
+def _serialize_object(item, minimal: bool = False):
+  if isinstance(item, SerializableObject):
+    return item.serialize(minimal=minimal)
+  return _serialize_transform(item, minimal=minimal)
+
+
+def _encoder_for(converter: "_SchemaConverter|None"):
+  """
+  Pick the serialization function for the field by its annotation
+  """
+  if converter is not None and converter.expects_object and not (converter.is_list or converter.is_dict):
+    return _serialize_object
+  return _serialize_transform
+
+
+class _FieldPlan(object):
+  __slots__ = ("name", "alias", "default", "converter", "lazy", "intern")
+
+  def __init__(self, name: str, alias: "str|None", default, converter: _SchemaConverter):
+    self.name: str = name
+    self.alias: "str|None" = alias
+    self.default = default
+    self.converter: _SchemaConverter = converter
+    self.lazy: bool = False
+    self.intern: bool = False
+
+
+class _Projection(object):
+  """
+  Subset of the class plan fields, used to de-serialize only the requested fields
+  """
+  __slots__ = ("fields", "grouping")
+
+  def __init__(self, fields: list[_FieldPlan], grouping: dict):
+    self.fields: list[_FieldPlan] = fields
+    self.grouping: dict = grouping
+
+
+class _LazyField(object):
+  """
+  Non-data descriptor, installed in place of nested fields of the classes with __lazy__ = True.
+
+  The raw value is kept in the object "__raw__" dict and converted on the first access, the result is stored into
+  the object __dict__, which takes precedence over this descriptor for any further access.
+  """
+  __slots__ = ("name", "default")
+
+  def __init__(self, name: str, default):
+    self.name: str = name
+    self.default = default
+
+  def __get__(self, obj, owner=None):
+    if obj is None:
+      return self.default
+
+    raw = obj.__dict__.get("__raw__")
+    if raw is not None and self.name in raw:
+      return obj._SerializableObject__resolve_lazy(self.name)  # noqa, private API of SerializableObject
+
+    return self.default
+
+
+class _ClassPlan(object):
+  """
+  Per-class compiled view of SerializableObject definition: resolved type hints, defaults, aliases and
+  converters for every field. Built once on the first object creation and stored in the class own __dict__,
+  so subclasses and re-defined classes are getting their own plan.
+  """
+  def __init__(self, clazz: type):
+    exclude_types = (FunctionType, property, classmethod, staticmethod, MemberDescriptorType, _LazyField)
+    serialize_exclude_types = (FunctionType, MethodType, BuiltinMethodType, property, classmethod, staticmethod,
+                               MemberDescriptorType, _LazyField)
+    ignored_fields = set(clazz.__ignored_fields__)
+    mapping: dict = clazz.__mapping__
+    annotations: dict = get_type_hints(clazz)
+    class_properties: dict = dict(clazz.__dict__)
+    class_properties.update({
+      k: v for k, v in clazz.__dict__.get("__compact_defaults__", {}).items() if k in annotations
+    })
+
+    properties: dict = {
+      k: v for k, v in class_properties.items()
+      if not k.startswith("__")
+      and k not in ignored_fields
+      and not isinstance(v, exclude_types)
+    }
+
+    self.strict: bool = clazz.__strict__
+    self.mapping: dict = mapping
+    self.grouping: dict = clazz.__grouping__
+    self.ignored_fields: set = ignored_fields
+    discriminators: dict = clazz.__discriminator__
+    self.fields: list[_FieldPlan] = [
+      _FieldPlan(
+        name,
+        mapping.get(name),
+        properties.get(name, None),
+        _SchemaConverter(schema, discriminators[name]) if name in discriminators else _converter_for(schema)
+      )
+      for name, schema in annotations.items()
+      if not name.startswith("__") and name not in ignored_fields
+    ]
+    self.known_keys: frozenset = frozenset(annotations.keys()) | frozenset(mapping.values())
+    self.field_names: frozenset = frozenset(f.name for f in self.fields) | frozenset(self.grouping.keys())
+    self.projections: dict[frozenset, _Projection] = {}
+    self.track_changes: bool = clazz.__track_changes__
+    self.missing_annotations: frozenset = frozenset(properties.keys()) - frozenset(annotations.keys())
+
+    # keys which are not going directly to the output of serialize(), but handled separately
+    self.serialize_special: frozenset = frozenset(mapping.keys()) | frozenset(self.grouping.keys())
+    self.serialize_exclude_types: tuple = serialize_exclude_types
+    self.serialize_defaults: dict = {
+      k: v for k, v in clazz.__dict__.items() if self.is_serializable(k, v)
+    }
+
+    # initial values of __slots__ for classes made by @compact, including inherited ones
+    self.slot_defaults: dict = {}
+    for c in reversed(clazz.__mro__):
+      self.slot_defaults.update(c.__dict__.get("__compact_defaults__", {}))
+    self.slots: tuple = tuple(k for k in self.slot_defaults.keys() if not k.startswith("__"))
+
+    # nested objects, lists and dicts which are decoded on the first access (slots could not be used for that)
+    if clazz.__lazy__:
+      for field in self.fields:
+        c = field.converter
+        field.lazy = field.name not in self.slot_defaults and (c.expects_object or c.is_list or c.is_dict)
+    self.lazy_fields: dict[str, _FieldPlan] = {f.name: f for f in self.fields if f.lazy}
+
+    # str values and dict keys, which are replaced by the interned copies
+    intern = clazz.__intern__
+    for field in self.fields:
+      c = field.converter
+      field.intern = intern and (str in c.args or c.is_dict) if isinstance(intern, bool) else field.name in intern
+
+    # generated de-serialization and serialization functions, lazy fields are handled only by the generic code
+    self.compile: bool = clazz.__compiled__ and not self.lazy_fields
+    self.compiled = None
+
+    # serialization plan: (output key, attribute name, class default, encoder) in the output order
+    converters = {f.name: f.converter for f in self.fields}
+    names = list(self.serialize_defaults.keys())
+    names += [k for k in list(annotations.keys()) + list(self.slots) if k not in names and self.is_serializable(k, None)]
+    self.serialize_fields: list[tuple] = [
+      (k, k, self.serialize_defaults.get(k, _MISSING), _encoder_for(converters.get(k))) for k in names
+    ]
+    self.serialize_mapped: list[tuple] = [
+      (a, p, clazz.__dict__.get(p, _MISSING), _encoder_for(converters.get(p))) for p, a in mapping.items()
+    ]
+    self.serialize_grouped: list[tuple] = [(k, clazz.__dict__.get(k)) for k in self.grouping.keys()]
+    # any other instance attribute is checked and added to the output at runtime
+    self.serialize_known: frozenset = frozenset(names) | self.serialize_special | frozenset(ignored_fields) \
+      | frozenset(("__error__", "__raw__", "__annotations__", "__file_type__"))
+
+  def projection(self, clazz: type, names: "Iterable[str]") -> _Projection:
+    """
+    Cached projection of the plan to the given field names
+
+    :raises AttributeError: if the class doesn't define some of the fields
+    """
+    names = frozenset(names)
+    try:
+      return self.projections[names]
+    except KeyError:
+      pass
+
+    if unknown := names - self.field_names:
+      raise AttributeError(f"{clazz.__name__} class doesn't contain properties: {', '.join(sorted(unknown))}")
+
+    projection = self.projections[names] = _Projection(
+      [f for f in self.fields if f.name in names],
+      {k: v for k, v in self.grouping.items() if k in names}
+    )
+    return projection
+
+  def is_serializable(self, k: str, v) -> bool:
+    return not k.startswith("__") \
+      and not (k.startswith("_") and "__" in k) \
+      and k not in self.ignored_fields \
+      and not isinstance(v, self.serialize_exclude_types) \
+      and k not in self.serialize_special
+
+
+def _intern_value(value):
+  """
+  Replace strings in the value, list items, dict keys and values with the interned copies
+  """
+  if type(value) is str:
+    return sys.intern(value)
+  if type(value) is list:
+    return [sys.intern(v) if type(v) is str else v for v in value]
+  if type(value) is dict:
+    return {sys.intern(k) if type(k) is str else k: sys.intern(v) if type(v) is str else v for k, v in value.items()}
+  return value
+
+
+def _tracking_setattr(setattr_: Callable[[Any, str, Any], None]) -> Callable[[Any, str, Any], None]:
+  """
+  Wrap __setattr__ of the class with __track_changes__ = True, the name is recorded once the original
+  __setattr__ assigned the value
+  """
+  def __setattr__(obj: "SerializableObject", name: str, value):
+    setattr_(obj, name, value)
+    if not name.startswith("__") and (changes := getattr(obj, "__changes__", None)) is not None:
+      changes.add(name)
+
+  __setattr__.__tracking__ = True
+  return __setattr__
+
+
+def _class_plan(clazz: type) -> _ClassPlan:
+  try:
+    return clazz.__dict__["__plan__"]
+  except KeyError:
+    plan = _ClassPlan(clazz)
+    for name in plan.lazy_fields.keys():
+      if not isinstance(inspect.getattr_static(clazz, name, None), _LazyField):
+        setattr(clazz, name, _LazyField(name, getattr(clazz, name, None)))
+
+    if plan.track_changes and not getattr(clazz.__setattr__, "__tracking__", False):  # could be inherited
+      clazz.__setattr__ = _tracking_setattr(clazz.__setattr__)
+
+    setattr(clazz, "__plan__", plan)
+    return plan
+
+
+def _compiled_plan(clazz: type, plan: _ClassPlan):
+  """
+  Generated functions of the class with __compiled__ = True, re-generated if the transformations were changed
+  """
+  if (compiled := plan.compiled) is None or compiled.version != transformations.version:
+    from .codegen import compile_plan
+    compiled = plan.compiled = compile_plan(clazz, plan)
+  return compiled
+
+
+def _object_state(obj: "SerializableObject", plan: _ClassPlan) -> dict:
+  """
+  Instance values, taken from __dict__ and/or __slots__
+  """
+  if plan.lazy_fields:
+    obj.materialize(recursive=False)
+
+  if not plan.slots:
+    return obj.__dict__
+
+  state = dict(obj.__dict__) if hasattr(obj, "__dict__") else {}
+  state.update({k: getattr(obj, k) for k in plan.slots})
+  return state
+
+
+# values which could be shared between the object copies
+_IMMUTABLE_TYPES = (str, int, float, bytes, type(None), enum.Enum, date, time, timedelta)
+
+
+def _clone_value(v):
+  """
+  Deep copy of the field value, sharing immutable values and copying nested objects with copy constructor
+  """
+  if isinstance(v, _IMMUTABLE_TYPES):
+    return v
+  if isinstance(v, SerializableObject):
+    return v.__class__(v)
+  if type(v) is list:
+    return [_clone_value(item) for item in v]
+  if type(v) is dict:
+    return {k: _clone_value(item) for k, item in v.items()}
+  return copy.deepcopy(v)
+
+
+def _iter_properties(obj: "SerializableObject", minimal: bool = False) -> Generator[tuple, Any, None]:
+  """
+  Walk the serialization plan of the object class and yields (output key, raw value, encoder) in the output order
+  """
+  plan: _ClassPlan = _class_plan(obj.__class__)
+  state: dict = _object_state(obj, plan)
+
+  for key, name, default, encoder in plan.serialize_fields:
+    if (v := state.get(name, default)) is _MISSING or (minimal and not v):
+      continue
+    yield key, v, encoder
+
+  if state.keys() - plan.serialize_known:  # attributes, which are not part of the class definition
+    for k, v in state.items():
+      if k not in plan.serialize_known and plan.is_serializable(k, v) and not (minimal and not v):
+        yield k, v, _serialize_transform
+
+  for key, name, default, encoder in plan.serialize_mapped:
+    if (v := state.get(name, default)) is _MISSING or (minimal and not v):
+      continue
+    yield key, v, encoder
+
+  for name, default in plan.serialize_grouped:
+    if isinstance(v := state.get(name, default), dict):
+      for k, group_v in v.items():
+        if not (minimal and not group_v):
+          yield k, group_v, _serialize_transform
+
+
+def _validate_value(value, converter: _SchemaConverter, path: str, errors: list[str]):
+  """
+  Check the value against the schema the same way as de-serialization does, but without creating objects
+  """
+  if value is None:
+    return
+
+  _type = converter.type
+  property_type = converter.property_type
+  transformation = None if converter.is_union else transformations.find_deserializer(_type, value)
+
+  if property_type and not converter.is_union \
+    and not isinstance(value, _type) \
+    and transformation is None \
+    and not (converter.expects_object and isinstance(value, dict)):
+    errors.append(f"{path}: expecting '{converter.error_type_name}' but got '{type(value).__name__}' (value: {value})")
+    return
+
+  if converter.is_list:
+    if not property_type:
+      return
+    for n, item in enumerate(value):
+      if converter.expects_object:
+        if isinstance(item, dict):
+          _validate_object(property_type, item, f"{path}[{n}]", errors)
+        elif item is not None and not isinstance(item, property_type):  # None is created as default object
+          errors.append(f"{path}[{n}]: expecting '{property_type.__name__}' but got '{type(item).__name__}'")
+      elif not isinstance(property_type, type) or not isinstance(item, property_type):
+        try:
+          property_type(item)
+        except (ValueError, TypeError) as e:
+          errors.append(f"{path}[{n}]: {e}")
+  elif converter.is_dict:
+    if (values := converter.dict_values) is not None:
+      for k, v in value.items():
+        _validate_value(v, values, f"{path}[{k!r}]", errors)
+  elif converter.is_union:
+    if converter.discriminator is not None and isinstance(value, dict):
+      if (c := converter.resolve_discriminator(value)) is not None:
+        _validate_value(value, c, path, errors)
+      else:
+        errors.append(f"{path}: Cannot resolve Union type '{_type}' by '{converter.discriminator_key}' value "
+                      f"'{value.get(converter.discriminator_key)}'")
+      return
+
+    for c in converter.union_candidates(value):
+      union_errors = []
+      _validate_value(value, c, path, union_errors)
+      if not union_errors:
+        return
+    errors.append(f"{path}: Cannot resolve Union type '{_type}' for value '{value}'")
+  elif transformation is not None:
+    try:
+      transformation.deserialize(_type, value)
+    except (ValueError, TypeError) as e:
+      errors.append(f"{path}: {e}")
+  elif converter.expects_object and isinstance(value, dict):
+    _validate_object(_type, value, path, errors)
+  elif not isinstance(value, _type):
+    try:
+      _type(value)
+    except (ValueError, TypeError) as e:
+      errors.append(f"{path}: {e}")
+
+
+def _validate_object(clazz: type, d: dict, path: str, errors: list[str]):
+  plan: _ClassPlan = _class_plan(clazz)
+
+  for field in plan.fields:
+    resolved_prop = field.alias
+    if resolved_prop is None or (field.name in d and resolved_prop not in d):
+      resolved_prop = field.name
+
+    if resolved_prop in d:
+      _validate_value(d[resolved_prop], field.converter, f"{path}.{field.name}", errors)
+
+  if not plan.strict:
+    return
+
+  missing_definitions = d.keys() - plan.known_keys
+  for pattern in plan.grouping.values():
+    missing_definitions = {k for k in missing_definitions if not k.endswith(pattern)}
+
+  for k in missing_definitions:
+    errors.append(f"{path}: {clazz.__name__} class doesn't contain property '{k}: {type(d[k]).__name__}'")
+
+  for k in plan.missing_annotations:
+    errors.append(f"{path}: {clazz.__name__} class doesn't contain type annotation in the definition '{k}'")
+
+
+def _class_default(clazz: type, name: str):
+  for c in clazz.__mro__:
+    if name in (compact_defaults := c.__dict__.get("__compact_defaults__", {})):
+      return compact_defaults[name]
+    if name in c.__dict__:
+      return c.__dict__[name]
+  return None
+
+
+def compact(clazz: type) -> type:
+  """
+  Class decorator, which re-creates SerializableObject subclass with __slots__ storage generated from the class
+  annotations. Such objects have no instance __dict__, which saves a lot of memory for big amounts of small objects.
+
+  All base classes should be compact as well (SerializableObject itself is), otherwise instances would still
+  get __dict__ from the non-compact base.
+
+   @compact
+   class PersonView(SerializableObject):
+     name: str = None
+     age: int = None
+  """
+  if not isinstance(clazz, type) or not issubclass(clazz, SerializableObject):
+    raise TypeError("@compact could be applied only to the SerializableObject subclasses")
+
+  if "__slots__" in clazz.__dict__:
+    raise TypeError(f"{clazz.__name__} already defines __slots__")
+
+  ns = dict(clazz.__dict__)
+  inherited_slots = {name for c in clazz.__mro__[1:] for name in c.__dict__.get("__slots__", ())}
+  names = [k for k in ns.get("__annotations__", {}).keys() if not k.startswith("__")]
+  names += [k for k in clazz.__grouping__.keys() if k not in names]
+  names += ["__error__", "__file_type__"]
+  if clazz.__track_changes__:
+    names.append("__changes__")
+  names = [k for k in names if k not in inherited_slots]
+
+  defaults = {k: ns.pop(k) if k in ns else _class_default(clazz, k) for k in names}
+  if "__error__" in defaults:
+    defaults["__error__"] = ()
+
+  for k in ("__dict__", "__weakref__", "__plan__"):
+    ns.pop(k, None)
+  ns["__slots__"] = tuple(names)
+  ns["__compact_defaults__"] = defaults
+
+  new_clazz = type(clazz)(clazz.__name__, clazz.__bases__, ns)
+
+  # methods using zero-argument super() are referencing original class via __class__ closure cell
+  for v in ns.values():
+    f = v.__func__ if isinstance(v, (classmethod, staticmethod)) else v.fget if isinstance(v, property) else v
+    for cell in getattr(f, "__closure__", None) or ():
+      try:
+        if cell.cell_contents is clazz:
+          cell.cell_contents = new_clazz
+      except ValueError:  # empty cell
+        pass
+
+  return new_clazz
 
 
 class SerializableObject(object):
@@ -133,6 +775,28 @@ class SerializableObject(object):
   """
   __mapping__: dict = {}
 
+  """
+  Resolve the Union of SerializableObject subclasses by the value of the key in data, instead of trying
+  each Union member one by one. The value is matched with the class default of the same name in each member.
+
+  For example:
+   class Circle(SerializableObject):
+     kind: str = "circle"
+     radius: float = 0.0
+
+   class Square(SerializableObject):
+     kind: str = "square"
+     side: float = 0.0
+
+   class Drawing(SerializableObject):
+     __discriminator__ = {
+       'shape': 'kind'
+     }
+
+     shape: Circle | Square = None
+  """
+  __discriminator__: dict = {}
+
 
   """
     List of fields to be ignored from serialization/de-serialization
@@ -144,40 +808,193 @@ class SerializableObject(object):
   """
   __file_type__: SODumpType = SODumpType.JSON
 
-  def __init__(self, serialized_obj: "str|dict|SerializableObject|type[SerializableObject]|None" = None, **kwargs):
-    self.__error__ = []
-
-    if isinstance(serialized_obj, type(self)):
-      import copy
-      self.__dict__ = copy.deepcopy(serialized_obj.__dict__)
-      self.__annotations__ = copy.deepcopy(serialized_obj.__annotations__)
-      return
-
-    if isinstance(serialized_obj, str):
-      try:
-        serialized_obj = json.loads(serialized_obj)
-        self.__file_type__ = SODumpType.JSON
-      except json.JSONDecodeError:
-        pass
+  """
+  Decode nested objects, lists and dicts only on the first access to the field. Conversion errors are reported on
+  access (ValueError for strict objects) or all at once by calling materialize()
+  """
+  __lazy__: bool = False
 
-    if YAML_ENABLED and isinstance(serialized_obj, str):
-      try:
-        serialized_obj = yaml.safe_load(serialized_obj)
-        self.__file_type__ = SODumpType.YAML
-      except yaml.YAMLError:
-        pass
+  """
+  Track names of the fields assigned after the object creation, see changed_fields() and serialize_changes().
+  Enabling it wraps __setattr__ of the class (the own one is kept), so attributes assignment becomes slower
+  """
+  __track_changes__: bool = False
 
-    assert serialized_obj is None or isinstance(serialized_obj, dict)
+  """
+  Share repeated strings between objects, which saves memory for big amounts of long-lived objects with
+  low-cardinality values (statuses, country codes, host names). Strings are interned with sys.intern,
+  so they are released as soon as no object references them.
+   True - intern str fields, str items of list fields, and keys and str values of dict fields
+   list of field names - intern only the listed fields
+  """
+  __intern__: "bool|list[str]" = False
 
-    if len(kwargs) > 0:
-      if not serialized_obj:
-        serialized_obj = {}
-      serialized_obj.update(kwargs)
+  """
+  Generate and compile specialized de-serialization and serialize() functions for the class, with inlined
+  conversion of str, int, float, bool, enum, nested object and list fields. It makes object creation and
+  serialization several times faster, but takes some time on the first use of the class.
+  Ignored for classes with __lazy__ = True.
+  """
+  __compiled__: bool = False
 
-    if serialized_obj is None:
-      return
+  """
+  No instance storage is defined here, so subclasses decide between __dict__ (default) and __slots__ (see @compact)
+  """
+  __slots__ = ()
+
+  def __init__(self, serialized_obj: "str|bytes|dict|SerializableObject|type[SerializableObject]|None" = None, *,
+               _type: SODumpType = None, _fields: "Iterable[str]|None" = None, **kwargs):
+    """
+    :param serialized_obj: dict, JSON, YAML or MessagePack document, or another object of the same class to copy
+    :param _type: format of the serialized_obj document, guessed if not set
+    :param _fields: de-serialize only these fields (and kwargs), see project()
+    :param kwargs: field values, applied on top of serialized_obj
+    """
+    plan: _ClassPlan = _class_plan(self.__class__)
+    for k, v in plan.slot_defaults.items():
+      setattr(self, k, v)
+
+    self.__error__ = ()
 
-    self.__deserialize(serialized_obj)
+    if isinstance(serialized_obj, type(self)):
+      if plan.slots:
+        for k in plan.slot_defaults.keys():
+          setattr(self, k, _clone_value(getattr(serialized_obj, k)))
+      if hasattr(serialized_obj, "__dict__"):
+        self.__dict__ = {k: _clone_value(v) for k, v in serialized_obj.__dict__.items()}
+    else:
+      if isinstance(serialized_obj, (str, bytes)):
+        serialized_obj, file_type = _parse_text(serialized_obj, _type)
+        if file_type is not None:
+          self.__file_type__ = file_type
+
+      assert serialized_obj is None or isinstance(serialized_obj, dict)
+
+      if len(kwargs) > 0:
+        if not serialized_obj:
+          serialized_obj = {}
+        serialized_obj.update(kwargs)
+        if _fields is not None:
+          _fields = frozenset(_fields).union(kwargs.keys())
+
+      if serialized_obj is not None:
+        self.__deserialize(serialized_obj, None if _fields is None else plan.projection(self.__class__, _fields))
+
+    if plan.track_changes:
+      self.__changes__ = set()  # changes are tracked only after the object construction
+
+  @classmethod
+  def from_json(cls, data: "str|bytes") -> "SerializableObject":
+    """
+    Create object from JSON document, without guessing of the document format
+    """
+    return cls(data, _type=SODumpType.JSON)
+
+  @classmethod
+  def from_yaml(cls, data: "str|bytes") -> "SerializableObject":
+    """
+    Create object from YAML document, without guessing of the document format
+    """
+    return cls(data, _type=SODumpType.YAML)
+
+  @classmethod
+  def project(cls, data: "dict|str|bytes", fields: "Iterable[str]", _type: SODumpType = None) -> "SerializableObject":
+    """
+    Create object de-serializing only the given fields, the rest keep class defaults and are not checked
+    against the data: unknown properties don't raise errors for strict classes. Projections are cached per
+    class and set of fields, so repeating calls with the same fields are cheap.
+
+    :raises AttributeError: if the class doesn't define some of the fields
+    """
+    return cls(data, _type=_type, _fields=fields)
+
+  @classmethod
+  def from_bytes(cls, data: bytes, _type: SODumpType = None) -> "SerializableObject":
+    """
+    Create object from MessagePack document, or JSON or YAML document in utf-8 encoded bytes, without decoding
+    them to str first
+    """
+    return cls(data, _type=_type)
+
+  @classmethod
+  def validate(cls, data: "dict|str|bytes", _type: SODumpType = None) -> list[str]:
+    """
+    Check the document against the class schema without creating objects.
+
+    Reports all wrong types, not resolvable unions, not convertible values and, for strict classes,
+    unknown properties, each error is prefixed with the path to the value.
+
+    :param data: dict, JSON, YAML or MessagePack document
+    :param _type: format of the document, guessed if not set
+    :return: list of errors, empty if document is valid
+    """
+    if isinstance(data, (str, bytes)):
+      try:
+        data, _ = _parse_text(data, _type)
+      except ValueError as e:
+        return [f"{cls.__name__}: {e}"]
+
+    if not isinstance(data, dict):
+      return [f"{cls.__name__}: expecting object, but got '{type(data).__name__}'"]
+
+    errors: list[str] = []
+    _validate_object(cls, data, cls.__name__, errors)
+    return errors
+
+  @classmethod
+  def from_iter(cls, items: "Iterable[dict|str]", errors: "list[tuple[int, Exception]]|None" = None) \
+    -> "Generator[SerializableObject, Any, None]":
+    """
+    Lazily de-serialize the sequence of records, one object per record.
+
+    :param items: iterable of dict or JSON/YAML string records
+    :param errors: if passed, broken records are skipped and (record number, exception) pairs are collected
+                   to the list, instead of raising on the first broken record
+    """
+    _class_plan(cls)  # compile the plan once for the whole batch
+    for n, item in enumerate(items):
+      try:
+        yield cls(item)
+      except (ValueError, AssertionError) as e:
+        if errors is None:
+          raise
+        errors.append((n, e))
+
+  @classmethod
+  def from_list(cls, items: "list[dict]", errors: "list[tuple[int, Exception]]|None" = None) -> "list[SerializableObject]":
+    """
+    De-serialize list of dicts (for example parsed JSON array) to the list of objects.
+    See from_iter for errors argument.
+    """
+    return list(cls.from_iter(items, errors=errors))
+
+  @classmethod
+  def iter_ndjson(cls, fp: IO, errors: "list[tuple[int, Exception]]|None" = None) \
+    -> "Generator[SerializableObject, Any, None]":
+    """
+    Stream objects from the newline-delimited JSON text or binary file, reading it line by line.
+    Empty lines are skipped, record numbers reported to errors are line numbers starting from 1.
+    """
+    _class_plan(cls)
+    for line_no, line in enumerate(fp, start=1):
+      if not line.strip():
+        continue
+      try:
+        record = json_loads(line)
+        if not isinstance(record, dict):
+          raise ValueError(f"Line {line_no}: expecting JSON object, but got '{type(record).__name__}'")
+        yield cls(record)
+      except (ValueError, AssertionError) as e:
+        if errors is None:
+          raise
+        errors.append((line_no, e))
+
+  @classmethod
+  def from_ndjson(cls, fp: IO, errors: "list[tuple[int, Exception]]|None" = None) -> "list[SerializableObject]":
+    """
+    Read all objects from the newline-delimited JSON file. See iter_ndjson to stream records instead.
+    """
+    return list(cls.iter_ndjson(fp, errors=errors))
 
   def __handle_errors(self, clazz: type, d: dict, missing_definitions, missing_annotations):
     for miss_def in missing_definitions:
@@ -197,27 +1014,23 @@ A number of errors happen:
 - {end_line.join(self.__error__)}
 """)
 
-  def __deserialize_transform(self, property_value, schema, supress_error: bool = False):
-    is_typing_hint = (_type := getattr(schema, "__origin__", None)) is not None
-    _type = _type if is_typing_hint else schema
-    # For both typing.Union[X,Y] (origin=Union) and native X|Y, treat _type as the union schema itself
-    if _type is Union or _is_union(schema):
-      _type = schema
-    schema_args = list(get_args(schema)) if is_typing_hint or _is_union(schema) else [] if _type is list else [schema]
-    schema_len = len(schema_args)
-    property_type = schema_args[0] if schema_args else None
+  def __deserialize_transform(self, property_value, converter: _SchemaConverter, supress_error: bool = False):
+    _type = converter.type
+    property_type = converter.property_type
+    transformation = None if converter.is_union or property_value is None \
+      else transformations.find_deserializer(_type, property_value)
 
     if property_type and property_value is not None \
+      and not converter.is_union \
       and not isinstance(property_value, _type) \
-      and not _is_union(_type) \
-      and not reduce(lambda x, y: x or y.deserialize_condition(_type, property_value), transformations.items, False) \
-      and not (issubclass(property_type, SerializableObject) and isinstance(property_value, dict)):
+      and transformation is None \
+      and not (converter.expects_object and isinstance(property_value, dict)):
 
       if not supress_error:
         self.__error__.append(
           "Conflicting type in schema and data for object '{}', expecting '{}' but got '{}' (value: {})".format(
             self.__class__.__name__,
-            " | ".join([ t.__name__ for t in schema_args]) if _is_union(schema) else property_type.__name__,
+            converter.error_type_name,
             type(property_value).__name__,
             property_value
           ))
@@ -226,58 +1039,74 @@ A number of errors happen:
     try:
       if property_value is None:
         return None
-      elif _type is list:
+      elif converter.is_list:
         return [property_type(i) for i in property_value] if property_type else property_value
-      elif _type is dict:
-        return {k: self.__deserialize_transform(v, schema_args[1] if schema_len == 2 else type(v)) for k, v in property_value.items()}
-      elif _is_union(_type):   # handle definitions like a: [int|str|MyObj] = 5 or Union[int, str, MyObj]
-        for t in _get_union_args(_type):
-          if (__v := self.__deserialize_transform(property_value, t, supress_error=True)) is not None:
+      elif converter.is_dict:
+        values = converter.dict_values
+        return {
+          k: self.__deserialize_transform(v, values if values is not None else _converter_for(type(v)))
+          for k, v in property_value.items()
+        }
+      elif converter.is_union:   # handle definitions like a: [int|str|MyObj] = 5 or Union[int, str, MyObj]
+        if converter.discriminator is not None and isinstance(property_value, dict):
+          if (c := converter.resolve_discriminator(property_value)) is not None:
+            return self.__deserialize_transform(property_value, c)
+
+          self.__error__.append("Cannot resolve Union type '{}' by '{}' value '{}'".format(
+            _type, converter.discriminator_key, property_value.get(converter.discriminator_key)))
+          return None
+
+        errors_count = len(self.__error__)
+        for c in converter.union_candidates(property_value):
+          __v = self.__deserialize_transform(property_value, c, supress_error=True)
+          del self.__error__[errors_count:]  # errors of the attempts with not matching type are not relevant
+          if __v is not None:
             return __v
         self.__error__.append("Cannot resolve Union type '{}' for value '{}'".format(_type, property_value))
         return None
-      elif (r := transformations.deserialize(_type, property_value)) is not None:
+      elif transformation is not None and (r := transformation.deserialize(_type, property_value)) is not None:
         return r
       else:
         return _type(property_value) \
           if _type and property_value is not None and not isinstance(property_value, _type)\
           else property_value
-    except ValueError as v:
+    except (ValueError, TypeError) as v:  # TypeError for values of wrong type, like int(None) or list enum value
       self.__error__.append(str(v))
 
-  def __deserialize(self, d: dict):
+  def __deserialize(self, d: dict, projection: _Projection = None):
     self.__error__ = []
     clazz: type = self.__class__
-    exclude_types = (FunctionType, property, classmethod, staticmethod)
-    properties = {
-      k: v for k, v in clazz.__dict__.items()
-      if not k.startswith("__")
-      and k not in self.__ignored_fields__
-      and not isinstance(v, exclude_types)
-    }
-    annotations = get_type_hints(clazz)
-
-    for property_name, schema in annotations.items():
-      if property_name.startswith("__") or property_name in self.__ignored_fields__:
-        continue
-
-      try:
-        resolved_prop = self.__mapping__[property_name]
-        # if mapped alias is not present but original is - use it
-        assert not (property_name in d and resolved_prop not in d)
-      except (KeyError, AssertionError):
+    plan: _ClassPlan = _class_plan(clazz)
+    fields, grouping = (plan.fields, plan.grouping) if projection is None else \
+      (projection.fields, projection.grouping)
+
+    if plan.compile and projection is None:
+      _compiled_plan(clazz, plan).deserialize_fields(self, d)
+      fields = ()
+
+    for field in fields:
+      property_name = field.name
+      resolved_prop = field.alias
+      # if mapped alias is not present but original is - use it
+      if resolved_prop is None or (property_name in d and resolved_prop not in d):
         resolved_prop = property_name
 
       if resolved_prop not in d:  # Property didn't come with data, setting default value
-        self.__setattr__(property_name, properties.get(property_name, None))
+        self.__setattr__(property_name, field.default)
+        continue
+
+      if field.lazy:
+        if (raw := self.__dict__.get("__raw__")) is None:
+          raw = self.__dict__["__raw__"] = {}
+        raw[property_name] = d[resolved_prop]
         continue
 
-      property_value = d[resolved_prop]
-      self.__setattr__(property_name, self.__deserialize_transform(property_value, schema))
+      value = self.__deserialize_transform(d[resolved_prop], field.converter)
+      self.__setattr__(property_name, _intern_value(value) if field.intern else value)
 
-    missing_definitions = set(d.keys()) - set(annotations.keys()) - set(self.__mapping__.values())
-    if self.__grouping__:
-      for definition, pattern in self.__grouping__.items():
+    missing_definitions = d.keys() - plan.known_keys if grouping or projection is None else ()
+    if grouping:
+      for definition, pattern in grouping.items():
         ret = {}
         for unknown_def in missing_definitions:
           if unknown_def.endswith(pattern):
@@ -286,57 +1115,220 @@ A number of errors happen:
           self.__setattr__(definition, ret)
           missing_definitions = set(missing_definitions) - set(ret.keys())
 
-    if self.__strict__:
-      missing_annotations = set(properties.keys()) - set(annotations.keys())
-      self.__handle_errors(clazz, d, missing_definitions, missing_annotations)
+    if plan.strict:
+      if projection is None:
+        self.__handle_errors(clazz, d, missing_definitions, plan.missing_annotations)
+      else:  # not projected properties are not checked, only conversion errors are reported
+        self.__handle_errors(clazz, d, (), ())
 
-  def __serialize_transform(self, item, minimal: bool = False):
-    if item is None:
-      return None
-    elif isinstance(item, SerializableObject) or issubclass(type(item), SerializableObject):
-      return item.serialize(minimal=minimal)
-    elif isinstance(item, (list, tuple, set)):
-      return [self.__serialize_transform(i, minimal=minimal) for i in item]
-    elif (r := transformations.serialize(item)) is not None:
-      if transformations.need_chain_serialize(item):
-        return self.__serialize_transform(r, minimal=minimal)
-      return r
-    elif isinstance(item, dict):
-      r_obj = {}
-      for k, v in list(item.items()):
-        if minimal and not v:
-          continue
-        r_obj[k] = self.__serialize_transform(v, minimal=minimal)
-      return r_obj
+    if not self.__error__:
+      self.__error__ = ()  # do not keep empty list per object
+
+  def __resolve_lazy(self, name: str):
+    raw: dict = self.__dict__["__raw__"]
+    field: _FieldPlan = _class_plan(self.__class__).lazy_fields[name]
+    errors = list(self.__error__)
+    self.__error__ = []
 
-    return item
+    value = self.__deserialize_transform(raw.pop(name), field.converter)
+    value = self.__dict__[name] = _intern_value(value) if field.intern else value
+    if not raw:
+      del self.__dict__["__raw__"]
+
+    new_errors = self.__error__
+    self.__error__ = errors + new_errors if errors or new_errors else ()
+    if new_errors and _class_plan(self.__class__).strict:
+      self.__handle_errors(self.__class__, {}, (), ())
+
+    return value
+
+  def __copy__(self) -> "SerializableObject":
+    """
+    Shallow copy for copy.copy(): field values are shared with the original, while the per-object state of not
+    yet decoded lazy fields and the changed fields set are duplicated, so the first access or assignment on one
+    object doesn't affect the other
+    """
+    clazz = self.__class__
+    plan: _ClassPlan = _class_plan(clazz)
+    clone = clazz.__new__(clazz)
+    for k in plan.slot_defaults.keys():
+      if (v := getattr(self, k, _MISSING)) is not _MISSING:
+        object.__setattr__(clone, k, v)
+
+    if hasattr(self, "__dict__"):
+      clone.__dict__.update(self.__dict__)
+      if (raw := clone.__dict__.get("__raw__")) is not None:
+        clone.__dict__["__raw__"] = dict(raw)
+
+    if plan.track_changes and (changes := getattr(self, "__changes__", None)) is not None:
+      object.__setattr__(clone, "__changes__", set(changes))
+
+    return clone
+
+  def with_changes(self, **fields) -> "SerializableObject":
+    """
+    Shallow clone of the object with the given fields replaced.
+
+    Not changed values, including nested objects, lists and dicts, are shared with the original object instead
+    of being copied, so the cost depends on the number of changed fields only. Shared values should not be
+    modified in place, nested objects are changed by replacing them:
+
+      obj.with_changes(item=obj.item.with_changes(count=2))
+
+    Values are assigned as is, without conversion. Use the copy constructor to get independent deep copy.
+
+    :raises AttributeError: if the class doesn't define some of the fields
+    """
+    clazz = self.__class__
+    plan: _ClassPlan = _class_plan(clazz)
+    if unknown := fields.keys() - plan.field_names:
+      raise AttributeError(f"{clazz.__name__} class doesn't contain properties: {', '.join(sorted(unknown))}")
+
+    clone = clazz.__new__(clazz)
+    for k in plan.slot_defaults.keys():
+      setattr(clone, k, getattr(self, k))
+
+    if hasattr(self, "__dict__"):
+      clone.__dict__.update(self.__dict__)
+      if (raw := clone.__dict__.get("__raw__")) is not None:  # lazy fields are resolved per object
+        raw = {k: v for k, v in raw.items() if k not in fields}
+        if raw:
+          clone.__dict__["__raw__"] = raw
+        else:
+          del clone.__dict__["__raw__"]
+
+    if plan.track_changes:
+      clone.__changes__ = set(self.__changes__)
+
+    for k, v in fields.items():
+      setattr(clone, k, v)
+
+    return clone
+
+  def changed_fields(self) -> set[str]:
+    """
+    Names of the fields assigned since the object creation or the last clear_changes() call.
+    Always empty for the classes without __track_changes__ = True. In-place changes of nested values
+    (list.append, nested object fields) are not tracked.
+    """
+    return set(getattr(self, "__changes__", None) or ())
+
+  def clear_changes(self):
+    """
+    Forget tracked changes, for example after they were persisted
+    """
+    if _class_plan(self.__class__).track_changes:
+      self.__changes__ = set()
+
+  def serialize_changes(self, minimal: bool = False) -> dict:
+    """
+    Serialize only the changed fields, in the same format as serialize() does. Use apply_patch() to apply
+    the result to another object.
+    """
+    if not (changes := getattr(self, "__changes__", None)):
+      return {}
+
+    plan: _ClassPlan = _class_plan(self.__class__)
+    result = {}
+    for key, name, default, encoder in plan.serialize_fields + plan.serialize_mapped:
+      if name in changes and (v := getattr(self, name, default)) is not _MISSING and not (minimal and not v):
+        result[key] = encoder(v, minimal)
+
+    for name in changes - plan.serialize_known:  # attributes, which are not part of the class definition
+      if plan.is_serializable(name, v := getattr(self, name)) and not (minimal and not v):
+        result[name] = _serialize_transform(v, minimal)
+
+    for name, default in plan.serialize_grouped:
+      if name in changes and isinstance(v := getattr(self, name, default), dict):
+        result.update({k: _serialize_transform(group_v, minimal) for k, group_v in v.items()
+                       if not (minimal and not group_v)})
+
+    return result
+
+  def apply_patch(self, patch: "dict|str|bytes", _type: SODumpType = None) -> "SerializableObject":
+    """
+    Update the object with the fields from the patch, produced by serialize_changes(). Values are converted the
+    same way as by the constructor, patched fields are marked as changed.
+
+    :return: self
+    :raises AttributeError: if the class doesn't define some of the patched properties
+    :raises ValueError: for strict objects if any of the values failed to convert
+    """
+    if isinstance(patch, (str, bytes)):
+      patch, _ = _parse_text(patch, _type)
+
+    plan: _ClassPlan = _class_plan(self.__class__)
+    aliases = {alias: name for name, alias in plan.mapping.items()}
+    names = set()
+    for k in patch.keys():
+      if group := next((g for g, pattern in plan.grouping.items() if k.endswith(pattern) and k not in aliases
+                        and k not in plan.field_names), None):
+        names.add(group)
+      else:
+        names.add(aliases.get(k, k))
+
+    errors = self.__error__
+    self.__deserialize(patch, plan.projection(self.__class__, names))
+    if errors:
+      self.__error__ = list(errors) + list(self.__error__)
+    return self
+
+  def materialize(self, recursive: bool = True) -> "SerializableObject":
+    """
+    Decode all not yet accessed lazy fields.
+
+    :param recursive: materialize nested objects as well
+    :return: self
+    :raises ValueError: for strict objects if any of the fields failed to decode
+    """
+    if hasattr(self, "__dict__") and (raw := self.__dict__.get("__raw__")) is not None:
+      for name in list(raw.keys()):
+        if name in self.__dict__:  # overridden by the direct assignment
+          raw.pop(name)
+        else:
+          self.__resolve_lazy(name)
+      self.__dict__.pop("__raw__", None)
+
+    if recursive:
+      for field in _class_plan(self.__class__).fields:
+        v = getattr(self, field.name, None)
+        for item in v.values() if isinstance(v, dict) else v if isinstance(v, list) else (v,):
+          if isinstance(item, SerializableObject):
+            item.materialize()
+
+    return self
 
   def serialize(self, minimal: bool = False) -> dict:
-    all_properties = dict(self.__class__.__dict__)      # first of all we need to move defaults from class
-    all_properties.update(dict(self.__dict__))          # now copy over existing properties from the object
-    _filter_properties = list(self.__mapping__.keys()) + list(self.__grouping__.keys())
-
-    properties: dict = {k: v for k, v in all_properties.items()
-                        if not k.startswith("__")                                     # filter hidden properties
-                        and not (k.startswith("_") and "__" in k)                     # filter _Obj__property entities
-                        and k not in self.__ignored_fields__                          # filter ignored property
-                        and not isinstance(v, (FunctionType, MethodType,
-                                               BuiltinMethodType,
-                                               property, classmethod))                # ignore functions
-                        and k not in _filter_properties                               # exclude "special cases"
-                        }
-
-    if self.__mapping__:
-      properties.update({a: all_properties[p] for p, a in self.__mapping__.items() if p in all_properties})
-
-    if self.__grouping__:
-      for k in self.__grouping__.keys():
-        if k in all_properties and isinstance(all_properties[k], dict):
-          properties.update(all_properties[k])
-
-    return self.__serialize_transform(properties, minimal=minimal)
-
-  def dump(self, indent: int = None, _type: SODumpType = None, minimal: bool = False):
+    if (plan := _class_plan(self.__class__)).compile:
+      return _compiled_plan(self.__class__, plan).serialize(self, minimal)
+    return {key: encoder(v, minimal) for key, v, encoder in _iter_properties(self, minimal)}
+
+  def dump_to(self, fp: IO, indent: int = None, _type: SODumpType = None, minimal: bool = False,
+              fast: bool = False):
+    """
+    Write serialized object directly to the text or binary stream, field by field, without building complete
+    intermediate dict of the object first. The output is the same as produced by dump()
+    """
+    from .writer import JSONStreamEncoder, YAMLStreamEncoder, BinaryStreamEncoder
+
+    if _type is None:
+      _type = self.__file_type__
+
+    if _type == SODumpType.YAML:
+      YAMLStreamEncoder(fp, indent=indent, minimal=minimal).encode(self)
+    elif _type == SODumpType.BINARY:
+      BinaryStreamEncoder(fp, minimal=minimal).encode(self)
+    else:
+      JSONStreamEncoder(fp, indent=indent, minimal=minimal, fast=fast).encode(self)
+
+  def dump(self, indent: int = None, _type: SODumpType = None, minimal: bool = False, fast: bool = False):
+    """
+    Render the object as JSON, YAML or MessagePack document, in the format it was parsed from by default.
+
+    JSON is rendered the same way as json.dumps does. With fast=True it is rendered by the active backend (see
+    apputils.jsonbackend): with orjson or ujson it has compact separators and not escaped non-ascii characters,
+    so it parses to the same value but is not byte to byte equal to json.dumps output.
+    """
     if _type is None:
       _type = self.__file_type__
 
@@ -344,8 +1336,11 @@ A number of errors happen:
       if not YAML_ENABLED:
         raise RuntimeError("PyYaml is not installed and it is required for YAML rendering")
       return yaml.safe_dump(self.serialize(minimal), indent=indent)
+    elif _type == SODumpType.BINARY:
+      return packb(self.serialize(minimal))
     else:
-      return json.dumps(self.serialize(minimal), indent=indent)
+      return json_dumps(self.serialize(minimal), indent=indent, fast=fast)
 
-  def to_json(self, indent: int = None, minimal: bool = False) -> str:
-    return self.dump(indent, _type=self.__file_type__, minimal=minimal)
+  def to_json(self, indent: int = None, minimal: bool = False, fast: bool = False) -> str:
+    _type = SODumpType.JSON if self.__file_type__ == SODumpType.BINARY else self.__file_type__
+    return self.dump(indent, _type=_type, minimal=minimal, fast=fast)
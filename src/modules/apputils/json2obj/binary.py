@@ -0,0 +1,223 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+"""
+Compact binary encoding of serialized objects in MessagePack format (https://msgpack.org).
+
+msgpack package is used if installed, otherwise built-in implementation of the format subset required
+for serialized objects: nil, bool, int (up to 64 bit), float64, str, bin, array and map.
+"""
+import struct
+from typing import Any
+
+try:
+  import msgpack
+  MSGPACK_ENABLED: bool = True
+except ImportError:
+  MSGPACK_ENABLED: bool = False
+
+
+_pack_float = struct.Struct(">d").pack
+_unpack_float = struct.Struct(">d").unpack_from
+
+
+def _sized_header(size: int, fix_code: int, fix_limit: int, codes: tuple[int, int, int]) -> bytes:
+  """
+  Header of str, bin, array or map value: fix_code | size for small sizes, or 8/16/32 bit size after the type code.
+  None in codes means there is no such size for the type.
+  """
+  code8, code16, code32 = codes
+  if size < fix_limit:
+    return bytes((fix_code | size,))
+  if code8 is not None and size < 0x100:
+    return bytes((code8, size))
+  if size < 0x10000:
+    return bytes((code16,)) + size.to_bytes(2, "big")
+  if size < 0x100000000:
+    return bytes((code32,)) + size.to_bytes(4, "big")
+  raise ValueError(f"Value is too big to be packed ({size} items)")
+
+
+def map_header(size: int) -> bytes:
+  """
+  Header of the map with size key-value pairs, which should follow it
+  """
+  return _sized_header(size, 0x80, 16, (None, 0xde, 0xdf))
+
+
+def _pack_int(n: int) -> bytes:
+  if 0 <= n < 0x80:
+    return bytes((n,))
+  if -0x20 <= n < 0:
+    return bytes((0xe0 | (n & 0x1f),))
+  if n >= 0:
+    for code, size in ((0xcc, 1), (0xcd, 2), (0xce, 4), (0xcf, 8)):
+      if n < 1 << (size * 8):
+        return bytes((code,)) + n.to_bytes(size, "big")
+  else:
+    for code, size in ((0xd0, 1), (0xd1, 2), (0xd2, 4), (0xd3, 8)):
+      if n >= -(1 << (size * 8 - 1)):
+        return bytes((code,)) + n.to_bytes(size, "big", signed=True)
+  raise OverflowError(f"Integer {n} is too big to be packed")
+
+
+def _pack(obj, out: bytearray):
+  if obj is None:
+    out.append(0xc0)
+  elif obj is True:
+    out.append(0xc3)
+  elif obj is False:
+    out.append(0xc2)
+  elif isinstance(obj, int):
+    out += _pack_int(obj)
+  elif isinstance(obj, float):
+    out.append(0xcb)
+    out += _pack_float(obj)
+  elif isinstance(obj, str):
+    data = obj.encode("utf-8")
+    out += _sized_header(len(data), 0xa0, 32, (0xd9, 0xda, 0xdb))
+    out += data
+  elif isinstance(obj, (bytes, bytearray, memoryview)):
+    out += _sized_header(len(obj), 0, 0, (0xc4, 0xc5, 0xc6))
+    out += obj
+  elif isinstance(obj, (list, tuple)):
+    out += _sized_header(len(obj), 0x90, 16, (None, 0xdc, 0xdd))
+    for item in obj:
+      _pack(item, out)
+  elif isinstance(obj, dict):
+    out += map_header(len(obj))
+    for k, v in obj.items():
+      _pack(k, out)
+      _pack(v, out)
+  else:
+    raise TypeError(f"Object of type {type(obj).__name__} is not MessagePack serializable")
+
+
+# type code -> (size of the length field, kind)
+_SIZED_TYPES: dict[int, tuple[int, str]] = {
+  0xd9: (1, "str"), 0xda: (2, "str"), 0xdb: (4, "str"),
+  0xc4: (1, "bin"), 0xc5: (2, "bin"), 0xc6: (4, "bin"),
+  0xdc: (2, "array"), 0xdd: (4, "array"),
+  0xde: (2, "map"), 0xdf: (4, "map")
+}
+
+# type code -> (size, signed)
+_INT_TYPES: dict[int, tuple[int, bool]] = {
+  0xcc: (1, False), 0xcd: (2, False), 0xce: (4, False), 0xcf: (8, False),
+  0xd0: (1, True), 0xd1: (2, True), 0xd2: (4, True), 0xd3: (8, True)
+}
+
+
+def _check_size(data: memoryview, pos: int, size: int):
+  if pos + size > len(data):
+    raise ValueError(f"Truncated MessagePack data: {size} bytes expected at position {pos}, {len(data) - pos} left")
+
+
+def _unpack(data: memoryview, pos: int) -> tuple[Any, int]:
+  code = data[pos]
+  pos += 1
+
+  if code < 0x80:
+    return code, pos
+  if code >= 0xe0:
+    return code - 0x100, pos
+  if 0xa0 <= code <= 0xbf:
+    kind, size = "str", code & 0x1f
+  elif 0x90 <= code <= 0x9f:
+    kind, size = "array", code & 0x0f
+  elif 0x80 <= code <= 0x8f:
+    kind, size = "map", code & 0x0f
+  elif code == 0xc0:
+    return None, pos
+  elif code == 0xc2:
+    return False, pos
+  elif code == 0xc3:
+    return True, pos
+  elif code == 0xcb:
+    _check_size(data, pos, 8)
+    return _unpack_float(data, pos)[0], pos + 8
+  elif code == 0xca:
+    _check_size(data, pos, 4)
+    return struct.unpack_from(">f", data, pos)[0], pos + 4
+  elif code in _INT_TYPES:
+    size, signed = _INT_TYPES[code]
+    _check_size(data, pos, size)
+    return int.from_bytes(data[pos:pos + size], "big", signed=signed), pos + size
+  elif code in _SIZED_TYPES:
+    length, kind = _SIZED_TYPES[code]
+    _check_size(data, pos, length)
+    size = int.from_bytes(data[pos:pos + length], "big")
+    pos += length
+  else:
+    raise ValueError(f"Unsupported MessagePack type code 0x{code:02x} at position {pos - 1}")
+
+  if kind == "str":
+    _check_size(data, pos, size)
+    return str(data[pos:pos + size], "utf-8"), pos + size
+  if kind == "bin":
+    _check_size(data, pos, size)
+    return bytes(data[pos:pos + size]), pos + size
+  if kind == "array":
+    items = []
+    for _ in range(size):
+      item, pos = _unpack(data, pos)
+      items.append(item)
+    return items, pos
+
+  result = {}
+  for _ in range(size):
+    k, pos = _unpack(data, pos)
+    result[k], pos = _unpack(data, pos)
+  return result, pos
+
+
+def packb(obj) -> bytes:
+  if MSGPACK_ENABLED:
+    return msgpack.packb(obj, use_bin_type=True)
+
+  out = bytearray()
+  _pack(obj, out)
+  return bytes(out)
+
+
+def unpackb(data: bytes) -> Any:
+  """
+  :raises ValueError: broken or truncated data
+  """
+  if MSGPACK_ENABLED:
+    try:
+      return msgpack.unpackb(data, raw=False, strict_map_key=False)
+    except (msgpack.ExtraData, msgpack.FormatError, msgpack.StackError) as e:
+      raise ValueError(str(e)) from e
+
+  try:
+    obj, pos = _unpack(memoryview(data), 0)
+  except IndexError:
+    raise ValueError("Truncated MessagePack data") from None
+
+  if pos != len(data):
+    raise ValueError(f"Extra data after MessagePack object at position {pos}")
+  return obj
+
+
+def is_packed_map(data: bytes) -> bool:
+  """
+  Check if the data looks like packed map: the first byte of it can't start utf-8 text (0x80-0x8f) or
+  it is 16/32-bit map type code
+  """
+  return bool(data) and (0x80 <= data[0] <= 0x8f or data[0] in (0xde, 0xdf))
@@ -0,0 +1,231 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+"""
+Generated code for the classes with __compiled__ = True.
+
+Field loops of de-serialization and serialization are replaced by straight-line functions, compiled with exec
+per class, in the similar way as dataclasses are generating __init__. Conversions of str, int, float, bool,
+enum, nested object and list fields are inlined for the values of the expected type, anything else goes
+through the generic conversion, so the result is always the same as without code generation.
+
+Inlining relies on the registered transformations, so the code is re-generated when they are changing.
+"""
+import sys
+from enum import Enum
+
+from . import SerializableObject, _ClassPlan, _MISSING, _intern_value, _serialize_transform
+from .transformations import transformations, EnumTransformation
+
+_PLAIN_TYPES = (str, int, float, bool)
+
+
+class CompiledPlan(object):
+  __slots__ = ("version", "deserialize_fields", "serialize")
+
+  def __init__(self, version: int, deserialize_fields, serialize):
+    self.version: int = version
+    self.deserialize_fields = deserialize_fields
+    self.serialize = serialize
+
+
+def _is_plain(t) -> bool:
+  return t in _PLAIN_TYPES and transformations.find_deserializer(t, t()) is None \
+    and transformations.find_serializer(t()) is None
+
+
+def _enum_value_types(t) -> "tuple[type, ...]|None":
+  """
+  Types of the enum values, which could be looked up directly in the enum values map
+  """
+  if not (isinstance(t, type) and issubclass(t, Enum) and "_value2member_map_" in t.__dict__):
+    return None
+  types = tuple({type(v) for v in t.__dict__["_value2member_map_"].keys()} - {type(None)})
+  if not all(isinstance(transformations.find_deserializer(t, m.value), EnumTransformation) for m in t):
+    return None
+  return types
+
+
+def _is_plain_enum(t) -> bool:
+  """
+  Enum, serialized to the plain value
+  """
+  return _enum_value_types(t) is not None and len(t) > 0 \
+    and all(isinstance(transformations.find_serializer(m), EnumTransformation) and _is_plain(type(m.value)) for m in t)
+
+
+def _is_object(t) -> bool:
+  return isinstance(t, type) and issubclass(t, SerializableObject) and transformations.find_deserializer(t, {}) is None
+
+
+def _deserialize_field(n: int, field, ns: dict) -> list[str]:
+  """
+  Lines converting value "v" of the field to "value", n is unique index of the field
+  """
+  c = field.converter
+  t = c.type
+  ns[f"c{n}"] = c
+  generic = [f"value = transform(v, c{n})"]
+
+  if c.is_union or c.is_dict:
+    return generic
+
+  if _is_plain(t):
+    ns[f"t{n}"] = t
+    return [f"if type(v) is t{n}:", "  value = v", "else:", "  " + generic[0]]
+
+  if value_types := _enum_value_types(t):
+    ns[f"vt{n}"], ns[f"map{n}"] = value_types, t.__dict__["_value2member_map_"]
+    return [f"value = map{n}.get(v) if type(v) in vt{n} else None", "if value is None:", "  " + generic[0]]
+
+  if c.expects_object and _is_object(t):
+    ns[f"t{n}"] = t
+    return [
+      "if type(v) is dict:",
+      "  try:",
+      f"    value = t{n}(v)",
+      "  except ValueError as e:",
+      "    errors.append(str(e))",
+      "    value = None",
+      "else:",
+      "  " + generic[0]
+    ]
+
+  if c.is_list and transformations.find_deserializer(list, []) is None \
+     and (c.property_type is None or isinstance(c.property_type, type)):
+    ns[f"t{n}"] = c.property_type
+    convert = "v" if c.property_type is None else f"[t{n}(i) for i in v]"
+    return [
+      "if type(v) is list:",
+      "  try:",
+      f"    value = {convert}",
+      "  except (ValueError, TypeError) as e:",
+      "    errors.append(str(e))",
+      "    value = None",
+      "else:",
+      "  " + generic[0]
+    ]
+
+  return generic
+
+
+def _compile_deserialize(clazz: type, plan: _ClassPlan):
+  ns = {"_MISSING": _MISSING, "_intern_value": _intern_value, "intern": sys.intern}
+  lines = [
+    "def deserialize_fields(self, d):",
+    "  transform = self._SerializableObject__deserialize_transform",
+    "  errors = self.__error__",
+  ]
+  for n, field in enumerate(plan.fields):
+    ns[f"default{n}"] = field.default
+    lines.append(f"  v = d.get({field.name!r}, _MISSING)" if field.alias is None else
+                 f"  v = d.get({field.alias!r}, _MISSING)\n  if v is _MISSING:\n    v = d.get({field.name!r}, _MISSING)")
+    lines += [
+      "  if v is _MISSING:",
+      f"    self.{field.name} = default{n}",
+      "  else:",
+    ]
+    lines += ["    " + line for line in _deserialize_field(n, field, ns)]
+    if field.intern:
+      lines.append("    value = intern(value) if type(value) is str else _intern_value(value)")
+    lines.append(f"    self.{field.name} = value")
+
+  return _exec(clazz, "deserialize_fields", lines, ns)
+
+
+def _serialize_value(n: int, key: str, converter, ns: dict) -> list[str]:
+  """
+  Lines adding serialized value "v" to the result "r"
+  """
+  t = converter.type if converter is not None and not converter.is_union else None
+  generic = f"r[{key!r}] = encoder{n}(v, minimal)"
+  if t is not None and _is_plain(t):
+    ns[f"t{n}"] = t
+    return [f"if type(v) is t{n}:", f"  r[{key!r}] = v", "else:", "  " + generic]
+
+  if t is not None and _is_plain_enum(t):
+    ns[f"t{n}"] = t
+    return [f"if type(v) is t{n}:", f"  r[{key!r}] = v._value_", "else:", "  " + generic]
+
+  return [generic]
+
+
+def _compile_serialize(clazz: type, plan: _ClassPlan):
+  ns = {"_MISSING": _MISSING, "_serialize_transform": _serialize_transform, "plan": plan}
+  converters = {f.name: f.converter for f in plan.fields}
+  has_dict = not all("__slots__" in c.__dict__ for c in clazz.__mro__ if c is not object)
+
+  lines = ["def serialize(self, minimal=False):"]
+  if has_dict:
+    lines.append("  state = self.__dict__")
+  lines.append("  r = {}")
+
+  def add(n: int, key: str, name: str, default, encoder):
+    ns[f"default{n}"], ns[f"encoder{n}"] = default, encoder
+    if name in plan.slots:
+      lines.append(f"  v = self.{name}")
+    elif has_dict:
+      lines.append(f"  v = state.get({name!r}, default{n})")
+    else:
+      lines.append(f"  v = getattr(self, {name!r}, default{n})")
+    condition = "not (minimal and not v)" if default is not _MISSING else "v is not _MISSING and not (minimal and not v)"
+    lines.append(f"  if {condition}:")
+    lines.extend("    " + line for line in _serialize_value(n, key, converters.get(name), ns))
+
+  n = 0
+  for n, (key, name, default, encoder) in enumerate(plan.serialize_fields):
+    add(n, key, name, default, encoder)
+
+  if has_dict:  # attributes, which are not part of the class definition
+    lines += [
+      "  if state.keys() - plan.serialize_known:",
+      "    for k, v in state.items():",
+      "      if k not in plan.serialize_known and plan.is_serializable(k, v) and not (minimal and not v):",
+      "        r[k] = _serialize_transform(v, minimal)",
+    ]
+
+  for n, (key, name, default, encoder) in enumerate(plan.serialize_mapped, start=n + 1):
+    add(n, key, name, default, encoder)
+
+  if plan.serialize_grouped:
+    lines += [
+      "  for name, default in plan.serialize_grouped:",
+      "    if isinstance(v := getattr(self, name, default), dict):",
+      "      for k, group_v in v.items():",
+      "        if not (minimal and not group_v):",
+      "          r[k] = _serialize_transform(group_v, minimal)",
+    ]
+
+  lines.append("  return r")
+  return _exec(clazz, "serialize", lines, ns)
+
+
+def _exec(clazz: type, name: str, lines: list[str], ns: dict):
+  exec("\n".join(lines), ns)
+  f = ns[name]
+  f.__qualname__ = f"{clazz.__qualname__}.{name}"
+  f.__source__ = "\n".join(lines)
+  return f
+
+
+def compile_plan(clazz: type, plan: _ClassPlan) -> CompiledPlan:
+  """
+  Generate de-serialization and serialization functions for the class plan
+  """
+  version = transformations.version
+  return CompiledPlan(version, _compile_deserialize(clazz, plan), _compile_serialize(clazz, plan))
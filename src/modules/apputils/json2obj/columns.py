@@ -0,0 +1,134 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+"""
+Columnar export/import of SerializableObject lists, one typed buffer per field:
+
+ - int, float, bool fields           -> array.array ('q', 'd', 'b') or NumPy array
+ - datetime fields                   -> float timestamps (None as NaN), same as DateTimeTransformation does
+ - Enum fields                       -> enum values, typed buffer if values are numbers
+ - everything else, or columns with
+   None/not fitting values           -> list
+
+NumPy arrays are used if NumPy is installed, could be controlled by use_numpy argument.
+"""
+import math
+from array import array
+from datetime import datetime
+from enum import Enum
+from typing import Any, Sequence
+
+from . import SerializableObject, _class_plan, _ClassPlan, _FieldPlan
+
+try:
+  import numpy
+  NUMPY_ENABLED: bool = True
+except ImportError:
+  NUMPY_ENABLED: bool = False
+
+
+_NUMPY_TYPES: dict[str, str] = {
+  "q": "int64",
+  "d": "float64",
+  "b": "bool"
+}
+
+
+def _typecode(values: list) -> str | None:
+  """
+  array.array type code able to keep all the values, or None
+  """
+  if all(type(v) is bool for v in values):
+    return "b"
+  if all(type(v) is int for v in values):
+    return "q"
+  if all(type(v) in (float, int) for v in values):
+    return "d"
+  return None
+
+
+def _column(field: _FieldPlan, values: list, use_numpy: bool):
+  field_type = field.converter.type
+
+  if field_type is datetime:
+    values = [math.nan if v is None else v.timestamp() for v in values]
+  elif isinstance(field_type, type) and issubclass(field_type, Enum):
+    values = [v.value if isinstance(v, Enum) else v for v in values]
+  elif field_type not in (int, float, bool):
+    return values
+
+  if not values or (code := _typecode(values)) is None:
+    return values
+
+  try:
+    return numpy.array(values, dtype=_NUMPY_TYPES[code]) if use_numpy else array(code, values)
+  except OverflowError:  # integers above 64 bit
+    return values
+
+
+def to_columns(objects: Sequence[SerializableObject], clazz: type = None, use_numpy: bool = None) -> dict[str, Any]:
+  """
+  Convert list of objects to the columns, keyed by the field names of the class
+
+  :param objects: objects of the same class
+  :param clazz: objects class, required if objects list could be empty
+  :param use_numpy: produce NumPy arrays instead of array.array, by default if NumPy is installed
+  """
+  if clazz is None:
+    if not objects:
+      raise ValueError("clazz argument is required for the empty list of objects")
+    clazz = type(objects[0])
+
+  if use_numpy is None:
+    use_numpy = NUMPY_ENABLED
+  elif use_numpy and not NUMPY_ENABLED:
+    raise RuntimeError("NumPy is not installed and it is required for NumPy columns")
+
+  plan: _ClassPlan = _class_plan(clazz)
+  return {
+    field.name: _column(field, [getattr(obj, field.name, None) for obj in objects], use_numpy)
+    for field in plan.fields
+  }
+
+
+def from_columns(clazz: type, columns: dict[str, Any]) -> list[SerializableObject]:
+  """
+  Re-create the objects from the columns produced by to_columns()
+
+  :raises ValueError: columns have different length or values are not matching the schema
+  """
+  plan: _ClassPlan = _class_plan(clazz)
+  fields: dict[str, _FieldPlan] = {f.name: f for f in plan.fields}
+  rows: dict[str, list] = {}
+
+  for name, column in columns.items():
+    values = column.tolist() if hasattr(column, "tolist") else list(column)
+    field_type = fields[name].converter.type if name in fields else None
+
+    if field_type is datetime:
+      values = [None if isinstance(v, float) and math.isnan(v) else v for v in values]
+    elif field_type is bool:
+      values = [v if v is None else bool(v) for v in values]
+
+    rows[name] = values
+
+  if len({len(v) for v in rows.values()}) > 1:
+    raise ValueError("All columns should have the same length")
+
+  count = len(next(iter(rows.values()))) if rows else 0
+  return [clazz({name: values[i] for name, values in rows.items()}) for i in range(count)]
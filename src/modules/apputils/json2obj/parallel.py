@@ -0,0 +1,169 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+"""
+Parallel de-serialization of large batches of independent records.
+
+Input is split into chunks, which are decoded by the process (or thread) pool workers and merged back in
+the original order. Objects are sent back from the worker processes by pickle, so the class should be
+importable by its module name.
+"""
+import io
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Type, TypeVar
+
+from . import SerializableObject
+
+T = TypeVar("T", bound=SerializableObject)
+
+# chunks per worker, more chunks give better balancing for records with different sizes
+_CHUNKS_PER_WORKER: int = 4
+# maximum size of the file chunk, read by the worker at once
+_MAX_FILE_CHUNK: int = 64 * 1024 * 1024
+_READ_BLOCK: int = 1024 * 1024
+
+
+def _decode_list_chunk(clazz: Type[T], collect_errors: bool, items: list) -> tuple[list[T], list, int]:
+  """
+  :return: objects, errors and number of records in the chunk
+  """
+  errors = [] if collect_errors else None
+  return clazz.from_list(items, errors=errors), errors, len(items)
+
+
+def _decode_ndjson_chunk(clazz: Type[T], collect_errors: bool, data: bytes) -> tuple[list[T], list, int]:
+  errors = [] if collect_errors else None
+  return clazz.from_ndjson(io.BytesIO(data), errors=errors), errors, data.count(b"\n")
+
+
+def _decode_file_chunk(clazz: Type[T], collect_errors: bool, path: str, start: int,
+                       end: int) -> tuple[list[T], list, int]:
+  """
+  Decode the lines between start and end offsets of the file, the chunk is read by the worker itself
+  """
+  with open(path, "rb") as f:
+    f.seek(start)
+    data = f.read(end - start)
+  return _decode_ndjson_chunk(clazz, collect_errors, data)
+
+
+def _split_list(items: list, chunks: int) -> list[tuple[list]]:
+  size = -(-len(items) // chunks)
+  return [(items[i:i + size],) for i in range(0, len(items), size)]
+
+
+def _split_ndjson(data: bytes, chunks: int) -> list[tuple[bytes]]:
+  """
+  Split the data on line boundaries to approximately equal chunks
+  """
+  size = -(-len(data) // chunks)
+  result = []
+  start = 0
+  while start < len(data):
+    end = data.find(b"\n", start + size)
+    end = len(data) if end == -1 else end + 1
+    result.append((data[start:end],))
+    start = end
+  return result
+
+
+def _split_file(path: str, chunks: int) -> list[tuple[str, int, int]]:
+  """
+  Split the file on line boundaries to approximately equal (path, start, end) ranges, reading only the lines
+  around the boundaries
+  """
+  size = os.path.getsize(path)
+  chunks = max(chunks, -(-size // _MAX_FILE_CHUNK))
+  bounds = [0]
+  with open(path, "rb") as f:
+    for i in range(1, chunks):
+      if (pos := size * i // chunks) <= bounds[-1]:  # inside of the long line, which ends the previous chunk
+        continue
+      f.seek(pos - 1)
+      f.readline()
+      if (end := f.tell()) >= size:
+        break
+      bounds.append(end)
+  bounds.append(size)
+  return [(path, start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+
+def _count_lines(path: str, limit: int) -> int:
+  """
+  Number of lines in the file, counted up to the limit
+  """
+  lines = 0
+  with open(path, "rb") as f:
+    while lines < limit and (block := f.read(_READ_BLOCK)):
+      lines += block.count(b"\n")
+  return lines
+
+
+def decode_batch(clazz: Type[T], data: "list[dict|str]|bytes|str|os.PathLike",
+                 errors: "list[tuple[int, Exception]]|None" = None, *, workers: int = None, threshold: int = 1000,
+                 use_threads: bool = False, executor: Executor = None) -> list[T]:
+  """
+  De-serialize the batch of records in parallel, keeping the original order of records.
+
+  :param clazz: class of the objects
+  :param data: list of dict or JSON/YAML string records, newline-delimited JSON bytes, or path to the
+               newline-delimited JSON file. The file is not loaded at once: workers are reading their own parts
+               of it, up to 64 MiB each
+  :param errors: if passed, broken records are skipped and (record number, exception) pairs are collected
+                 to the list in the records order, instead of raising on the first broken record. Record
+                 number is the index in the list, or line number starting from 1 for newline-delimited JSON
+  :param workers: number of workers, os.cpu_count() by default
+  :param threshold: inputs with fewer records (lines) are decoded serially in the current process
+  :param use_threads: use thread pool instead of process pool
+  :param executor: use existing executor instead of creating a new one, workers and use_threads are ignored
+  """
+  if workers is None:
+    workers = getattr(executor, "_max_workers", None) or os.cpu_count() or 1
+
+  if isinstance(data, (str, os.PathLike)):
+    path = os.path.abspath(data)
+    if workers < 2 or _count_lines(path, threshold) + 1 < threshold:
+      with open(path, "rb") as f:
+        return clazz.from_ndjson(f, errors=errors)
+    worker, chunks = _decode_file_chunk, _split_file(path, workers * _CHUNKS_PER_WORKER)
+  elif isinstance(data, (bytes, bytearray, memoryview)):
+    data = bytes(data)
+    if workers < 2 or data.count(b"\n") + 1 < threshold:
+      return clazz.from_ndjson(io.BytesIO(data), errors=errors)
+    worker, chunks = _decode_ndjson_chunk, _split_ndjson(data, workers * _CHUNKS_PER_WORKER)
+  else:
+    if workers < 2 or len(data) < threshold:
+      return clazz.from_list(data, errors=errors)
+    worker, chunks = _decode_list_chunk, _split_list(data, workers * _CHUNKS_PER_WORKER)
+
+  pool = executor or (ThreadPoolExecutor if use_threads else ProcessPoolExecutor)(max_workers=workers)
+  try:
+    futures = [pool.submit(worker, clazz, errors is not None, *chunk) for chunk in chunks]
+    result: list[T] = []
+    offset = 0  # records (lines) before the chunk
+    for future in futures:
+      objects, chunk_errors, count = future.result()
+      result.extend(objects)
+      if chunk_errors:
+        errors.extend((offset + n, e) for n, e in chunk_errors)
+      offset += count
+    return result
+  finally:
+    if executor is None:
+      pool.shutdown(cancel_futures=True)
@@ -62,39 +62,82 @@ class TransformationItemAbstract(TransformationItem, metaclass=ABCMeta):
 
 
 class TransformationsRegistry(object):
+  """
+  Registry of the available transformations.
+
+  Lookups are memoized by the (expected type, value type) pair for de-serialization and by value type for
+  serialization, so transformation conditions are expected to depend only on the types and not on the values.
+  """
   def __init__(self):
     self._transformations: list[TransformationItem] = []
+    self._deserializers: dict[tuple[type, type], TransformationItem | None] = {}
+    self._serializers: dict[type, TransformationItem | None] = {}
+    self.version: int = 0  # changes on each registration, to let dependent caches to be reset
 
   def register_transformation(self, transformation: TransformationItem) -> None:
     self._transformations.append(transformation)
+    self._deserializers.clear()
+    self._serializers.clear()
+    self.version += 1
 
   @property
   def items(self) -> Generator[TransformationItem, Any, None]:
     for transformation in self._transformations:
       yield transformation
 
-  def serialize(self, obj: object) -> object | None:
+  def _scan_serializer(self, obj: object) -> TransformationItem | None:
     for transformation in self._transformations:
       if transformation.serialize_condition(obj):
-        return transformation.serialize(obj)
+        return transformation
     return None
 
-  def deserialize(self, expected_type: type, obj: object) -> object | None:
+  def _scan_deserializer(self, expected_type: type, obj: object) -> TransformationItem | None:
     for transformation in self._transformations:
       if transformation.deserialize_condition(expected_type, obj):
-        return transformation.deserialize(expected_type, obj)
+        return transformation
+    return None
+
+  def find_serializer(self, obj: object) -> TransformationItem | None:
+    """
+    Returns transformation able to serialize the passed object or None
+    """
+    try:
+      return self._serializers[obj.__class__]
+    except KeyError:
+      t = self._serializers[obj.__class__] = self._scan_serializer(obj)
+      return t
+
+  def find_deserializer(self, expected_type: type, obj: object) -> TransformationItem | None:
+    """
+    Returns transformation able to convert the passed object to expected_type or None
+    """
+    key = (expected_type, obj.__class__)
+    try:
+      return self._deserializers[key]
+    except KeyError:
+      t = self._deserializers[key] = self._scan_deserializer(expected_type, obj)
+      return t
+    except TypeError:  # not hashable expected type
+      return self._scan_deserializer(expected_type, obj)
+
+  def serialize(self, obj: object) -> object | None:
+    if (transformation := self.find_serializer(obj)) is not None:
+      return transformation.serialize(obj)
+    return None
+
+  def deserialize(self, expected_type: type, obj: object) -> object | None:
+    if (transformation := self.find_deserializer(expected_type, obj)) is not None:
+      return transformation.deserialize(expected_type, obj)
     return None
 
   def need_chain_serialize(self, obj: object) -> bool:
-    for transformation in self._transformations:
-      if transformation.serialize_condition(obj):
-        return transformation.is_serialize_chain()
+    if (transformation := self.find_serializer(obj)) is not None:
+      return transformation.is_serialize_chain()
     return False
 
   def need_chain_deserialize(self, expected_type: type, obj: object) -> bool:
-    for transformation in self._transformations:
-      if transformation.deserialize_condition(expected_type, obj):
-        return transformation.is_deserialize_chain()
+    if (transformation := self.find_deserializer(expected_type, obj)) is not None:
+      return transformation.is_deserialize_chain()
     return False
 
 
@@ -167,8 +210,11 @@ class EnumTransformation(TransformationItemAbstract):
     return obj.value
 
   def deserialize(self, expected_type: type, obj: object) -> object|None:
-    if (_map := expected_type.__dict__['_value2member_map_']) and obj in _map:
-      return _map[obj]
+    try:
+      if (_map := expected_type.__dict__['_value2member_map_']) and obj in _map:
+        return _map[obj]
+    except TypeError:  # not hashable value, like list or dict
+      pass
     raise ValueError("Enum type '{}' doesn't contain option value '{}'".format(expected_type.__name__, obj))
 
   def is_serialize_chain(self) -> bool:
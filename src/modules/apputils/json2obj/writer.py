@@ -0,0 +1,191 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+import io
+import json
+from typing import IO, Iterable, Callable, Any
+
+from . import SerializableObject, YAML_ENABLED, _iter_properties
+from .transformations import transformations
+from .binary import packb, map_header
+from ..jsonbackend import JSONBackend, get_backend
+
+if YAML_ENABLED:
+  import yaml
+
+
+def _stream_writer(fp: IO) -> Callable[[str], Any]:
+  """
+  Returns write function accepting str for text and binary streams
+  """
+  if isinstance(fp, io.TextIOBase):
+    return fp.write
+
+  if isinstance(fp, (io.RawIOBase, io.BufferedIOBase)) or "b" in getattr(fp, "mode", ""):
+    return lambda s: fp.write(s.encode("utf-8"))
+
+  return fp.write
+
+
+class JSONStreamEncoder(object):
+  """
+  Incremental JSON encoder, writing SerializableObject field by field to the stream.
+
+  Produces the same text as obj.dump(indent=indent, fast=fast) with the same JSON backend, but without building
+  the intermediate dict of the whole object graph.
+  """
+  def __init__(self, fp: IO, indent: int = None, minimal: bool = False, fast: bool = False):
+    self._write: Callable[[str], Any] = _stream_writer(fp)
+    self._json: JSONBackend = get_backend(indent, fast)
+    self._indent_size: int | None = indent
+    self._indent: str | None = " " * indent if isinstance(indent, int) else indent
+    self._minimal: bool = minimal
+
+  def encode(self, item, level: int = 0):
+    write = self._write
+    if item is None:
+      write("null")
+    elif isinstance(item, SerializableObject):
+      self._encode_pairs(((k, v) for k, v, _ in _iter_properties(item, self._minimal)), level)
+    elif isinstance(item, (list, tuple, set)):
+      self._encode_items(item, level)
+    elif (t := transformations.find_serializer(item)) is not None and (r := t.serialize(item)) is not None:
+      if t.is_serialize_chain():
+        self.encode(r, level)
+      else:
+        self._encode_plain(r, level)
+    elif isinstance(item, dict):
+      self._encode_pairs(((k, v) for k, v in item.items() if not (self._minimal and not v)), level)
+    else:
+      write(self._json.dumps(item))
+
+  def _encode_plain(self, item, level: int):
+    text = self._json.dumps(item, indent=self._indent_size)
+    if self._indent is not None and level:
+      text = text.replace("\n", "\n" + self._indent * level)  # line breaks inside strings are always escaped
+    self._write(text)
+
+  def _separators(self, level: int) -> tuple[str, str, str]:
+    """
+    :return: (item separator, first item prefix, closing prefix)
+    """
+    if self._indent is None:
+      return self._json.item_separator, "", ""
+    return ",\n" + self._indent * (level + 1), "\n" + self._indent * (level + 1), "\n" + self._indent * level
+
+  def _encode_pairs(self, pairs: Iterable[tuple], level: int):
+    write = self._write
+    separator, first, closing = self._separators(level)
+    key_separator = self._json.key_separator if self._indent is None else ": "
+    empty = True
+    for k, v in pairs:
+      write("{" + first if empty else separator)
+      empty = False
+      write(self._encode_key(k))
+      write(key_separator)
+      self.encode(v, level + 1)
+    write("{}" if empty else closing + "}")
+
+  def _encode_items(self, items: Iterable, level: int):
+    write = self._write
+    separator, first, closing = self._separators(level)
+    empty = True
+    for v in items:
+      write("[" + first if empty else separator)
+      empty = False
+      self.encode(v, level + 1)
+    write("[]" if empty else closing + "]")
+
+  def _encode_key(self, k) -> str:
+    if isinstance(k, str):
+      return self._json.dumps(k)
+    if k is None or isinstance(k, (int, float, bool)):
+      return self._json.dumps(json.dumps(k))
+    raise TypeError(f"keys must be str, int, float, bool or None, not {type(k).__name__}")
+
+  def encode_array(self, objects: Iterable):
+    """
+    Write iterable of objects as JSON array, one object at a time
+    """
+    self._encode_items(objects, 0)
+
+  def encode_ndjson(self, objects: Iterable):
+    """
+    Write iterable of objects as newline-delimited JSON, one object per line
+    """
+    for obj in objects:
+      self.encode(obj)
+      self._write("\n")
+
+
+class YAMLStreamEncoder(object):
+  """
+  YAML writer, emitting SerializableObject to the stream one top-level field at a time.
+
+  Produces the same text as yaml.safe_dump(obj.serialize(), indent=indent).
+  """
+  def __init__(self, fp: IO, indent: int = None, minimal: bool = False):
+    if not YAML_ENABLED:
+      raise RuntimeError("PyYaml is not installed and it is required for YAML rendering")
+
+    self._write: Callable[[str], Any] = _stream_writer(fp)
+    self._indent: int | None = indent
+    self._minimal: bool = minimal
+
+  def encode(self, obj: SerializableObject):
+    # safe_dump sorts keys, so the fields are sorted first and only then encoded one by one
+    properties = sorted(_iter_properties(obj, self._minimal), key=lambda p: p[0])
+    if not properties:
+      self._write(yaml.safe_dump({}, indent=self._indent))
+      return
+
+    for k, v, encoder in properties:
+      self._write(yaml.safe_dump({k: encoder(v, self._minimal)}, indent=self._indent))
+
+
+class BinaryStreamEncoder(object):
+  """
+  MessagePack writer, emitting SerializableObject to the binary stream one top-level field at a time.
+
+  Produces the same bytes as obj.dump(_type=SODumpType.BINARY).
+  """
+  def __init__(self, fp: IO, minimal: bool = False):
+    self._write: Callable[[bytes], Any] = fp.write
+    self._minimal: bool = minimal
+
+  def encode(self, obj: SerializableObject):
+    properties = list(_iter_properties(obj, self._minimal))
+    self._write(map_header(len(properties)))
+    for k, v, encoder in properties:
+      self._write(packb(k))
+      self._write(packb(encoder(v, self._minimal)))
+
+
+def dump_array(objects: Iterable[SerializableObject], fp: IO, indent: int = None, minimal: bool = False,
+               fast: bool = False):
+  """
+  Write objects to the stream as JSON array, objects are consumed from the iterable one by one
+  """
+  JSONStreamEncoder(fp, indent=indent, minimal=minimal, fast=fast).encode_array(objects)
+
+
+def dump_ndjson(objects: Iterable[SerializableObject], fp: IO, minimal: bool = False, fast: bool = False):
+  """
+  Write objects to the stream as newline-delimited JSON, objects are consumed from the iterable one by one
+  """
+  JSONStreamEncoder(fp, minimal=minimal, fast=fast).encode_ndjson(objects)
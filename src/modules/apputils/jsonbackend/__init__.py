@@ -0,0 +1,233 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+"""
+JSON encoding/decoding layer with pluggable backends.
+
+orjson or ujson are used automatically when installed (in that order), otherwise stdlib json is used. Backend could
+be forced by APPUTILS_JSON_BACKEND environment variable or set_backend() call, with one of: orjson, ujson, json.
+
+Differences between backends are hidden behind the same API:
+ - loads() accepts str and bytes and raises json.JSONDecodeError (a ValueError) on broken input, input which the
+   fast backend rejects or could decode differently (NaN, Infinity, integers outside of 64 bit) is decoded by the stdlib
+ - dumps() always returns str and dumpb() always returns bytes
+ - indent not supported by the backend, or objects it can't encode (for example integers above 64 bit, NaN and
+   Infinity), are handled by the stdlib json
+ - types not supported by stdlib json (datetime, dataclasses) are not encoded by the fast backends either
+
+Fast backends are producing compact separators and do not escape non-ascii characters, so dumps() and dumpb()
+are using them only with fast=True. By default the output is the same as json.dumps one, whatever backend is
+active.
+"""
+import json
+import math
+import os
+from typing import Any
+
+_DIGITS_TO_ZERO = bytes.maketrans(b"123456789", b"000000000")
+_BIG_INT_DIGITS = b"0" * 19  # the smallest 64 bit overflow is -9223372036854775809
+_SCAN_BLOCK = 64 * 1024
+
+
+def _has_big_int(data: str | bytes) -> bool:
+  """
+  Data contains 19+ digits number, which could be an integer outside of 64 bit, decoded by the fast backends as
+  float. Digits are replaced with zeros to find such run with the plain substring search, which is many times
+  faster than the regular expression. Data is scanned by blocks overlapping by the run length, so only one block
+  is copied at a time.
+  """
+  overlap = len(_BIG_INT_DIGITS) - 1
+  for start in range(0, len(data), _SCAN_BLOCK):
+    block = data[max(start - overlap, 0):start + _SCAN_BLOCK]
+    if isinstance(block, str):
+      block = block.encode("utf-8", errors="replace")
+    if _BIG_INT_DIGITS in block.translate(_DIGITS_TO_ZERO):
+      return True
+  return False
+
+
+def _has_non_finite(obj) -> bool:
+  """
+  Object contains NaN or Infinity float, which are encoded by the stdlib json only
+  """
+  if isinstance(obj, float):
+    return not math.isfinite(obj)
+  if isinstance(obj, dict):
+    return any(_has_non_finite(v) for v in obj.values())
+  if isinstance(obj, (list, tuple)):
+    return any(_has_non_finite(v) for v in obj)
+  return False
+
+
+class JSONBackend(object):
+  """
+  stdlib json backend, base for the others
+  """
+  name: str = "json"
+  item_separator: str = ", "
+  key_separator: str = ": "
+
+  def supports_indent(self, indent: int | None) -> bool:
+    return True
+
+  def loads(self, data: str | bytes) -> Any:
+    return json.loads(data)
+
+  def dumps(self, obj, indent: int | None = None) -> str:
+    return json.dumps(obj, indent=indent)
+
+  def dumpb(self, obj, indent: int | None = None) -> bytes:
+    return json.dumps(obj, indent=indent).encode("utf-8")
+
+
+class OrjsonBackend(JSONBackend):
+  name: str = "orjson"
+  item_separator: str = ","
+  key_separator: str = ":"
+
+  def __init__(self):
+    import orjson
+    self._orjson = orjson
+    self._options: int = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+  def supports_indent(self, indent: int | None) -> bool:
+    return indent is None or indent == 2
+
+  def loads(self, data: str | bytes) -> Any:
+    if _has_big_int(data):
+      return json.loads(data)
+
+    try:
+      return self._orjson.loads(data)
+    except self._orjson.JSONDecodeError:
+      return json.loads(data)  # NaN and Infinity are accepted by the stdlib, broken input raises the same error
+
+  def dumpb(self, obj, indent: int | None = None) -> bytes:
+    if not self.supports_indent(indent):
+      return super().dumpb(obj, indent=indent)
+
+    try:
+      out = self._orjson.dumps(obj, option=self._options | self._orjson.OPT_INDENT_2 if indent else self._options)
+    except self._orjson.JSONEncodeError:
+      return super().dumpb(obj, indent=indent)
+
+    if b"null" in out and _has_non_finite(obj):  # orjson writes NaN and Infinity as null
+      return super().dumpb(obj, indent=indent)
+    return out
+
+  def dumps(self, obj, indent: int | None = None) -> str:
+    if not self.supports_indent(indent):
+      return super().dumps(obj, indent=indent)
+    return self.dumpb(obj, indent=indent).decode("utf-8")
+
+
+class UjsonBackend(JSONBackend):
+  name: str = "ujson"
+  item_separator: str = ","
+  key_separator: str = ":"
+
+  def __init__(self):
+    import ujson
+    self._ujson = ujson
+
+  def supports_indent(self, indent: int | None) -> bool:
+    return indent is None
+
+  def loads(self, data: str | bytes) -> Any:
+    try:
+      return self._ujson.loads(data)
+    except ValueError:
+      return json.loads(data)  # big integers, NaN and Infinity, broken input raises json.JSONDecodeError
+
+  def dumps(self, obj, indent: int | None = None) -> str:
+    if not self.supports_indent(indent):
+      return super().dumps(obj, indent=indent)
+
+    try:
+      return self._ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False, reject_bytes=True)
+    except (TypeError, OverflowError):
+      return super().dumps(obj, indent=indent)
+
+  def dumpb(self, obj, indent: int | None = None) -> bytes:
+    return self.dumps(obj, indent=indent).encode("utf-8")
+
+
+_BACKENDS: dict[str, type[JSONBackend]] = {
+  OrjsonBackend.name: OrjsonBackend,
+  UjsonBackend.name: UjsonBackend,
+  JSONBackend.name: JSONBackend
+}
+
+_stdlib_backend: JSONBackend = JSONBackend()
+_backend: JSONBackend | None = None
+
+
+def set_backend(name: str | None = None) -> JSONBackend:
+  """
+  Select JSON backend by the name, or first available one if name is not passed
+
+  :raises ValueError: unknown backend name
+  :raises ImportError: the backend library is not installed
+  """
+  global _backend
+
+  if name:
+    if name not in _BACKENDS:
+      raise ValueError(f"Unknown JSON backend '{name}', available: {', '.join(_BACKENDS.keys())}")
+    _backend = _stdlib_backend if name == JSONBackend.name else _BACKENDS[name]()
+    return _backend
+
+  for clazz in _BACKENDS.values():
+    try:
+      _backend = _stdlib_backend if clazz is JSONBackend else clazz()
+      return _backend
+    except ImportError:
+      continue
+
+  return _backend
+
+
+def get_backend(indent: int | None = None, fast: bool = True) -> JSONBackend:
+  """
+  Returns active backend, or stdlib one if active backend doesn't support requested indent
+
+  :param fast: fast backend output format is acceptable, otherwise stdlib backend is returned for json.dumps
+               compatible output
+  """
+  if _backend is None:
+    set_backend(os.getenv("APPUTILS_JSON_BACKEND"))
+
+  return _backend if fast and _backend.supports_indent(indent) else _stdlib_backend
+
+
+def loads(data: str | bytes) -> Any:
+  return get_backend().loads(data)
+
+
+def dumps(obj, indent: int | None = None, fast: bool = False) -> str:
+  """
+  :param fast: use active backend, with its compact output format, instead of json.dumps compatible one
+  """
+  return get_backend(indent, fast).dumps(obj, indent=indent)
+
+
+def dumpb(obj, indent: int | None = None, fast: bool = False) -> bytes:
+  """
+  :param fast: use active backend, with its compact output format, instead of json.dumps compatible one
+  """
+  return get_backend(indent, fast).dumpb(obj, indent=indent)
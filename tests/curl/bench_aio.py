@@ -0,0 +1,61 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+"""
+Benchmark of concurrent curl_async() requests to the local http.server: curl() in the loop executor threads vs
+native asyncio client, with connection per request and with shared AsyncCurlSession pool
+
+Run: PYTHONPATH=src/modules:tests python tests/curl/bench_aio.py
+"""
+import asyncio
+import time
+
+from apputils.curl import curl_async
+from apputils.curl.aio import AsyncCurlSession
+
+from curl.server import LocalServer
+
+
+async def measure(name: str, count: int, f):
+  start = time.perf_counter()
+  responses = await asyncio.gather(*(f() for _ in range(count)))
+  elapsed = time.perf_counter() - start
+  assert all(r.code == 200 for r in responses)
+  print(f"{name:<26} {count / elapsed:>8,.0f} requests/s | {elapsed:.3f} s for {count} concurrent requests")
+
+
+async def bench(url: str, count: int):
+  loop = asyncio.get_running_loop()
+  await measure("executor, no session", count, lambda: curl_async(loop, url))
+
+  async def native():
+    async with AsyncCurlSession() as session:
+      return await curl_async(loop, url, session=session)
+
+  await measure("native, no session", count, native)
+  async with AsyncCurlSession(max_per_host=50) as session:
+    await measure("native, AsyncCurlSession", count, lambda: curl_async(loop, url, session=session))
+
+
+def main(count: int = 2000):
+  with LocalServer() as server:
+    asyncio.run(bench(f"{server.url}/echo", count))
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,54 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+"""
+Benchmark of the batch of requests to the local http.server: serial curl() loop vs curl_many() vs curl_many_async()
+
+Run: PYTHONPATH=src/modules:tests python tests/curl/bench_batch.py
+"""
+import asyncio
+import time
+
+from apputils.curl import curl
+from apputils.curl.batch import curl_many, curl_many_async
+
+from curl.server import LocalServer
+
+
+def measure(name: str, count: int, f):
+  start = time.perf_counter()
+  results = f()
+  elapsed = time.perf_counter() - start
+  assert len(results) == count
+  print(f"{name:<18} {count / elapsed:>8,.0f} requests/s | {elapsed:.3f} s for {count} requests")
+
+
+async def collect_async(urls):
+  return [r async for r in curl_many_async(urls, max_per_host=50)]
+
+
+def main(count: int = 2000):
+  with LocalServer() as server:
+    urls = [f"{server.url}/echo?i={i}" for i in range(count)]
+    measure("serial curl()", count, lambda: [curl(url) for url in urls])
+    measure("curl_many()", count, lambda: list(curl_many(urls, max_concurrency=8, max_per_host=8)))
+    measure("curl_many_async()", count, lambda: asyncio.run(collect_async(urls)))
+
+
+if __name__ == '__main__':
+  main()
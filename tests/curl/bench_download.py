@@ -0,0 +1,61 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+"""
+Benchmark of the download from the local http.server: copying use_stream=True chunks by hand vs curl_download()
+with one and several segments
+
+Run: PYTHONPATH=src/modules:tests python tests/curl/bench_download.py
+"""
+import os
+import tempfile
+import time
+
+from apputils.curl import curl
+from apputils.curl.download import curl_download
+
+from curl.server import LocalServer, FILE
+
+
+def measure(name: str, repeat: int, f):
+  start = time.perf_counter()
+  for _ in range(repeat):
+    assert f() == len(FILE)
+  elapsed = time.perf_counter() - start
+  print(f"{name:<26} {len(FILE) * repeat / elapsed / 2 ** 20:>8,.0f} MiB/s")
+
+
+def copy_chunks(url: str, path: str) -> int:
+  r = curl(url, use_stream=True, use_gzip=False)
+  with open(path, "wb") as f:
+    while chunk := r.raw.read(64 * 1024):
+      f.write(chunk)
+  r.close_stream()
+  return os.path.getsize(path)
+
+
+def main(repeat: int = 20):
+  with LocalServer() as server, tempfile.TemporaryDirectory() as directory:
+    url, path = f"{server.url}/file", os.path.join(directory, "file.bin")
+    measure("read() chunks", repeat, lambda: copy_chunks(url, path))
+    measure("curl_download()", repeat, lambda: curl_download(url, path))
+    measure("curl_download(segments=3)", repeat,
+            lambda: curl_download(url, path, segments=3, min_segment_size=1024 * 1024))
+
+if __name__ == '__main__':
+  main()
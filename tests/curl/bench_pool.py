@@ -0,0 +1,49 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+"""
+Benchmark of sequential requests to the local http.server: new connection per curl() call vs CurlSession pool
+
+Run: PYTHONPATH=src/modules:tests python tests/curl/bench_pool.py
+"""
+import time
+
+from apputils.curl import curl
+from apputils.curl.pool import CurlSession
+
+from curl.server import LocalServer
+
+
+def measure(name: str, count: int, f):
+  start = time.perf_counter()
+  for _ in range(count):
+    assert f().code == 200
+  elapsed = time.perf_counter() - start
+  print(f"{name:<16} {count / elapsed:>8,.0f} requests/s | {elapsed / count * 1000:.3f} ms per request")
+
+
+def main(count: int = 1000):
+  with LocalServer() as server, CurlSession() as session:
+    url = f"{server.url}/echo"
+    measure("curl()", count, lambda: curl(url))
+    measure("CurlSession", count, lambda: curl(url, session=session))
+    print(f"server connections: {server.connections}")
+
+
+if __name__ == '__main__':
+  main()
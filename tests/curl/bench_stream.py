@@ -0,0 +1,65 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+"""
+Benchmark of gzip body decompression: whole body with GzipFile (the former CURLResponse way), decompress() and
+streaming DecompressingReader, with the peak of the memory allocated on top of the compressed body
+
+Run: PYTHONPATH=src/modules python tests/curl/bench_stream.py
+"""
+import gzip
+import io
+import time
+import tracemalloc
+
+from apputils.curl.stream import DecompressingReader, decompress
+
+
+def measure(name: str, body: bytes, f):
+  tracemalloc.start()
+  start = time.perf_counter()
+  size = f(body)
+  elapsed = time.perf_counter() - start
+  _, peak = tracemalloc.get_traced_memory()
+  tracemalloc.stop()
+  print(f"{name:<20} {size / elapsed / 2 ** 20:>8,.0f} MiB/s | peak {peak / 2 ** 20:>8,.2f} MiB")
+
+
+def gzip_file(body: bytes) -> int:
+  return len(gzip.GzipFile(fileobj=io.BytesIO(body)).read())
+
+
+def whole(body: bytes) -> int:
+  return len(decompress(body, "gzip"))
+
+
+def streaming(body: bytes) -> int:
+  reader = io.BufferedReader(DecompressingReader(io.BytesIO(body), "gzip"))
+  return sum(len(chunk) for chunk in iter(lambda: reader.read1(65536), b""))
+
+
+def main(lines: int = 1_000_000):
+  body = gzip.compress(b"".join(b'{"id": %d, "name": "record %d", "active": true}\n' % (i, i) for i in range(lines)))
+  print(f"compressed body {len(body) / 2 ** 20:.2f} MiB")
+  measure("GzipFile.read()", body, gzip_file)
+  measure("decompress()", body, whole)
+  measure("DecompressingReader", body, streaming)
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,198 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+"""
+Local HTTP/1.1 server with keep-alive support, used by the curl tests and benchmarks
+"""
+import gzip
+import json
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+FILE = random.Random(0).randbytes(3 * 1024 * 1024)
+FILE_ETAG = '"file-v1"'
+
+
+class _Handler(BaseHTTPRequestHandler):
+  protocol_version = "HTTP/1.1"
+  disable_nagle_algorithm = True  # headers and body are sent separately, which stalls keep-alive connections
+  server: "LocalServer"
+
+  def setup(self):
+    super().setup()
+    with self.server.lock:
+      self.server.connections += 1
+
+  def log_message(self, format, *args):
+    pass
+
+  def _send(self, code: int, body: bytes = b"", headers: dict = None):
+    self.send_response(code)
+    for k, v in (headers or {}).items():
+      self.send_header(k, v)
+    self.send_header("Content-Length", str(len(body)))
+    self.end_headers()
+    self.wfile.write(body)
+
+  def _send_chunked(self, chunks: list, headers: dict = None):
+    self.send_response(200)
+    for k, v in (headers or {}).items():
+      self.send_header(k, v)
+    self.send_header("Transfer-Encoding", "chunked")
+    self.end_headers()
+    for chunk in chunks:
+      self.wfile.write(b"%x;ext=1\r\n%s\r\n" % (len(chunk), chunk))
+    self.wfile.write(b"0\r\nX-Trailer: 1\r\n\r\n")
+
+  def _send_file(self, ranges: bool = True, cut: int = None, etag: str = FILE_ETAG):
+    """
+    :param ranges: support Range requests
+    :param cut: close the connection after that number of body bytes
+    :param etag: ETag of the file, None to send no validator
+    """
+    with self.server.lock:
+      self.server.ranges.append(self.headers.get("Range"))
+      self.server.tokens.append(self.headers.get("X-Token"))
+
+    code, start, end = 200, 0, len(FILE) - 1
+    range_header, if_range = self.headers.get("Range"), self.headers.get("If-Range")
+    if ranges and range_header and if_range in (None, etag):
+      first, last = range_header[6:].split("-")
+      if int(first) >= len(FILE):
+        self._send(416, headers={"Content-Range": f"bytes */{len(FILE)}"})
+        return
+      code, start, end = 206, int(first), min(int(last) if last else len(FILE) - 1, len(FILE) - 1)
+
+    body = FILE[start:end + 1]
+    self.send_response(code)
+    self.send_header("Content-Length", str(len(body)))
+    if ranges:
+      if etag:
+        self.send_header("ETag", etag)
+      self.send_header("Accept-Ranges", "bytes")
+    if code == 206:
+      self.send_header("Content-Range", f"bytes {start}-{end}/{len(FILE)}")
+    self.end_headers()
+    self.wfile.write(body[:cut])
+    if cut is not None:
+      self.close_connection = True
+
+  def _echo(self):
+    self._send(200, json.dumps({
+      "method": self.command,
+      "path": self.path,
+      "headers": dict(self.headers.items()),
+      "body": self.body.decode("utf-8")
+    }).encode("utf-8"), {"Content-Type": "application/json"})
+
+  def _route(self):
+    length = int(self.headers.get("Content-Length") or 0)
+    self.body = self.rfile.read(length) if length else b""
+    path = self.path.split("?")[0]
+    if path == "/redirect":
+      self._send(302, headers={"Location": "/echo?redirected=1"})
+    elif path == "/auth":
+      if "Authorization" in self.headers:
+        self._echo()
+      else:
+        self._send(401, headers={"WWW-Authenticate": 'Basic realm="test"'})
+    elif path == "/auth-redirect":  # redirect to the "url" query argument once authorized
+      if "Authorization" in self.headers:
+        self._send(302, headers={"Location": parse_qs(urlsplit(self.path).query)["url"][0]})
+      else:
+        self._send(401, headers={"WWW-Authenticate": 'Basic realm="test"'})
+    elif path == "/close":
+      self._send(200, b"bye", {"Connection": "close"})
+      self.close_connection = True
+    elif path == "/drop":  # keep-alive response, but the connection is closed right after it
+      self._send(200, b"dropped")
+      self.close_connection = True
+    elif path == "/gzip":
+      self._send(200, gzip.compress(b"compressed " * 100), {"Content-Encoding": "gzip"})
+    elif path == "/deflate":
+      self._send(200, zlib.compress(b"deflated " * 100), {"Content-Encoding": "deflate"})
+    elif path == "/chunked":
+      self._send_chunked([b"first,", b"second,", b"third"])
+    elif path == "/chunked-gzip":
+      body = gzip.compress(b"chunked " * 1000)
+      self._send_chunked([body[i:i + 100] for i in range(0, len(body), 100)], {"Content-Encoding": "gzip"})
+    elif path == "/lines":
+      body = gzip.compress("".join(f'{{"line": {i}, "text": "ł"}}\r\n' for i in range(1000)).encode("utf-8"))
+      self._send_chunked([body[i:i + 100] for i in range(0, len(body), 100)], {"Content-Encoding": "gzip"})
+    elif path == "/file":
+      self._send_file()
+    elif path == "/file-no-ranges":
+      self._send_file(ranges=False)
+    elif path == "/file-flaky":  # the first response is interrupted
+      with self.server.lock:
+        cut, self.server.flaky = (100000 if self.server.flaky else None), False
+      self._send_file(cut=cut)
+    elif path == "/file-flaky-no-etag":
+      with self.server.lock:
+        cut, self.server.flaky = (100000 if self.server.flaky else None), False
+      self._send_file(cut=cut, etag=None)
+    elif path == "/file-changing":  # new version of the file on each request
+      with self.server.lock:
+        self.server.version += 1
+        etag = f'"file-v{self.server.version}"'
+      self._send_file(etag=etag)
+    elif path == "/eof":  # body without length, delimited by the connection close
+      self.send_response(200)
+      self.end_headers()
+      self.wfile.write(b"until close")
+      self.close_connection = True
+    elif path == "/slow":
+      time.sleep(1)
+      self._send(200, b"slow")
+    elif path.startswith("/bytes/"):
+      self._send(200, bytes(i % 256 for i in range(int(path[7:]))), {"Content-Type": "application/octet-stream"})
+    else:
+      self._echo()
+
+  do_GET = do_POST = do_PUT = do_DELETE = _route
+
+
+class LocalServer(ThreadingHTTPServer):
+  daemon_threads = True
+  request_queue_size = 1024  # benchmarks are opening hundreds of connections at once
+
+  def __init__(self):
+    super().__init__(("127.0.0.1", 0), _Handler)
+    self.lock = threading.Lock()
+    self.connections: int = 0
+    self.ranges: list = []  # Range headers of the file requests
+    self.tokens: list = []  # X-Token headers of the file requests
+    self.flaky: bool = True
+    self.version: int = 1
+    self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+  @property
+  def url(self) -> str:
+    return f"http://127.0.0.1:{self.server_address[1]}"
+
+  def __enter__(self) -> "LocalServer":
+    self._thread.start()
+    return self
+
+  def __exit__(self, exc_type, exc_val, exc_tb):
+    self.shutdown()
+    self.server_close()
@@ -0,0 +1,147 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+from apputils.curl import curl_async, CURLAuth, CurlRequestType
+from apputils.curl.aio import AsyncCurlSession
+from apputils.curl.pool import CurlSession
+
+from .server import LocalServer
+
+
+class TestCurlAsync(unittest.IsolatedAsyncioTestCase):
+  @classmethod
+  def setUpClass(cls):
+    cls.server = LocalServer().__enter__()
+
+  @classmethod
+  def tearDownClass(cls):
+    cls.server.__exit__(None, None, None)
+
+  async def asyncSetUp(self):
+    self.loop = asyncio.get_running_loop()
+    self.session = AsyncCurlSession(max_per_host=4)
+    self.connections = self.server.connections
+
+  async def asyncTearDown(self):
+    await self.session.close()
+
+  def new_connections(self) -> int:
+    return self.server.connections - self.connections
+
+  async def get(self, path: str, **kwargs):
+    return await curl_async(self.loop, f"{self.server.url}{path}", session=self.session, **kwargs)
+
+  async def test_connection_is_reused(self):
+    for i in range(5):
+      r = await self.get("/echo", params={"i": i})
+      self.assertEqual(r.code, 200)
+      self.assertEqual(r.from_json()["path"], f"/echo?i={i}")
+      self.assertEqual(r.from_json()["headers"]["Host"], self.server.url[7:])
+    self.assertEqual(self.new_connections(), 1)
+    self.assertEqual(list(self.session.stats().values()), [(0, 1)])
+
+  async def test_concurrent(self):
+    responses = await asyncio.gather(*(self.get("/echo", params={"i": i}) for i in range(50)))
+    self.assertEqual([r.from_json()["path"] for r in responses], [f"/echo?i={i}" for i in range(50)])
+    self.assertLessEqual(self.new_connections(), 4)
+
+  async def test_post(self):
+    r = await self.get("/echo", req_type=CurlRequestType.POST, data={"a": 1})
+    self.assertEqual(r.from_json()["method"], "POST")
+    self.assertEqual(json.loads(r.from_json()["body"]), {"a": 1})
+
+  async def test_chunked(self):
+    self.assertEqual((await self.get("/chunked")).content, "first,second,third")
+    self.assertEqual((await self.get("/chunked-gzip")).content, "chunked " * 1000)
+    self.assertEqual(self.new_connections(), 1)
+
+  async def test_compressed(self):
+    self.assertEqual((await self.get("/gzip")).content, "compressed " * 100)
+    self.assertEqual((await self.get("/deflate")).content, "deflated " * 100)
+
+  async def test_body_until_close(self):
+    self.assertEqual((await self.get("/eof")).content, "until close")
+    self.assertEqual((await self.get("/close")).content, "bye")
+    self.assertEqual((await self.get("/echo")).code, 200)
+    self.assertEqual(self.new_connections(), 3)
+
+  async def test_stream(self):
+    r = await self.get("/bytes/1000", use_stream=True)
+    self.assertEqual(r.raw.read(), bytes(i % 256 for i in range(1000)))
+    r.close_stream()
+
+  async def test_redirect(self):
+    r = await self.get("/redirect", req_type=CurlRequestType.POST, data="a=1")
+    self.assertEqual(r.from_json()["method"], "GET")
+    self.assertEqual(r.from_json()["path"], "/echo?redirected=1")
+    self.assertEqual((await self.get("/redirect", follow_redirect=False)).code, 302)
+
+  async def test_auth_challenge(self):
+    r = await self.get("/auth", auth=CURLAuth("user", "pass"))
+    self.assertTrue(r.from_json()["headers"]["Authorization"].startswith("Basic "))
+    self.assertEqual((await self.get("/auth")).code, 401)
+
+  async def test_auth_is_not_sent_to_other_host(self):
+    other = self.server.url.replace("127.0.0.1", "localhost")
+    r = await self.get("/auth-redirect", params={"url": f"{other}/echo"}, auth=CURLAuth("user", "pass"))
+    self.assertEqual(r.from_json()["path"], "/echo")
+    self.assertNotIn("Authorization", r.from_json()["headers"])
+
+  async def test_stale_connection_retried(self):
+    await self.get("/echo")
+    (_, writer, _), = next(iter(self.session._idle.values()))
+    writer.transport.abort()  # as if the server closed idle connection, but the loop did not notice it yet
+    self.session._is_alive = lambda *args: True
+    self.assertEqual((await self.get("/echo")).code, 200)
+    self.assertEqual(self.new_connections(), 2)
+
+  async def test_stale_connection_not_retried_for_post(self):
+    await self.get("/echo")
+    (_, writer, _), = next(iter(self.session._idle.values()))
+    writer.transport.abort()
+    self.session._is_alive = lambda *args: True
+    with self.assertRaises(TimeoutError):
+      await self.get("/echo", req_type=CurlRequestType.POST, data="a=1")
+
+  async def test_timeout(self):
+    with self.assertRaises(TimeoutError):
+      await self.get("/slow", timeout=0.1)
+    self.assertEqual(list(self.session.stats().values()), [(0, 0)])
+
+  async def test_connection_refused(self):
+    with self.assertRaises(TimeoutError):
+      await curl_async(self.loop, "http://127.0.0.1:1/", session=self.session)
+
+  async def test_without_session(self):
+    with mock.patch("apputils.curl.aio.AsyncCurlSession.request", side_effect=AssertionError("native request")):
+      r = await curl_async(self.loop, f"{self.server.url}/chunked")
+    self.assertEqual(r.content, "first,second,third")
+
+  async def test_sync_session(self):
+    with CurlSession() as session:
+      r = await curl_async(self.loop, f"{self.server.url}/gzip", session=session)
+    self.assertEqual(r.content, "compressed " * 100)
+
+
+if __name__ == "__main__":
+  unittest.main()
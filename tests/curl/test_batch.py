@@ -0,0 +1,117 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+import asyncio
+import os
+import unittest
+from unittest import mock
+
+from apputils.curl import CurlRequestType
+from apputils.curl.batch import curl_many, curl_many_async, _Scheduler
+
+from .server import LocalServer
+
+
+class TestScheduler(unittest.TestCase):
+  def test_limits(self):
+    requests = [f"http://a/{i}" for i in range(4)] + [f"http://b/{i}" for i in range(2)]
+    scheduler = _Scheduler(requests, {}, max_concurrency=3, max_per_host=2, ordered=True)
+    tasks = scheduler.ready()
+    self.assertEqual([t.args["url"] for t in tasks], ["http://a/0", "http://b/0", "http://a/1"])
+    self.assertEqual(scheduler.ready(), [])
+
+    self.assertEqual(scheduler.done(tasks[1], None, None), [])  # b/0 is #4, waits for the previous ones
+    self.assertEqual([t.args["url"] for t in scheduler.ready()], ["http://b/1"])
+    self.assertEqual([r.index for r in scheduler.done(tasks[0], None, None)], [0])
+    self.assertEqual([r.index for r in scheduler.done(tasks[2], None, None)], [1])
+
+  def test_unordered(self):
+    scheduler = _Scheduler(["http://a/0", "http://a/1"], {}, 2, 2, ordered=False)
+    tasks = scheduler.ready()
+    self.assertEqual([r.index for r in scheduler.done(tasks[1], None, None)], [1])
+
+  def test_request_without_url(self):
+    with self.assertRaises(ValueError):
+      _Scheduler([{"params": {}}], {}, 1, 1, True)
+
+
+class TestCurlMany(unittest.TestCase):
+  @classmethod
+  def setUpClass(cls):
+    cls.server = LocalServer().__enter__()
+
+  @classmethod
+  def tearDownClass(cls):
+    cls.server.__exit__(None, None, None)
+
+  def setUp(self):
+    self.connections = self.server.connections
+    self.requests = [f"{self.server.url}/echo?i={i}" for i in range(20)]
+    self.requests[5] = "http://127.0.0.1:1/refused"
+    self.requests[7] = {"url": f"{self.server.url}/echo", "req_type": CurlRequestType.POST, "data": "a=1"}
+
+  def check(self, results, ordered: bool = True):
+    self.assertEqual(len(results), 20)
+    if ordered:
+      self.assertEqual([r.index for r in results], list(range(20)))
+    results = sorted(results, key=lambda r: r.index)
+
+    self.assertFalse(results[5].ok)
+    self.assertIsInstance(results[5].error, TimeoutError)
+    self.assertEqual(results[7].response.from_json()["body"], "a=1")
+    self.assertEqual(results[7].request, self.requests[7])
+    for i in set(range(20)) - {5, 7}:
+      self.assertEqual(results[i].response.from_json()["path"], f"/echo?i={i}")
+    self.assertLessEqual(self.server.connections - self.connections, 3)  # connections are shared
+
+  def test_sync(self):
+    self.check(list(curl_many(self.requests, max_concurrency=4, max_per_host=3, timeout=5)))
+
+  def test_sync_unordered(self):
+    self.check(list(curl_many(self.requests, max_per_host=3, ordered=False)), ordered=False)
+
+  def test_async(self):
+    async def run():
+      return [r async for r in curl_many_async(self.requests, max_per_host=3, timeout=5)]
+    self.check(asyncio.run(run()))
+
+  def test_async_unordered(self):
+    async def run():
+      return [r async for r in curl_many_async(self.requests, max_per_host=3, ordered=False)]
+    self.check(asyncio.run(run()), ordered=False)
+
+  def test_proxy(self):
+    env = {"http_proxy": self.server.url, "no_proxy": "127.0.0.1", "HTTP_PROXY": "", "NO_PROXY": ""}
+    requests = ["http://example.invalid/echo?i=0", f"{self.server.url}/echo?i=1"]
+
+    async def run_async():
+      return [r async for r in curl_many_async(requests)]
+
+    with mock.patch.dict(os.environ, env):
+      for results in (list(curl_many(requests)), asyncio.run(run_async())):
+        self.assertEqual(results[0].response.from_json()["path"], "http://example.invalid/echo?i=0")  # proxied
+        self.assertEqual(results[1].response.from_json()["path"], "/echo?i=1")
+
+  def test_stop_early(self):
+    results = curl_many(self.requests, max_concurrency=2)
+    self.assertTrue(next(results).ok)
+    results.close()
+
+
+if __name__ == "__main__":
+  unittest.main()
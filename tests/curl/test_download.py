@@ -0,0 +1,159 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from io import StringIO
+
+from apputils.curl.download import curl_download, progress_bar_callback
+from apputils.curl.pool import CurlSession
+from apputils.progressbar import ProgressBar, ProgressBarStatus
+
+from .server import LocalServer, FILE, FILE_ETAG
+
+
+class TestCurlDownload(unittest.TestCase):
+  @classmethod
+  def setUpClass(cls):
+    cls.server = LocalServer().__enter__()
+
+  @classmethod
+  def tearDownClass(cls):
+    cls.server.__exit__(None, None, None)
+
+  def setUp(self):
+    self.dir = tempfile.mkdtemp()
+    self.path = os.path.join(self.dir, "file.bin")
+    self.server.ranges.clear()
+    self.server.tokens.clear()
+    self.server.flaky = True
+
+  def tearDown(self):
+    shutil.rmtree(self.dir)
+
+  def read(self) -> bytes:
+    with open(self.path, "rb") as f:
+      return f.read()
+
+  def write_state(self, size: int, validator: dict):
+    with open(f"{self.path}.part", "wb") as f:
+      f.write(b"\0" * size)
+    with open(f"{self.path}.part.json", "w") as f:
+      json.dump({"url": f"{self.server.url}/file", "size": size, "validator": validator,
+                 "segments": [[0, 1000, size]]}, f)
+
+  def test_download(self):
+    progress = []
+    size = curl_download(f"{self.server.url}/file", self.path, chunk_size=4096,
+                         progress=lambda done, total: progress.append((done, total)))
+    self.assertEqual(size, len(FILE))
+    self.assertEqual(self.read(), FILE)
+    self.assertEqual(self.server.ranges, ["bytes=0-"])
+    self.assertEqual(progress[0], (0, len(FILE)))
+    self.assertEqual(progress[-1], (len(FILE), len(FILE)))
+    self.assertEqual(os.listdir(self.dir), ["file.bin"])
+
+  def test_segments(self):
+    with CurlSession(max_per_host=4) as session:
+      size = curl_download(f"{self.server.url}/file", self.path, segments=3, min_segment_size=1024 * 1024,
+                           session=session)
+    self.assertEqual(size, len(FILE))
+    self.assertEqual(self.read(), FILE)
+    self.assertEqual(sorted(self.server.ranges), ["bytes=0-", "bytes=1048576-2097151", "bytes=2097152-3145727"])
+
+  def test_small_file_is_not_split(self):
+    curl_download(f"{self.server.url}/file", self.path, segments=8)
+    self.assertEqual(len(self.server.ranges), 1)
+
+  def test_no_ranges(self):
+    self.assertEqual(curl_download(f"{self.server.url}/file-no-ranges", self.path, segments=4), len(FILE))
+    self.assertEqual(self.read(), FILE)
+
+  def test_retry_interrupted_segment(self):
+    curl_download(f"{self.server.url}/file-flaky", self.path)
+    self.assertEqual(self.read(), FILE)
+    self.assertEqual(self.server.ranges, ["bytes=0-", f"bytes=100000-{len(FILE) - 1}"])
+
+  def test_resume(self):
+    with self.assertRaises(IOError):
+      curl_download(f"{self.server.url}/file-flaky", self.path, retries=0)
+    with open(f"{self.path}.part.json") as f:
+      self.assertEqual(json.load(f)["segments"], [[0, 100000, len(FILE)]])
+
+    curl_download(f"{self.server.url}/file-flaky", self.path)
+    self.assertEqual(self.read(), FILE)
+    self.assertEqual(self.server.ranges[-1], f"bytes=100000-{len(FILE) - 1}")
+    self.assertEqual(os.listdir(self.dir), ["file.bin"])
+
+  def test_resume_changed_resource(self):
+    self.write_state(len(FILE), {"ETag": '"file-v0"'})
+    curl_download(f"{self.server.url}/file", self.path)
+    self.assertEqual(self.read(), FILE)
+    self.assertEqual(self.server.ranges, [f"bytes=1000-{len(FILE) - 1}", "bytes=0-"])
+
+  def test_state_without_validator_is_not_resumed(self):
+    self.write_state(len(FILE), {})
+    curl_download(f"{self.server.url}/file", self.path)
+    self.assertEqual(self.read(), FILE)
+    self.assertEqual(self.server.ranges, ["bytes=0-"])
+
+  def test_resume_resized_resource(self):
+    self.write_state(len(FILE) - 10, {"ETag": FILE_ETAG})
+    curl_download(f"{self.server.url}/file", self.path)
+    self.assertEqual(self.read(), FILE)
+    self.assertEqual(self.server.ranges, [f"bytes=1000-{len(FILE) - 11}", "bytes=0-"])
+
+  def test_no_state_without_validator(self):
+    with self.assertRaises(IOError):
+      curl_download(f"{self.server.url}/file-flaky-no-etag", self.path, retries=0)
+    self.assertFalse(os.path.exists(f"{self.path}.part.json"))
+
+    curl_download(f"{self.server.url}/file-flaky-no-etag", self.path)
+    self.assertEqual(self.read(), FILE)
+    self.assertEqual(self.server.ranges[-1], "bytes=0-")
+
+  def test_resource_changed_twice(self):
+    with self.assertRaises(IOError):
+      curl_download(f"{self.server.url}/file-changing", self.path, segments=2, min_segment_size=1024 * 1024)
+    self.assertEqual(os.listdir(self.dir), [])
+
+  def test_restart_keeps_headers(self):
+    self.write_state(len(FILE), {"ETag": '"file-v0"'})
+    curl_download(f"{self.server.url}/file", self.path, headers={"X-Token": "secret"})
+    self.assertEqual(self.read(), FILE)
+    self.assertEqual(self.server.ranges, [f"bytes=1000-{len(FILE) - 1}", "bytes=0-"])
+    self.assertEqual(self.server.tokens, ["secret", "secret"])
+
+  def test_http_error(self):
+    with self.assertRaises(IOError):
+      curl_download(f"{self.server.url}/auth", self.path)
+
+  def test_progress_bar_callback(self):
+    out = StringIO()
+    bar = ProgressBar("Downloading", width=20, stdout=out)
+    curl_download(f"{self.server.url}/file", self.path, progress=progress_bar_callback(bar))
+    self.assertEqual(bar.status, ProgressBarStatus.started)
+    self.assertIn(f"{len(FILE)}/{len(FILE)}", out.getvalue())
+
+
+if __name__ == "__main__":
+  unittest.main()
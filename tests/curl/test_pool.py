@@ -0,0 +1,139 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+import json
+import threading
+import unittest
+
+from apputils.curl import curl, CURLAuth, CurlRequestType
+from apputils.curl.pool import CurlSession
+
+from .server import LocalServer
+
+
+class TestCurlSession(unittest.TestCase):
+  @classmethod
+  def setUpClass(cls):
+    cls.server = LocalServer().__enter__()
+
+  @classmethod
+  def tearDownClass(cls):
+    cls.server.__exit__(None, None, None)
+
+  def setUp(self):
+    self.session = CurlSession(max_per_host=2)
+    self.connections = self.server.connections
+
+  def tearDown(self):
+    self.session.close()
+
+  def new_connections(self) -> int:
+    return self.server.connections - self.connections
+
+  def test_connection_is_reused(self):
+    for i in range(5):
+      r = curl(f"{self.server.url}/echo", params={"i": i}, session=self.session)
+      self.assertEqual(r.code, 200)
+      self.assertEqual(r.from_json()["path"], f"/echo?i={i}")
+    self.assertEqual(self.new_connections(), 1)
+
+  def test_post(self):
+    r = self.session.request(f"{self.server.url}/echo", req_type=CurlRequestType.POST, data={"a": 1})
+    self.assertEqual(json.loads(r.from_json()["body"]), {"a": 1})
+    self.assertEqual(r.from_json()["method"], "POST")
+
+  def test_without_session(self):
+    r = curl(f"{self.server.url}/redirect", req_type=CurlRequestType.POST, data="a=1")
+    self.assertEqual(r.from_json()["path"], "/echo?redirected=1")
+    self.assertEqual(curl(f"{self.server.url}/gzip").content, "compressed " * 100)
+
+  def test_gzip(self):
+    self.assertEqual(curl(f"{self.server.url}/gzip", session=self.session).content, "compressed " * 100)
+
+  def test_redirect(self):
+    r = curl(f"{self.server.url}/redirect", session=self.session)
+    self.assertEqual(r.from_json()["path"], "/echo?redirected=1")
+    self.assertEqual(curl(f"{self.server.url}/redirect", session=self.session, follow_redirect=False).code, 302)
+
+  def test_auth_challenge(self):
+    r = curl(f"{self.server.url}/auth", auth=CURLAuth("user", "pass"), session=self.session)
+    self.assertEqual(r.code, 200)
+    self.assertTrue(r.from_json()["headers"]["Authorization"].startswith("Basic "))
+    self.assertEqual(curl(f"{self.server.url}/auth", session=self.session).code, 401)
+
+  def test_auth_is_not_sent_to_other_host(self):
+    other = self.server.url.replace("127.0.0.1", "localhost")
+    for auth in (CURLAuth("user", "pass"), CURLAuth("user", "pass", force=True, headers={})):
+      with self.subTest(force=auth.force):
+        r = curl(f"{self.server.url}/auth-redirect", params={"url": f"{other}/auth"}, auth=auth, session=self.session)
+        self.assertEqual(r.code, 401)
+        r = curl(f"{self.server.url}/auth-redirect", params={"url": "/auth"}, auth=auth, session=self.session)
+        self.assertEqual(r.code, 200)
+
+  def test_server_closed_connection(self):
+    self.assertEqual(curl(f"{self.server.url}/close", session=self.session).content, "bye")
+    self.assertEqual(curl(f"{self.server.url}/echo", session=self.session).code, 200)
+    self.assertEqual(self.new_connections(), 2)
+
+  def test_stale_connection_retried_for_idempotent_methods(self):
+    self.session._is_alive = lambda *args: True  # as if the close was not noticed yet
+    for req_type, retried in ((CurlRequestType.GET, True), (CurlRequestType.PUT, True), (CurlRequestType.POST, False)):
+      with self.subTest(req_type=req_type.value):
+        self.assertEqual(curl(f"{self.server.url}/drop", session=self.session).content, "dropped")
+        if retried:
+          self.assertEqual(curl(f"{self.server.url}/echo", req_type=req_type, session=self.session).code, 200)
+        else:
+          with self.assertRaises(TimeoutError):
+            curl(f"{self.server.url}/echo", req_type=req_type, data="a=1", session=self.session)
+
+  def test_stream(self):
+    r = curl(f"{self.server.url}/bytes/1000", session=self.session, use_stream=True)
+    self.assertEqual(len(r.raw.read()), 1000)
+    r.close_stream()
+    key = next(iter(self.session.stats()))
+    self.assertEqual(self.session.stats()[key], (0, 1))
+
+    r = curl(f"{self.server.url}/bytes/1000", session=self.session, use_stream=True)
+    r.raw.read(10)
+    r.close_stream()  # not completely read connection is not re-used
+    self.assertEqual(self.session.stats()[key], (0, 0))
+
+  def test_max_per_host(self):
+    session = CurlSession(max_per_host=1)
+    stream = curl(f"{self.server.url}/bytes/10", session=session, use_stream=True)
+    with self.assertRaises(TimeoutError):
+      curl(f"{self.server.url}/echo", session=session, timeout=0.2)
+
+    threading.Timer(0.1, stream.close_stream).start()
+    self.assertEqual(curl(f"{self.server.url}/echo", session=session, timeout=5).code, 200)
+    session.close()
+
+  def test_idle_timeout(self):
+    session = CurlSession(idle_timeout=0)
+    curl(f"{self.server.url}/echo", session=session)
+    curl(f"{self.server.url}/echo", session=session)
+    self.assertEqual(self.new_connections(), 2)
+    session.close()
+
+  def test_connection_error(self):
+    with self.assertRaises(TimeoutError):
+      curl("http://127.0.0.1:1/echo", session=self.session)
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,129 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+import gzip
+import io
+import json
+import unittest
+import zlib
+
+from apputils.curl import curl
+from apputils.curl.pool import CurlSession
+from apputils.curl.stream import DecompressingReader, content_codec, decompress
+
+from .server import LocalServer
+
+DATA = b"".join(b"line %d of the body\n" % i for i in range(10000))
+
+
+def raw_deflate(data: bytes) -> bytes:
+  c = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+  return c.compress(data) + c.flush()
+
+
+class TestDecompressingReader(unittest.TestCase):
+  def test_codecs(self):
+    cases = [
+      (None, DATA),
+      ("gzip", gzip.compress(DATA)),
+      ("gzip", gzip.compress(DATA[:1000]) + gzip.compress(DATA[1000:])),  # several members
+      ("deflate", zlib.compress(DATA)),
+      ("deflate", raw_deflate(DATA))
+    ]
+    for codec, body in cases:
+      with self.subTest(codec=codec, size=len(body)):
+        self.assertEqual(decompress(body, codec), DATA)
+        reader = io.BufferedReader(DecompressingReader(io.BytesIO(body), codec, chunk_size=512))
+        self.assertEqual(b"".join(iter(lambda: reader.read(1000), b"")), DATA)
+
+  def test_bounded_output(self):
+    body = gzip.compress(b"\0" * 50_000_000)
+    reader = DecompressingReader(io.BytesIO(body), "gzip", chunk_size=4096)
+    self.assertEqual(reader.read(100000), b"\0" * 4096)
+    self.assertLessEqual(len(reader._pending), 4096)
+
+  def test_broken_body(self):
+    with self.assertRaises(zlib.error):
+      decompress(b"not compressed at all", "gzip")
+
+  def test_truncated_body(self):
+    cases = [
+      ("gzip", gzip.compress(DATA)[:-10]),  # without the trailer
+      ("gzip", gzip.compress(DATA)[:len(gzip.compress(DATA)) // 2]),
+      ("gzip", gzip.compress(DATA) + gzip.compress(DATA)[:100]),  # the second member is truncated
+      ("deflate", zlib.compress(DATA)[:-10]),
+      ("deflate", raw_deflate(DATA)[:-10])
+    ]
+    for codec, body in cases:
+      with self.subTest(codec=codec, size=len(body)):
+        with self.assertRaises(EOFError):
+          decompress(body, codec)
+        with self.assertRaises(EOFError):
+          DecompressingReader(io.BytesIO(body), codec, chunk_size=512).readall()
+
+  def test_empty_body(self):
+    self.assertEqual(decompress(b"", "gzip"), b"")
+    self.assertEqual(DecompressingReader(io.BytesIO(b""), "gzip").readall(), b"")
+
+  def test_content_codec(self):
+    self.assertEqual(content_codec("x-gzip"), "gzip")
+    self.assertEqual(content_codec("deflate"), "deflate")
+    self.assertIsNone(content_codec("identity"))
+    self.assertIsNone(content_codec(None))
+
+
+class TestCurlResponseStream(unittest.TestCase):
+  @classmethod
+  def setUpClass(cls):
+    cls.server = LocalServer().__enter__()
+
+  @classmethod
+  def tearDownClass(cls):
+    cls.server.__exit__(None, None, None)
+
+  def test_iter_content(self):
+    r = curl(f"{self.server.url}/chunked-gzip", use_stream=True)
+    chunks = list(r.iter_content(100))
+    self.assertTrue(all(len(chunk) <= 100 for chunk in chunks))
+    self.assertEqual(b"".join(chunks), b"chunked " * 1000)
+    self.assertTrue(r.raw.closed)
+
+  def test_iter_lines(self):
+    for use_stream in (True, False):
+      with self.subTest(use_stream=use_stream):
+        lines = list(curl(f"{self.server.url}/lines", use_stream=use_stream).iter_lines(chunk_size=7))
+        self.assertEqual(lines, [json.dumps({"line": i, "text": "ł"}, ensure_ascii=False) for i in range(1000)])
+
+  def test_stream(self):
+    r = curl(f"{self.server.url}/deflate", use_stream=True)
+    self.assertEqual(r.stream.read(9), b"deflated ")
+    self.assertEqual(r.stream.read(), b"deflated " * 99)
+    r.close_stream()
+
+    self.assertEqual(curl(f"{self.server.url}/gzip").stream.read(), b"compressed " * 100)
+
+  def test_connection_reused_after_iteration(self):
+    with CurlSession() as session:
+      for _ in range(3):
+        r = curl(f"{self.server.url}/lines", use_stream=True, session=session)
+        self.assertEqual(len(list(r.iter_lines())), 1000)
+      self.assertEqual(list(session.stats().values()), [(0, 1)])
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,80 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+"""
+Benchmark of MessagePack (SODumpType.BINARY) vs JSON encoding: document size and encode/decode time
+
+Run: PYTHONPATH=src/modules python tests/json2obj/bench_binary.py
+"""
+import timeit
+from datetime import datetime
+from enum import Enum
+from unittest import mock
+
+from apputils.json2obj import SerializableObject, SODumpType, binary
+from apputils.jsonbackend import get_backend
+
+
+class Level(Enum):
+  LOW = "low"
+  HIGH = "high"
+
+
+class Entry(SerializableObject):
+  id: int = 0
+  name: str = ""
+  level: Level = Level.LOW
+  created: datetime = None
+  score: float = 0.0
+  tags: list[str] = []
+
+
+class Journal(SerializableObject):
+  title: str = ""
+  entries: list[Entry] = []
+
+
+def make_journal(size: int = 200) -> Journal:
+  return Journal({
+    "title": "journal",
+    "entries": [{"id": i, "name": f"entry-{i}", "level": "high" if i % 2 else "low", "created": 1765361826.5 + i,
+                 "score": i / 7, "tags": ["a", "b"]} for i in range(size)]
+  })
+
+
+def bench_format(name: str, journal: Journal, _type: SODumpType, number: int):
+  data = journal.dump(_type=_type, fast=True)
+  encode_time = min(timeit.repeat(lambda: journal.dump(_type=_type, fast=True), number=number, repeat=3))
+  decode_time = min(timeit.repeat(lambda: Journal(data, _type=_type), number=number, repeat=3))
+  size = len(data if isinstance(data, bytes) else data.encode("utf-8"))
+  print(f"{name:<22} {size:>8,} bytes | encode {number / encode_time:>8,.0f} ops/s | "
+        f"decode {number / decode_time:>8,.0f} ops/s")
+
+
+def main(number: int = 100):
+  journal = make_journal()
+  bench_format(f"json ({get_backend().name})", journal, SODumpType.JSON, number)
+  if binary.MSGPACK_ENABLED:
+    bench_format("binary (msgpack)", journal, SODumpType.BINARY, number)
+
+  with mock.patch.object(binary, "MSGPACK_ENABLED", False):
+    bench_format("binary (built-in)", journal, SODumpType.BINARY, number)
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,65 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+"""
+Benchmark of object cloning: copy.deepcopy vs copy constructor vs with_changes() on the nested object graph
+
+Run: PYTHONPATH=src/modules python tests/json2obj/bench_clone.py
+"""
+import copy
+import timeit
+from datetime import datetime
+
+from apputils.json2obj import SerializableObject
+
+
+class Limits(SerializableObject):
+  cpu: int = 0
+  tags: list[str] = []
+
+
+class Service(SerializableObject):
+  name: str = ""
+  started: datetime = None
+  limits: Limits = None
+  replicas: dict[str, Limits] = {}
+
+
+def bench(size: int, number: int = 200):
+  service = Service({
+    "name": "api",
+    "started": 1765361826.5,
+    "limits": {"cpu": 2, "tags": ["a", "b"]},
+    "replicas": {f"r{i}": {"cpu": i, "tags": ["x"]} for i in range(size)}
+  })
+
+  results = {
+    "deepcopy": min(timeit.repeat(lambda: copy.deepcopy(service), number=number, repeat=3)),
+    "copy constructor": min(timeit.repeat(lambda: Service(service), number=number, repeat=3)),
+    "with_changes": min(timeit.repeat(lambda: service.with_changes(name="web"), number=number, repeat=3))
+  }
+  print(f"{size:>5} replicas: " + " | ".join(f"{k} {number / v:>10,.0f} ops/s" for k, v in results.items()))
+
+
+def main():
+  bench(10)
+  bench(1000)
+
+
+if __name__ == '__main__':
+  main()
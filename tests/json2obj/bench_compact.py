@@ -0,0 +1,65 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+"""
+Memory footprint of regular vs @compact SerializableObject instances
+
+Run: PYTHONPATH=src/modules python tests/json2obj/bench_compact.py
+"""
+import tracemalloc
+
+from apputils.json2obj import SerializableObject, compact
+
+
+class Regular(SerializableObject):
+  id: int = 0
+  name: str = ""
+  country: str = ""
+  score: float = 0.0
+
+
+@compact
+class Compact(SerializableObject):
+  id: int = 0
+  name: str = ""
+  country: str = ""
+  score: float = 0.0
+
+
+def measure(clazz: type, count: int) -> float:
+  records = [{"id": i, "name": "name", "country": "NL", "score": 1.5} for i in range(count)]
+  clazz(records[0])  # compile the class plan outside of measurement
+
+  tracemalloc.start()
+  objs = [clazz(r) for r in records]
+  size, _ = tracemalloc.get_traced_memory()
+  tracemalloc.stop()
+
+  del objs
+  return size / count
+
+
+def main(count: int = 100000):
+  regular = measure(Regular, count)
+  compacted = measure(Compact, count)
+  print(f"regular: {regular:>7.1f} bytes/object")
+  print(f"compact: {compacted:>7.1f} bytes/object  (-{regular - compacted:.1f} bytes, {compacted / regular:.0%})")
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,77 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+"""
+Benchmark of batch decoding: serial from_ndjson vs decode_batch with the process pool
+
+Run: PYTHONPATH=src/modules python tests/json2obj/bench_parallel.py
+"""
+import io
+import json
+import os
+import time
+from datetime import datetime
+from enum import Enum
+
+from apputils.json2obj import SerializableObject
+from apputils.json2obj.parallel import decode_batch
+
+
+class Level(Enum):
+  LOW = "low"
+  HIGH = "high"
+
+
+class Tag(SerializableObject):
+  key: str = ""
+  value: str = ""
+
+
+class Event(SerializableObject):
+  id: int = 0
+  level: Level = Level.LOW
+  created: datetime = None
+  message: str = ""
+  tags: list[Tag] = []
+
+
+def make_ndjson(size: int) -> bytes:
+  return "\n".join(json.dumps({
+    "id": i, "level": "high" if i % 3 else "low", "created": 1765361826.5 + i, "message": f"event {i}",
+    "tags": [{"key": "host", "value": f"h{i % 10}"}, {"key": "env", "value": "prod"}]
+  }) for i in range(size)).encode("utf-8")
+
+
+def measure(name: str, size: int, f):
+  start = time.perf_counter()
+  objects = f()
+  elapsed = time.perf_counter() - start
+  assert len(objects) == size
+  print(f"{name:<24} {size / elapsed:>10,.0f} records/s")
+
+
+def main(size: int = 200000):
+  data = make_ndjson(size)
+  print(f"{size:,} records, {os.cpu_count()} CPUs")
+  measure("serial", size, lambda: Event.from_ndjson(io.BytesIO(data)))
+  for workers in (2, 4, os.cpu_count()):
+    measure(f"processes ({workers})", size, lambda: decode_batch(Event, data, workers=workers))
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,301 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+"""
+Benchmark suite of json2obj: construction, serialize(), dump() and to_json() on representative schemas.
+
+Reports operations per second (best of the repeats) and allocations per operation: peak traced memory while
+the operation runs and the memory kept by its result.
+
+Run: PYTHONPATH=src/modules python tests/json2obj/bench_suite.py [-k flat] [--save base.json] [--compare base.json]
+     [--compiled]
+
+With --compare, operations which became slower more than --tolerance (10% by default) are marked and the
+script exits with code 1, so it could be used as release check.
+"""
+import argparse
+import gc
+import json
+import sys
+import timeit
+import tracemalloc
+from datetime import datetime
+from enum import Enum
+from typing import Callable
+
+from apputils.json2obj import SerializableObject
+
+
+# --- flat
+
+class Flat(SerializableObject):
+  id: int = 0
+  name: str = ""
+  email: str = ""
+  active: bool = False
+  score: float = 0.0
+  count: int = 0
+  country: str = ""
+  city: str = ""
+
+
+def flat_data(i: int = 0) -> dict:
+  return {"id": i, "name": f"user{i}", "email": f"user{i}@example.com", "active": True, "score": i / 3,
+          "count": i * 2, "country": "NL", "city": "Amsterdam"}
+
+
+# --- nested
+
+class Level4(SerializableObject):
+  value: int = 0
+  label: str = ""
+
+
+class Level3(SerializableObject):
+  name: str = ""
+  items: list[Level4] = []
+
+
+class Level2(SerializableObject):
+  name: str = ""
+  child: Level3 = None
+
+
+class Level1(SerializableObject):
+  name: str = ""
+  children: list[Level2] = []
+
+
+class Nested(SerializableObject):
+  name: str = ""
+  root: Level1 = None
+
+
+def nested_data() -> dict:
+  return {"name": "tree", "root": {"name": "l1", "children": [
+    {"name": f"l2-{i}", "child": {"name": "l3", "items": [{"value": j, "label": f"v{j}"} for j in range(5)]}}
+    for i in range(4)
+  ]}}
+
+
+# --- dict[str, Obj]
+
+class Registry(SerializableObject):
+  name: str = ""
+  users: dict[str, Flat] = {}
+
+
+def registry_data() -> dict:
+  return {"name": "registry", "users": {f"u{i}": flat_data(i) for i in range(20)}}
+
+
+# --- unions
+
+class Point(SerializableObject):
+  x: int = 0
+  y: int = 0
+
+
+class Label(SerializableObject):
+  text: str = ""
+
+
+class UnionItem(SerializableObject):
+  key: int | str = None
+  value: int | float | str = None
+  shape: Point | Label = None
+  extra: Label | None = None
+
+
+class Unions(SerializableObject):
+  items: list[UnionItem] = []
+
+
+def unions_data() -> dict:
+  return {"items": [
+    {"key": i if i % 2 else f"k{i}", "value": [i, i / 2, f"v{i}"][i % 3],
+     "shape": {"x": i, "y": i} if i % 2 else {"text": f"t{i}"}, "extra": None if i % 2 else {"text": "e"}}
+    for i in range(20)
+  ]}
+
+
+# --- enums
+
+class Color(Enum):
+  RED = 1
+  GREEN = 2
+  BLUE = 3
+
+
+class Size(Enum):
+  SMALL = "s"
+  MEDIUM = "m"
+  LARGE = "l"
+
+
+class EnumItem(SerializableObject):
+  color: Color = Color.RED
+  size: Size = Size.SMALL
+  background: Color = Color.RED
+  fit: Size = Size.SMALL
+
+
+class Enums(SerializableObject):
+  items: list[EnumItem] = []
+
+
+def enums_data() -> dict:
+  return {"items": [{"color": i % 3 + 1, "size": "sml"[i % 3], "background": 3 - i % 3, "fit": "lms"[i % 3]}
+                    for i in range(20)]}
+
+
+# --- datetimes
+
+class DateItem(SerializableObject):
+  created: datetime = None
+  updated: datetime = None
+  expires: datetime = None
+
+
+class Dates(SerializableObject):
+  items: list[DateItem] = []
+
+
+def dates_data() -> dict:
+  ts = 1765361826.5
+  return {"items": [{"created": ts + i, "updated": ts + i * 2, "expires": None if i % 4 else ts + i * 3}
+                    for i in range(20)]}
+
+
+SCHEMAS: dict[str, tuple[type, Callable[[], dict]]] = {
+  "flat": (Flat, flat_data),
+  "nested": (Nested, nested_data),
+  "dict": (Registry, registry_data),
+  "unions": (Unions, unions_data),
+  "enums": (Enums, enums_data),
+  "datetimes": (Dates, dates_data),
+}
+
+
+def enable_codegen():
+  """
+  Set __compiled__ for all the benchmark classes, should be called before the first object creation
+  """
+  for value in list(globals().values()):
+    if isinstance(value, type) and issubclass(value, SerializableObject) and value is not SerializableObject:
+      value.__compiled__ = True
+
+
+def operations(clazz: type, data: dict) -> dict[str, Callable[[], object]]:
+  obj = clazz(data)
+  return {
+    "construct": lambda: clazz(data),
+    "serialize": lambda: obj.serialize(),
+    "dump": lambda: obj.dump(),
+    "to_json": lambda: obj.to_json(),
+  }
+
+
+def measure_allocations(op: Callable[[], object]) -> tuple[int, int]:
+  """
+  :return: peak traced memory while the operation runs and memory kept by its result, in bytes
+  """
+  op()  # warm up caches, so they are not accounted
+  gc.collect()
+  tracemalloc.start()
+  try:
+    before, _ = tracemalloc.get_traced_memory()
+    result = op()
+    _, peak = tracemalloc.get_traced_memory()
+    gc.collect()  # full collection clears free lists, which are keeping released objects memory
+    current, _ = tracemalloc.get_traced_memory()
+  finally:
+    tracemalloc.stop()
+  del result
+  return peak - before, current - before
+
+
+def measure_speed(op: Callable[[], object], min_time: float = 0.2, repeat: int = 5) -> float:
+  """
+  :return: operations per second, the best of repeats
+  """
+  timer = timeit.Timer(op)
+  number, _ = timer.autorange()
+  number = max(1, int(number * min_time / 0.2))
+  return number / min(timer.repeat(repeat=repeat, number=number))
+
+
+def run(selected: list[str] = None, min_time: float = 0.2, repeat: int = 5) -> dict[str, dict]:
+  results = {}
+  for schema, (clazz, make_data) in SCHEMAS.items():
+    for op_name, op in operations(clazz, make_data()).items():
+      name = f"{schema}.{op_name}"
+      if selected and not any(s in name for s in selected):
+        continue
+      peak, kept = measure_allocations(op)
+      results[name] = {"ops": measure_speed(op, min_time, repeat), "peak_bytes": peak, "kept_bytes": kept}
+  return results
+
+
+def report(results: dict[str, dict], baseline: dict[str, dict] = None, tolerance: float = 0.1) -> bool:
+  """
+  :return: True, if no regressions were found against the baseline
+  """
+  ok = True
+  print(f"{'benchmark':<22} {'ops/s':>12} {'peak KiB':>10} {'kept KiB':>10}" + ("  vs baseline" if baseline else ""))
+  for name, r in results.items():
+    line = f"{name:<22} {r['ops']:>12,.0f} {r['peak_bytes'] / 1024:>10.1f} {r['kept_bytes'] / 1024:>10.1f}"
+    if baseline and name in baseline:
+      ratio = r["ops"] / baseline[name]["ops"]
+      regression = ratio < 1 - tolerance
+      ok = ok and not regression
+      line += f"  x{ratio:.2f}" + ("  REGRESSION" if regression else "")
+    print(line)
+  return ok
+
+
+def main():
+  parser = argparse.ArgumentParser(description="json2obj benchmark suite")
+  parser.add_argument("-k", dest="selected", action="append", help="run only benchmarks containing the text")
+  parser.add_argument("--min-time", type=float, default=0.2, help="minimal time of one repeat, in seconds")
+  parser.add_argument("--repeat", type=int, default=5)
+  parser.add_argument("--save", help="save results to the JSON file")
+  parser.add_argument("--compare", help="compare results with the JSON file saved before")
+  parser.add_argument("--tolerance", type=float, default=0.1, help="allowed slowdown against the baseline")
+  parser.add_argument("--compiled", action="store_true", help="use generated code (__compiled__ = True)")
+  args = parser.parse_args()
+
+  if args.compiled:
+    enable_codegen()
+
+  results = run(args.selected, args.min_time, args.repeat)
+  baseline = None
+  if args.compare:
+    with open(args.compare) as f:
+      baseline = json.load(f)
+
+  ok = report(results, baseline, args.tolerance)
+  if args.save:
+    with open(args.save, "w") as f:
+      json.dump(results, f, indent=2)
+
+  sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+  main()
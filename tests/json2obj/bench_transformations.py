@@ -0,0 +1,87 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+"""
+Micro-benchmark of transformation lookup: linear scan of registered transformations vs memoized type-keyed lookup
+
+Run: PYTHONPATH=src/modules python tests/json2obj/bench_transformations.py
+"""
+import timeit
+from datetime import datetime
+
+from apputils.json2obj.transformations import TransformationsRegistry, TransformationItemAbstract, \
+  DateTimeTransformation, StringNumberTransformation, EnumTransformation
+
+
+class _NeverTransformation(TransformationItemAbstract):
+  def serialize_condition(self, obj: object) -> bool:
+    return False
+
+  def deserialize_condition(self, expected_type: type, obj: object) -> bool:
+    return expected_type is bytes and isinstance(obj, bytearray)
+
+  def serialize(self, obj: object) -> object:
+    return obj
+
+  def deserialize(self, expected_type: type, obj: object) -> object:
+    return obj
+
+  def is_serialize_chain(self) -> bool:
+    return False
+
+  def is_deserialize_chain(self) -> bool:
+    return False
+
+
+def make_registry(size: int) -> TransformationsRegistry:
+  registry = TransformationsRegistry()
+  for _ in range(size - 3):
+    registry.register_transformation(_NeverTransformation())
+
+  registry.register_transformation(DateTimeTransformation())
+  registry.register_transformation(StringNumberTransformation())
+  registry.register_transformation(EnumTransformation())
+  return registry
+
+
+def bench(size: int, number: int = 200000):
+  registry = make_registry(size)
+  samples = [(int, 5), (str, "value"), (datetime, 1765361826.79), (float, "3.14")]
+
+  def scan():
+    for expected_type, value in samples:
+      registry._scan_deserializer(expected_type, value)
+
+  def lookup():
+    for expected_type, value in samples:
+      registry.find_deserializer(expected_type, value)
+
+  scan_time = timeit.timeit(scan, number=number)
+  lookup_time = timeit.timeit(lookup, number=number)
+  ops = number * len(samples)
+  print(f"{size:>3} transformations: scan {ops / scan_time:>12,.0f} ops/s | "
+        f"lookup {ops / lookup_time:>12,.0f} ops/s | x{scan_time / lookup_time:.1f}")
+
+
+def main():
+  bench(3)
+  bench(30)
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,133 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+import io
+import unittest
+from datetime import datetime
+from enum import Enum
+from unittest import mock
+
+from apputils.json2obj import SerializableObject, SODumpType, binary
+
+
+class Level(Enum):
+  LOW = "low"
+  HIGH = "high"
+
+
+class Item(SerializableObject):
+  name: str = ""
+  count: int = 0
+
+
+class Record(SerializableObject):
+  title: str = ""
+  level: Level = Level.LOW
+  created: datetime = None
+  ratio: float = 0.0
+  enabled: bool = False
+  item: Item = None
+  items: list[Item] = []
+  counters: dict[str, int] = {}
+
+
+class TestBinaryFormat(unittest.TestCase):
+  def setUp(self):
+    self.record = Record({
+      "title": "журнал", "level": "high", "created": 1765361826.5, "ratio": -0.25, "enabled": True,
+      "item": {"name": "a", "count": 1}, "items": [{"name": "b", "count": -70000}, {"name": "c" * 300}],
+      "counters": {"x": 2 ** 40, "y": -1}
+    })
+
+  def test_roundtrip(self):
+    data = self.record.dump(_type=SODumpType.BINARY)
+    self.assertIsInstance(data, bytes)
+
+    restored = Record(data, _type=SODumpType.BINARY)
+    self.assertEqual(restored.serialize(), self.record.serialize())
+    self.assertEqual(restored.level, Level.HIGH)
+    self.assertIsInstance(restored.created, datetime)
+    self.assertIsInstance(restored.items[0], Item)
+    self.assertEqual(restored.__file_type__, SODumpType.BINARY)
+
+  def test_format_is_guessed(self):
+    restored = Record.from_bytes(self.record.dump(_type=SODumpType.BINARY))
+    self.assertEqual(restored.__file_type__, SODumpType.BINARY)
+    self.assertEqual(restored.items[1].name, "c" * 300)
+    self.assertIsInstance(restored.to_json(), str)
+    self.assertIsInstance(restored.dump(), bytes)
+
+  def test_smaller_than_json(self):
+    self.assertLess(len(self.record.dump(_type=SODumpType.BINARY)), len(self.record.dump().encode("utf-8")))
+
+  def test_dump_to(self):
+    fp = io.BytesIO()
+    self.record.dump_to(fp, _type=SODumpType.BINARY, minimal=True)
+    self.assertEqual(fp.getvalue(), self.record.dump(_type=SODumpType.BINARY, minimal=True))
+
+  def test_validate(self):
+    self.assertEqual(Record.validate(self.record.dump(_type=SODumpType.BINARY)), [])
+    self.assertEqual(len(Record.validate(b"\x81\xa5level\xa3mid")), 1)
+
+  def test_broken_data(self):
+    data = self.record.dump(_type=SODumpType.BINARY)
+    with self.assertRaises(ValueError):
+      Record(data[:-1], _type=SODumpType.BINARY)
+    with self.assertRaises(ValueError):
+      Record(data + b"\x00", _type=SODumpType.BINARY)
+
+
+class TestBuiltinCodec(unittest.TestCase):
+  values = [
+    None, True, False, 0, 127, 128, 255, 256, 65535, 65536, 2 ** 32, 2 ** 64 - 1, -1, -32, -33, -128, -129,
+    -32768, -32769, -2 ** 31 - 1, -2 ** 63, 1.5, -0.0, "", "a" * 31, "b" * 32, "c" * 256, "d" * 65536, b"\x00\xff",
+    [], list(range(16)), {"k": [1, {"n": None}]}, {str(i): i for i in range(16)}, {1: "int key"}
+  ]
+
+  def test_roundtrip(self):
+    with mock.patch.object(binary, "MSGPACK_ENABLED", False):
+      for value in self.values:
+        with self.subTest(value=repr(value)[:20]):
+          self.assertEqual(binary.unpackb(binary.packb(value)), value)
+
+  @unittest.skipUnless(binary.MSGPACK_ENABLED, "msgpack is not installed")
+  def test_compatible_with_msgpack(self):
+    with mock.patch.object(binary, "MSGPACK_ENABLED", False):
+      packed = [binary.packb(value) for value in self.values]
+
+    for value, data in zip(self.values, packed):
+      self.assertEqual(data, binary.packb(value))
+
+  def test_truncated_data(self):
+    with mock.patch.object(binary, "MSGPACK_ENABLED", False):
+      for value in self.values:
+        data = binary.packb(value)
+        for size in set(range(min(len(data), 40))) | {len(data) - 1}:  # headers and the end of the payload
+          with self.subTest(value=repr(value)[:20], size=size):
+            self.assertRaises(ValueError, binary.unpackb, data[:size])
+
+      self.assertEqual(len(Record.validate(b"\x81\xa5ratio\xcb\x3f\xf8")), 1)
+
+  def test_unsupported_type(self):
+    with mock.patch.object(binary, "MSGPACK_ENABLED", False):
+      self.assertRaises(TypeError, binary.packb, object())
+      self.assertRaises(OverflowError, binary.packb, 2 ** 64)
+
+
+if __name__ == "__main__":
+  unittest.main()
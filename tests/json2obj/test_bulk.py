@@ -0,0 +1,62 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+import io
+import unittest
+
+from apputils.json2obj import SerializableObject
+
+
+class Record(SerializableObject):
+  id: int = 0
+  name: str = ""
+
+
+class TestBulkDecode(unittest.TestCase):
+  def test_from_list(self):
+    objs = Record.from_list([{"id": 1, "name": "a"}, {"id": 2, "name": "b"}])
+    self.assertEqual([o.id for o in objs], [1, 2])
+    self.assertIsInstance(objs[0], Record)
+
+  def test_from_list_raises_by_default(self):
+    with self.assertRaises(ValueError):
+      Record.from_list([{"id": 1}, {"id": "bad"}])
+
+  def test_from_list_collects_errors(self):
+    errors = []
+    objs = Record.from_list([{"id": 1}, {"id": "bad"}, {"id": 3, "extra": 1}, {"id": 4}], errors=errors)
+    self.assertEqual([o.id for o in objs], [1, 4])
+    self.assertEqual([n for n, _ in errors], [1, 2])
+
+  def test_ndjson_text_stream(self):
+    fp = io.StringIO('{"id": 1, "name": "a"}\n\n{"id": 2, "name": "b"}\n')
+    gen = Record.iter_ndjson(fp)
+    self.assertEqual(next(gen).id, 1)
+    self.assertEqual(next(gen).name, "b")
+    self.assertRaises(StopIteration, next, gen)
+
+  def test_ndjson_binary_with_errors(self):
+    fp = io.BytesIO(b'{"id": 1}\nnot json\n[1, 2]\n{"id": "x"}\n{"id": 5}\n')
+    errors = []
+    objs = Record.from_ndjson(fp, errors=errors)
+    self.assertEqual([o.id for o in objs], [1, 5])
+    self.assertEqual([n for n, _ in errors], [2, 3, 4])
+
+
+if __name__ == "__main__":
+  unittest.main()
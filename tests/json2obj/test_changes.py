@@ -0,0 +1,152 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+import copy
+import unittest
+
+from apputils.json2obj import SerializableObject, compact
+
+
+class Endpoint(SerializableObject):
+  host: str = ""
+  port: int = 0
+
+
+class Config(SerializableObject):
+  __track_changes__ = True
+  __mapping__ = {"app_name": "name"}
+  __grouping__ = {"secrets": "_secret"}
+
+  app_name: str = ""
+  debug: bool = False
+  endpoint: Endpoint = None
+  tags: list[str] = []
+  secrets: dict = {}
+
+
+@compact
+class CompactConfig(SerializableObject):
+  __track_changes__ = True
+
+  name: str = ""
+  retries: int = 0
+
+
+class NormalizedConfig(SerializableObject):
+  __track_changes__ = True
+
+  name: str = ""
+  retries: int = 0
+
+  def __setattr__(self, name, value):
+    super().__setattr__(name, value.lower() if name == "name" else value)
+
+
+class TrackedChild(NormalizedConfig):
+  pass
+
+
+class TestChangesTracking(unittest.TestCase):
+  data = {"name": "svc", "debug": False, "endpoint": {"host": "localhost", "port": 80}, "db_secret": "x"}
+
+  def test_construction_is_not_a_change(self):
+    self.assertEqual(Config(self.data).changed_fields(), set())
+    self.assertEqual(Config(Config(self.data)).changed_fields(), set())
+    self.assertEqual(Config().serialize_changes(), {})
+
+  def test_changed_fields(self):
+    c = Config(self.data)
+    c.debug = True
+    c.endpoint = Endpoint({"host": "example.com", "port": 443})
+    self.assertEqual(c.changed_fields(), {"debug", "endpoint"})
+    self.assertEqual(c.serialize_changes(), {"debug": True, "endpoint": {"host": "example.com", "port": 443}})
+
+    c.clear_changes()
+    self.assertEqual(c.serialize_changes(), {})
+
+  def test_mapped_and_grouped_fields(self):
+    c = Config(self.data)
+    c.app_name = "api"
+    c.secrets = {"db_secret": "y"}
+    self.assertEqual(c.serialize_changes(), {"name": "api", "db_secret": "y"})
+
+  def test_apply_patch(self):
+    source = Config(self.data)
+    source.app_name = "api"
+    source.endpoint = Endpoint({"host": "example.com", "port": 443})
+    source.secrets = {"db_secret": "y"}
+
+    target = Config(self.data)
+    target.apply_patch(source.serialize_changes())
+    self.assertEqual(target.serialize(), source.serialize())
+    self.assertIsInstance(target.endpoint, Endpoint)
+    self.assertEqual(target.changed_fields(), {"app_name", "endpoint", "secrets"})
+
+    target.apply_patch('{"tags": ["a"]}')
+    self.assertEqual(target.tags, ["a"])
+
+  def test_apply_patch_errors(self):
+    with self.assertRaises(AttributeError):
+      Config(self.data).apply_patch({"unknown": 1})
+    with self.assertRaises(ValueError):
+      Config(self.data).apply_patch({"endpoint": {"port": "x"}})
+
+  def test_with_changes(self):
+    c = Config(self.data)
+    c.debug = True
+    clone = c.with_changes(tags=["b"])
+    self.assertEqual(clone.changed_fields(), {"debug", "tags"})
+    self.assertEqual(c.changed_fields(), {"debug"})
+
+  def test_copy(self):
+    c = Config(self.data)
+    c.debug = True
+    clone = copy.copy(c)
+    clone.app_name = "api"
+    self.assertEqual(c.changed_fields(), {"debug"})
+    self.assertEqual(clone.changed_fields(), {"debug", "app_name"})
+
+    c = CompactConfig({"name": "svc"})
+    clone = copy.copy(c)
+    clone.retries = 3
+    self.assertEqual(c.changed_fields(), set())
+    self.assertEqual(clone.serialize_changes(), {"retries": 3})
+
+  def test_custom_setattr(self):
+    for clazz in (NormalizedConfig, TrackedChild):
+      with self.subTest(clazz.__name__):
+        c = clazz({"name": "SVC"})
+        self.assertEqual(c.name, "svc")
+        c.name = "API"
+        self.assertEqual(c.serialize_changes(), {"name": "api"})
+
+  def test_compact(self):
+    c = CompactConfig({"name": "svc"})
+    self.assertEqual(c.changed_fields(), set())
+    c.retries = 3
+    self.assertEqual(c.serialize_changes(), {"retries": 3})
+
+  def test_not_tracked_class(self):
+    e = Endpoint({"host": "a"})
+    e.port = 1
+    self.assertEqual(e.changed_fields(), set())
+    self.assertNotIn("__setattr__", Endpoint.__dict__)
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,102 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+import unittest
+from datetime import datetime
+
+from apputils.json2obj import SerializableObject, compact
+
+
+class Limits(SerializableObject):
+  cpu: int = 0
+  tags: list[str] = []
+
+
+class Service(SerializableObject):
+  name: str = ""
+  started: datetime = None
+  limits: Limits = None
+  replicas: dict[str, Limits] = {}
+
+
+class LazyService(Service):
+  __lazy__ = True
+
+
+@compact
+class CompactLimits(SerializableObject):
+  cpu: int = 0
+  tags: list[str] = []
+
+
+class TestClone(unittest.TestCase):
+  data = {
+    "name": "api",
+    "started": 1765361826.5,
+    "limits": {"cpu": 2, "tags": ["a"]},
+    "replicas": {"eu": {"cpu": 1}}
+  }
+
+  def test_copy_constructor_is_deep(self):
+    s = Service(self.data)
+    c = Service(s)
+    self.assertEqual(c.serialize(), s.serialize())
+    self.assertIsNot(c.limits, s.limits)
+    self.assertIsNot(c.limits.tags, s.limits.tags)
+    self.assertIsNot(c.replicas["eu"], s.replicas["eu"])
+    self.assertIs(c.started, s.started)  # immutable values are shared
+
+    c.limits.tags.append("b")
+    self.assertEqual(s.limits.tags, ["a"])
+
+  def test_with_changes_shares_unchanged_values(self):
+    s = Service(self.data)
+    c = s.with_changes(name="web", limits=s.limits.with_changes(cpu=4))
+
+    self.assertEqual((c.name, c.limits.cpu), ("web", 4))
+    self.assertEqual((s.name, s.limits.cpu), ("api", 2))
+    self.assertIs(c.replicas, s.replicas)
+    self.assertIs(c.limits.tags, s.limits.tags)
+    self.assertIsInstance(c, Service)
+    self.assertEqual(c.serialize()["replicas"], s.serialize()["replicas"])
+
+  def test_with_changes_unknown_field(self):
+    with self.assertRaises(AttributeError):
+      Service(self.data).with_changes(nmae="web")
+
+  def test_with_changes_lazy(self):
+    s = LazyService(self.data)
+    c = s.with_changes(name="web")
+    self.assertEqual(c.limits.cpu, 2)
+    self.assertIn("limits", s.__dict__["__raw__"])  # resolving clone field doesn't touch the original
+    self.assertEqual(s.limits.cpu, 2)
+
+    c = s.with_changes(replicas={})
+    self.assertEqual(c.serialize()["replicas"], {})
+    self.assertEqual(s.serialize()["replicas"], {"eu": {"cpu": 1, "tags": []}})
+
+  def test_with_changes_compact(self):
+    limits = CompactLimits({"cpu": 1, "tags": ["x"]})
+    c = limits.with_changes(cpu=3)
+    self.assertEqual((c.cpu, c.tags), (3, ["x"]))
+    self.assertEqual(limits.cpu, 1)
+    self.assertIs(c.tags, limits.tags)
+
+
+if __name__ == "__main__":
+  unittest.main()
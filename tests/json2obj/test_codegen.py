@@ -0,0 +1,163 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+import unittest
+from datetime import datetime
+from enum import Enum
+
+from apputils.json2obj import SerializableObject, compact, _class_plan
+from apputils.json2obj.transformations import transformations, TransformationItemAbstract
+
+
+class Color(Enum):
+  RED = 1
+  GREEN = "green"
+
+
+class Child(SerializableObject):
+  value: int = 0
+
+
+def make_record(compiled: bool, strict: bool = True) -> type:
+  class Record(SerializableObject):
+    __compiled__ = compiled
+    __strict__ = strict
+    __mapping__ = {"record_id": "id"}
+    __grouping__ = {"labels": "_label"}
+
+    record_id: int = 0
+    name: str = ""
+    ratio: float = 0.0
+    enabled: bool = False
+    color: Color = Color.RED
+    created: datetime = None
+    child: Child = None
+    children: list[Child] = []
+    tags: list[str] = []
+    index: dict[str, Child] = {}
+    key: int | str = None
+    labels: dict = {}
+
+  return Record
+
+
+Record, CompiledRecord = make_record(False), make_record(True)
+LooseRecord, CompiledLooseRecord = make_record(False, strict=False), make_record(True, strict=False)
+
+
+@compact
+class CompactRecord(SerializableObject):
+  __compiled__ = True
+
+  name: str = ""
+  color: Color = Color.RED
+  child: Child = None
+
+
+class _UpperTransformation(TransformationItemAbstract):
+  def serialize_condition(self, obj: object) -> bool:
+    return False
+
+  def deserialize_condition(self, expected_type: type, obj: object) -> bool:
+    return expected_type is str and isinstance(obj, str)
+
+  def serialize(self, obj: object) -> object:
+    return obj
+
+  def deserialize(self, expected_type: type, obj: object) -> object:
+    return obj.upper()
+
+  def is_serialize_chain(self) -> bool:
+    return False
+
+  def is_deserialize_chain(self) -> bool:
+    return False
+
+
+class TestCodegen(unittest.TestCase):
+  samples = [
+    {},
+    {"id": 1, "name": "a", "ratio": 1.5, "enabled": True, "color": "green", "created": 1765361826.5,
+     "child": {"value": 2}, "children": [{"value": 3}], "tags": ["x", "y"], "index": {"k": {"value": 4}},
+     "key": "k", "a_label": "l"},
+    {"record_id": 2, "ratio": "2.5", "color": 1, "key": 5, "child": None, "name": None},
+    {"ratio": 3, "enabled": 1, "tags": None},
+  ]
+  broken = [
+    {"name": 1},
+    {"color": "blue"},
+    {"color": [1]},
+    {"child": {"value": "x"}},
+    {"children": "x"},
+    {"unknown": 1},
+    {"ratio": "x"},
+  ]
+
+  def assertSame(self, generic: type, compiled: type, data: dict):
+    try:
+      expected = generic(dict(data))
+    except (ValueError, TypeError) as e:
+      with self.assertRaises(type(e)) as ctx:
+        compiled(dict(data))
+      self.assertEqual(str(ctx.exception), str(e))
+      return
+
+    obj = compiled(dict(data))
+    self.assertEqual(obj.serialize(), expected.serialize())
+    self.assertEqual(obj.serialize(minimal=True), expected.serialize(minimal=True))
+    self.assertEqual(obj.to_json(), expected.to_json())
+    self.assertEqual(list(obj.__error__), list(expected.__error__))
+    for k in ("color", "child", "children", "created", "key"):
+      self.assertEqual(type(getattr(obj, k)), type(getattr(expected, k)))
+
+  def test_same_result(self):
+    for data in self.samples + self.broken:
+      with self.subTest(data=data):
+        self.assertSame(Record, CompiledRecord, data)
+        self.assertSame(LooseRecord, CompiledLooseRecord, data)
+
+  def test_code_is_generated(self):
+    CompiledRecord(self.samples[1]).serialize()
+    compiled = _class_plan(CompiledRecord).compiled
+    self.assertIn("self.name = value", compiled.deserialize_fields.__source__)
+    self.assertIsNone(_class_plan(Record).compiled)
+
+  def test_extra_attributes(self):
+    obj, expected = CompiledLooseRecord(self.samples[1]), LooseRecord(self.samples[1])
+    obj.note = expected.note = "n"
+    self.assertEqual(obj.serialize(), expected.serialize())
+
+  def test_compact(self):
+    obj = CompactRecord({"name": "a", "color": "green", "child": {"value": 1}})
+    self.assertEqual(obj.serialize(), {"name": "a", "color": "green", "child": {"value": 1}})
+
+  def test_transformations_change(self):
+    self.assertEqual(CompiledRecord({"name": "a"}).name, "a")
+    t = _UpperTransformation()
+    transformations.register_transformation(t)
+    try:
+      self.assertEqual(CompiledRecord({"name": "a"}).name, Record({"name": "a"}).name)
+    finally:
+      transformations._transformations.remove(t)
+      transformations._deserializers.clear()
+      transformations._serializers.clear()
+      transformations.version += 1
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,82 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+import unittest
+from array import array
+from datetime import datetime
+from enum import Enum
+
+from apputils.json2obj import SerializableObject
+from apputils.json2obj.columns import to_columns, from_columns
+
+
+class Color(Enum):
+  RED = 1
+  GREEN = 2
+
+
+class Shade(Enum):
+  DARK = "dark"
+  LIGHT = "light"
+
+
+class Point(SerializableObject):
+  x: int = 0
+  y: float = 0.0
+  visible: bool = True
+  color: Color = Color.RED
+  shade: Shade = Shade.DARK
+  created: datetime = None
+  label: str = None
+
+
+class TestColumns(unittest.TestCase):
+  def setUp(self):
+    self.points = [
+      Point({"x": 1, "y": 1.5, "visible": False, "color": 2, "shade": "light", "created": 1765361826.5, "label": "a"}),
+      Point({"x": 2, "y": 2.5, "color": 1}),
+    ]
+
+  def test_to_columns(self):
+    columns = to_columns(self.points, use_numpy=False)
+    self.assertEqual(columns["x"], array("q", [1, 2]))
+    self.assertEqual(columns["y"], array("d", [1.5, 2.5]))
+    self.assertEqual(columns["visible"], array("b", [0, 1]))
+    self.assertEqual(columns["color"], array("q", [2, 1]))
+    self.assertEqual(columns["shade"], ["light", "dark"])
+    self.assertEqual(columns["created"][0], 1765361826.5)
+    self.assertEqual(columns["label"], ["a", None])
+
+  def test_roundtrip(self):
+    restored = from_columns(Point, to_columns(self.points, use_numpy=False))
+    self.assertEqual([p.serialize() for p in restored], [p.serialize() for p in self.points])
+    self.assertIs(restored[0].visible, False)
+    self.assertIsNone(restored[1].created)
+    self.assertEqual(restored[0].shade, Shade.LIGHT)
+
+  def test_empty(self):
+    self.assertEqual(to_columns([], clazz=Point, use_numpy=False)["x"], [])
+    self.assertRaises(ValueError, to_columns, [])
+
+  def test_columns_length_mismatch(self):
+    with self.assertRaises(ValueError):
+      from_columns(Point, {"x": [1, 2], "y": [1.0]})
+
+
+if __name__ == "__main__":
+  unittest.main()
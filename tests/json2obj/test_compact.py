@@ -0,0 +1,122 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+import unittest
+from enum import Enum
+
+from apputils.json2obj import SerializableObject, SODumpType, compact
+
+
+class Status(Enum):
+  ON = "on"
+  OFF = "off"
+
+
+@compact
+class Address(SerializableObject):
+  city: str = "Nowhere"
+
+
+@compact
+class Person(SerializableObject):
+  __mapping__ = {
+    "full_name": "full-name"
+  }
+  __grouping__ = {
+    "links": "_url"
+  }
+
+  full_name: str = None
+  age: int = 0
+  status: Status = Status.OFF
+  address: Address = None
+
+  def greeting(self) -> str:
+    return f"Hi {self.full_name}"
+
+
+@compact
+class Employee(Person):
+  title: str = "engineer"
+
+  def greeting(self) -> str:
+    return super().greeting() + f", {self.title}"
+
+
+class TestCompact(unittest.TestCase):
+  data = {
+    "full-name": "Amy",
+    "age": "18",
+    "status": "on",
+    "address": {"city": "Paris"},
+    "home_url": "http://localhost"
+  }
+
+  def test_no_instance_dict(self):
+    p = Person(self.data)
+    self.assertFalse(hasattr(p, "__dict__"))
+    self.assertEqual(p.__error__, ())
+    with self.assertRaises(AttributeError):
+      p.unknown_field = 1
+
+  def test_decode(self):
+    p = Person(self.data)
+    self.assertEqual(p.full_name, "Amy")
+    self.assertEqual(p.age, 18)
+    self.assertEqual(p.status, Status.ON)
+    self.assertEqual(p.address.city, "Paris")
+    self.assertEqual(p.links, {"home_url": "http://localhost"})
+
+  def test_defaults(self):
+    p = Person()
+    self.assertIsNone(p.full_name)
+    self.assertEqual(p.status, Status.OFF)
+    self.assertEqual(Address({}).city, "Nowhere")
+
+  def test_serialize(self):
+    p = Person(self.data)
+    self.assertEqual(p.serialize(), {
+      "full-name": "Amy",
+      "age": 18,
+      "status": "on",
+      "address": {"city": "Paris"},
+      "home_url": "http://localhost"
+    })
+    self.assertEqual(Person(p.to_json()).serialize(), p.serialize())
+    self.assertIn("full-name: Amy", p.dump(_type=SODumpType.YAML))
+
+  def test_inheritance(self):
+    e = Employee(dict(self.data, title="manager"))
+    self.assertFalse(hasattr(e, "__dict__"))
+    self.assertEqual(e.title, "manager")
+    self.assertEqual(e.greeting(), "Hi Amy, manager")
+    self.assertEqual(e.serialize()["title"], "manager")
+
+  def test_copy(self):
+    p = Person(self.data)
+    c = Person(p)
+    self.assertEqual(c.serialize(), p.serialize())
+    self.assertIsNot(c.address, p.address)
+
+  def test_strict_errors(self):
+    with self.assertRaises(ValueError):
+      Person({"age": "x"})
+
+
+if __name__ == "__main__":
+  unittest.main()
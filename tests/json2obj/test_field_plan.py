@@ -0,0 +1,140 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+import unittest
+from enum import Enum
+
+from apputils.json2obj import SerializableObject
+
+
+class Color(Enum):
+  RED = "red"
+  BLUE = "blue"
+
+
+class Child(SerializableObject):
+  name: str = None
+
+
+class Parent(SerializableObject):
+  __mapping__ = {
+    "a_b": "a:b"
+  }
+  __grouping__ = {
+    "uris": "_url"
+  }
+
+  a_b: int = 0
+  color: Color = Color.RED
+  child: Child = None
+  children: list[Child] = []
+  index: dict[str, Child] = {}
+  uris: dict = {}
+
+
+class Derived(Parent):
+  extra: str = "default"
+
+
+class TestFieldPlan(unittest.TestCase):
+  def test_plan_is_cached_per_class(self):
+    Parent({"a:b": 1})
+    plan = Parent.__dict__["__plan__"]
+    Parent({"a:b": 2})
+    self.assertIs(plan, Parent.__dict__["__plan__"])
+
+  def test_subclass_gets_own_plan(self):
+    Parent({})
+    Derived({})
+    self.assertIsNot(Parent.__dict__["__plan__"], Derived.__dict__["__plan__"])
+    self.assertEqual(Derived({}).extra, "default")
+
+  def test_redefined_class_gets_new_plan(self):
+    class Item(SerializableObject):
+      value: int = 0
+
+    self.assertEqual(Item({"value": "5"}).value, 5)
+
+    class Item(SerializableObject):
+      value: str = ""
+
+    self.assertEqual(Item({"value": "5"}).value, "5")
+
+  def test_mapping_grouping_and_nesting(self):
+    obj = Parent({
+      "a:b": 5,
+      "color": "blue",
+      "child": {"name": "x"},
+      "children": [{"name": "y"}],
+      "index": {"k": {"name": "z"}},
+      "home_url": "http://localhost"
+    })
+    self.assertEqual(obj.a_b, 5)
+    self.assertEqual(obj.color, Color.BLUE)
+    self.assertEqual(obj.child.name, "x")
+    self.assertEqual(obj.children[0].name, "y")
+    self.assertEqual(obj.index["k"].name, "z")
+    self.assertEqual(obj.uris, {"home_url": "http://localhost"})
+
+    data = obj.serialize()
+    self.assertEqual(data["a:b"], 5)
+    self.assertNotIn("a_b", data)
+    self.assertEqual(data["color"], "blue")
+    self.assertEqual(data["home_url"], "http://localhost")
+    self.assertEqual(data["index"], {"k": {"name": "z"}})
+
+  def test_original_name_used_when_alias_missing(self):
+    self.assertEqual(Parent({"a_b": 3}).a_b, 3)
+
+  def test_strict_errors(self):
+    with self.assertRaises(ValueError):
+      Child({"name": "x", "unknown": 1})
+
+    with self.assertRaises(ValueError):
+      Parent({"a:b": "not a number"})
+
+
+class Sparse(SerializableObject):
+  __strict__ = False
+
+  name: str
+  count: int = 0
+  child: Child = None
+
+  def describe(self) -> str:
+    return self.name
+
+
+class TestSerializePlan(unittest.TestCase):
+  def test_unset_field_without_default_is_skipped(self):
+    self.assertEqual(Sparse().serialize(), {"count": 0, "child": None})
+
+  def test_instance_attributes_are_serialized(self):
+    obj = Sparse({"name": "x", "child": {"name": "y"}})
+    obj.note = "extra"
+    obj._Sparse__hidden = 1
+    obj.callback = lambda: None
+    self.assertEqual(obj.serialize(), {"count": 0, "child": {"name": "y"}, "name": "x", "note": "extra"})
+
+  def test_minimal(self):
+    obj = Parent({"a:b": 0, "color": "red", "home_url": "", "work_url": "http://localhost"})
+    self.assertEqual(obj.serialize(minimal=True), {"color": "red", "work_url": "http://localhost"})
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,87 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+import unittest
+
+from apputils.json2obj import SerializableObject, compact
+
+
+def text(s: str) -> str:
+  return "".join(list(s))  # new str object on every call
+
+
+class Host(SerializableObject):
+  __intern__ = True
+
+  name: str = ""
+  status: str | None = None
+  port: int = 0
+  aliases: list[str] = []
+  labels: dict[str, str] = {}
+
+
+class PartialHost(SerializableObject):
+  __intern__ = ["status"]
+
+  name: str = ""
+  status: str = ""
+
+
+@compact
+class CompactHost(SerializableObject):
+  __intern__ = True
+
+  status: str = ""
+
+
+class LazyHost(Host):
+  __lazy__ = True
+
+
+class TestInterning(unittest.TestCase):
+  def data(self) -> dict:
+    return {"name": text("web-1"), "status": text("running"), "port": 80, "aliases": [text("web"), 1],
+            "labels": {text("zone"): text("eu-west-1")}}
+
+  def test_values_are_shared(self):
+    a, b = Host(self.data()), Host(self.data())
+    self.assertIs(a.name, b.name)
+    self.assertIs(a.status, b.status)
+    self.assertIs(a.aliases[0], b.aliases[0])
+    self.assertIs(a.labels["zone"], b.labels["zone"])
+    self.assertIs(next(iter(a.labels)), next(iter(b.labels)))
+    self.assertEqual(a.serialize(), b.serialize())
+
+  def test_selected_fields(self):
+    a, b = [PartialHost({"name": text("web-1"), "status": text("running")}) for _ in range(2)]
+    self.assertIs(a.status, b.status)
+    self.assertIsNot(a.name, b.name)
+
+  def test_compact_and_lazy(self):
+    self.assertIs(CompactHost({"status": text("running")}).status, CompactHost({"status": text("running")}).status)
+    self.assertIs(LazyHost(self.data()).labels["zone"], LazyHost(self.data()).labels["zone"])
+
+  def test_disabled_by_default(self):
+    class Plain(SerializableObject):
+      status: str = ""
+
+    self.assertIsNot(Plain({"status": text("running")}).status, Plain({"status": text("running")}).status)
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,103 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+import copy
+import unittest
+
+from apputils.json2obj import SerializableObject
+
+
+class Leaf(SerializableObject):
+  value: int = 0
+
+
+class Node(SerializableObject):
+  __lazy__ = True
+
+  name: str = ""
+  leaf: Leaf = None
+  leaves: list[Leaf] = []
+  index: dict[str, Leaf] = {}
+
+
+class LooseNode(Node):
+  __strict__ = False
+
+
+class TestLazyDecode(unittest.TestCase):
+  data = {
+    "name": "root",
+    "leaf": {"value": 1},
+    "leaves": [{"value": 2}, {"value": 3}],
+    "index": {"a": {"value": 4}}
+  }
+
+  def test_nested_fields_are_decoded_on_access(self):
+    node = Node(self.data)
+    self.assertEqual(node.name, "root")
+    self.assertEqual(set(node.__dict__["__raw__"].keys()), {"leaf", "leaves", "index"})
+
+    self.assertEqual(node.leaf.value, 1)
+    self.assertIs(node.leaf, node.leaf)
+    self.assertNotIn("leaf", node.__dict__["__raw__"])
+    self.assertEqual([leaf.value for leaf in node.leaves], [2, 3])
+    self.assertEqual(node.index["a"].value, 4)
+    self.assertNotIn("__raw__", node.__dict__)
+
+  def test_defaults(self):
+    node = Node({"name": "x"})
+    self.assertIsNone(node.leaf)
+    self.assertEqual(node.leaves, [])
+    self.assertIsNone(Node.leaf)
+    self.assertIsNone(Node().leaf)
+
+  def test_assignment_overrides_pending_value(self):
+    node = Node(self.data)
+    node.leaf = Leaf(value=10)
+    self.assertEqual(node.leaf.value, 10)
+    self.assertEqual(node.serialize()["leaf"], {"value": 10})
+
+  def test_serialize(self):
+    self.assertEqual(Node(self.data).serialize(), self.data)
+
+  def test_strict_error_on_access(self):
+    node = Node({"name": "x", "leaf": {"value": "bad"}})
+    self.assertEqual(node.name, "x")
+    with self.assertRaises(ValueError):
+      _ = node.leaf
+
+  def test_copy(self):
+    node = Node(self.data)
+    clone = copy.copy(node)
+    self.assertEqual(clone.leaf.value, 1)
+    self.assertEqual(node.leaf.value, 1)
+    self.assertEqual([leaf.value for leaf in node.leaves], [2, 3])
+    self.assertEqual([leaf.value for leaf in clone.leaves], [2, 3])
+    self.assertEqual(clone.serialize(), self.data)
+
+  def test_materialize_reports_errors(self):
+    with self.assertRaises(ValueError):
+      Node({"leaves": [{"value": 1}, {"unknown": 2}]}).materialize()
+
+    node = LooseNode({"leaf": {"value": "bad"}}).materialize()
+    self.assertIsNone(node.leaf)
+    self.assertEqual(len(node.__error__), 1)
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,122 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+import json
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from apputils.json2obj import SerializableObject, parallel
+from apputils.json2obj.parallel import decode_batch
+
+
+class Record(SerializableObject):
+  id: int = 0
+  name: str = ""
+
+
+class TestDecodeBatch(unittest.TestCase):
+  def setUp(self):
+    self.records = [{"id": i, "name": f"r{i}"} for i in range(100)]
+    self.ndjson = "\n".join(json.dumps(r) for r in self.records).encode("utf-8") + b"\n"
+
+  def assertRecords(self, objects: list, ids):
+    self.assertTrue(all(isinstance(o, Record) for o in objects))
+    self.assertEqual([o.id for o in objects], list(ids))
+
+  def test_list_threads(self):
+    self.assertRecords(decode_batch(Record, self.records, workers=3, threshold=10, use_threads=True), range(100))
+
+  def test_ndjson_processes(self):
+    self.assertRecords(decode_batch(Record, self.ndjson, workers=2, threshold=10), range(100))
+
+  def test_file(self):
+    with tempfile.NamedTemporaryFile(suffix=".ndjson", delete=False) as f:
+      f.write(self.ndjson)
+    try:
+      with ThreadPoolExecutor(max_workers=2) as executor:
+        self.assertRecords(decode_batch(Record, f.name, threshold=10, executor=executor), range(100))
+    finally:
+      os.unlink(f.name)
+
+  def test_serial_fallback(self):
+    with mock.patch.object(parallel, "ThreadPoolExecutor", side_effect=AssertionError("pool was created")):
+      self.assertRecords(decode_batch(Record, self.records[:5], workers=4, use_threads=True), range(5))
+
+  def test_errors_are_ordered(self):
+    self.records[7]["id"] = "x"
+    self.records[93]["id"] = "y"
+    lines = self.ndjson.split(b"\n")
+    lines[50] = b"[1]"
+    ndjson = b"\n".join(lines)
+
+    errors = []
+    objects = decode_batch(Record, self.records, errors, workers=4, threshold=10, use_threads=True)
+    self.assertEqual(len(objects), 98)
+    self.assertEqual([n for n, _ in errors], [7, 93])
+
+    errors = []
+    objects = decode_batch(Record, ndjson, errors, workers=4, threshold=10, use_threads=True)
+    self.assertEqual(len(objects), 99)
+    self.assertEqual([n for n, _ in errors], [51])
+
+    with self.assertRaises(ValueError):
+      decode_batch(Record, self.records, workers=4, threshold=10, use_threads=True)
+
+  def test_split_ndjson(self):
+    chunks = parallel._split_ndjson(self.ndjson, 7)
+    self.assertEqual(b"".join(c for c, in chunks), self.ndjson)
+    self.assertTrue(all(c.endswith(b"\n") for c, in chunks))
+
+  def test_split_file(self):
+    lines = self.ndjson.split(b"\n")
+    lines[3] = b" " * 3000  # long line spanning several chunks
+    data = b"\n".join(lines)
+    with tempfile.NamedTemporaryFile(delete=False) as f:
+      f.write(data)
+    try:
+      with mock.patch.object(parallel, "_MAX_FILE_CHUNK", 1000):
+        chunks = parallel._split_file(f.name, 7)
+      self.assertGreater(len(chunks), 1)
+      self.assertTrue(any(data[start:end].count(b" " * 3000) == 1 for _, start, end in chunks))
+      self.assertEqual([start for _, start, _ in chunks[1:]], [end for _, _, end in chunks[:-1]])
+      self.assertEqual(chunks[-1][2], len(data))
+      self.assertTrue(all(data[end - 1:end] == b"\n" for _, _, end in chunks))
+    finally:
+      os.unlink(f.name)
+
+  def test_file_errors_and_chunks_read_by_workers(self):
+    lines = self.ndjson.split(b"\n")
+    lines[50] = b"[1]"
+    with tempfile.NamedTemporaryFile(delete=False) as f:
+      f.write(b"\n".join(lines))
+    try:
+      errors = []
+      with mock.patch.object(parallel, "_MAX_FILE_CHUNK", 200), \
+           mock.patch.object(parallel, "_decode_file_chunk", wraps=parallel._decode_file_chunk) as worker:
+        objects = decode_batch(Record, f.name, errors, workers=2, threshold=10, use_threads=True)
+      self.assertGreater(worker.call_count, 8)
+      self.assertRecords(objects, [i for i in range(100) if i != 50])
+      self.assertEqual([n for n, _ in errors], [51])
+    finally:
+      os.unlink(f.name)
+
+if __name__ == "__main__":
+  unittest.main()
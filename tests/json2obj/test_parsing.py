@@ -0,0 +1,105 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+import json
+import math
+import unittest
+from unittest import mock
+
+from apputils import json2obj, jsonbackend
+from apputils.json2obj import SerializableObject, SODumpType
+
+
+class Config(SerializableObject):
+  name: str = ""
+  port: int = 0
+
+
+class Measure(SerializableObject):
+  id: int = 0
+  value: float = 0.0
+
+
+class TestDocumentParsing(unittest.TestCase):
+  def test_json(self):
+    obj = Config('  {"name": "srv", "port": 80}')
+    self.assertEqual((obj.name, obj.port), ("srv", 80))
+    self.assertEqual(obj.__file_type__, SODumpType.JSON)
+
+  def test_yaml_is_not_parsed_as_json(self):
+    with mock.patch.object(json2obj, "json_loads", side_effect=AssertionError("JSON parser was called")):
+      obj = Config("name: srv\nport: 80\n")
+    self.assertEqual((obj.name, obj.port), ("srv", 80))
+    self.assertEqual(obj.__file_type__, SODumpType.YAML)
+
+  def test_yaml_flow_mapping(self):
+    obj = Config("{name: srv, port: 80}")
+    self.assertEqual(obj.port, 80)
+    self.assertEqual(obj.__file_type__, SODumpType.YAML)
+
+  def test_bytes(self):
+    self.assertEqual(Config.from_bytes(b'{"port": 1}').port, 1)
+    self.assertEqual(Config.from_bytes(b"port: 2").port, 2)
+    self.assertEqual(Config.from_bytes(b"port: 3", _type=SODumpType.YAML).port, 3)
+
+  def test_explicit_type(self):
+    self.assertEqual(Config.from_json('{"port": 1}').port, 1)
+    self.assertEqual(Config.from_yaml("port: 2").port, 2)
+    self.assertEqual(Config.from_yaml('{"port": 3}').__file_type__, SODumpType.YAML)
+
+    with self.assertRaises(json.JSONDecodeError):
+      Config.from_json("port: 1")
+
+    with self.assertRaises(ValueError):
+      Config.from_yaml("port: [1")
+
+  def test_same_result_with_any_backend(self):
+    data = '{"id": 123456789012345678901234567890, "value": NaN}'
+    try:
+      for name in ("orjson", "ujson", "json"):
+        try:
+          jsonbackend.set_backend(name)
+        except ImportError:
+          continue
+
+        with self.subTest(backend=name):
+          obj = Measure(data)
+          self.assertEqual(obj.id, 123456789012345678901234567890)
+          self.assertTrue(math.isnan(obj.value))
+          self.assertEqual(obj.__file_type__, SODumpType.JSON)
+
+          dumped = Measure(obj.to_json())
+          self.assertEqual(dumped.id, obj.id)
+          self.assertTrue(math.isnan(dumped.value))
+
+          for value in (-2 ** 63 - 1, 2 ** 64):
+            self.assertEqual(Measure(f'{{"id": {value}}}').id, value)
+
+          obj = Measure({"id": 1, "value": 0.5})
+          self.assertEqual(obj.to_json(), json.dumps({"id": 1, "value": 0.5}))
+          self.assertEqual(json.loads(obj.to_json(fast=True)), {"id": 1, "value": 0.5})
+    finally:
+      jsonbackend.set_backend()
+
+  def test_not_a_document(self):
+    with self.assertRaises(AssertionError):
+      Config("just a text")
+
+
+if __name__ == "__main__":
+  unittest.main()
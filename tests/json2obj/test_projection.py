@@ -0,0 +1,86 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+import unittest
+from unittest import mock
+
+from apputils.json2obj import SerializableObject, compact
+
+
+class Owner(SerializableObject):
+  name: str = ""
+
+
+class Document(SerializableObject):
+  __mapping__ = {"doc_id": "id"}
+  __grouping__ = {"labels": "_label"}
+
+  doc_id: int = 0
+  title: str = ""
+  size: int = 0
+  owner: Owner = None
+  labels: dict = {}
+
+
+@compact
+class CompactDocument(SerializableObject):
+  title: str = ""
+  size: int = 0
+
+
+class TestProjection(unittest.TestCase):
+  data = {"id": 7, "title": "report", "size": "large", "owner": {"name": "amy"}, "extra": 1, "a_label": "x"}
+
+  def test_only_requested_fields_are_converted(self):
+    doc = Document.project(self.data, {"doc_id", "title"})
+    self.assertEqual((doc.doc_id, doc.title), (7, "report"))
+    self.assertEqual(doc.size, 0)
+    self.assertIsNone(doc.owner)
+    self.assertEqual(doc.labels, {})
+
+    # invalid "size" and unknown "extra" are not checked
+    with self.assertRaises(ValueError):
+      Document(self.data)
+
+  def test_constructor_argument(self):
+    doc = Document('{"title": "t", "owner": {"name": "bob"}}', _fields=["owner"], size=3)
+    self.assertEqual((doc.title, doc.owner.name, doc.size), ("", "bob", 3))
+
+  def test_grouping(self):
+    self.assertEqual(Document.project(self.data, {"labels"}).labels, {"a_label": "x"})
+
+  def test_errors_of_projected_fields(self):
+    with self.assertRaises(ValueError):
+      Document.project(self.data, {"size"})
+
+  def test_unknown_field(self):
+    with self.assertRaises(AttributeError):
+      Document.project(self.data, {"nmae"})
+
+  def test_projection_is_cached(self):
+    Document.project(self.data, {"title"})
+    with mock.patch("apputils.json2obj._Projection", side_effect=AssertionError("projection was rebuilt")):
+      self.assertEqual(Document.project(self.data, ["title"]).title, "report")
+
+  def test_compact(self):
+    doc = CompactDocument.project({"title": "t", "size": "big"}, {"title"})
+    self.assertEqual((doc.title, doc.size), ("t", 0))
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,59 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+import unittest
+from datetime import datetime
+from enum import Enum
+
+from apputils.json2obj.transformations import TransformationsRegistry, DateTimeTransformation, \
+  StringNumberTransformation, EnumTransformation
+
+
+class Size(Enum):
+  S = 1
+  M = 2
+
+
+class TestTransformationsRegistry(unittest.TestCase):
+  def setUp(self):
+    self.registry = TransformationsRegistry()
+    self.registry.register_transformation(DateTimeTransformation())
+    self.registry.register_transformation(StringNumberTransformation())
+
+  def test_find_deserializer(self):
+    self.assertIsInstance(self.registry.find_deserializer(datetime, 1.5), DateTimeTransformation)
+    self.assertIsInstance(self.registry.find_deserializer(int, "5"), StringNumberTransformation)
+    self.assertIsNone(self.registry.find_deserializer(int, 5))
+    self.assertEqual(self.registry.deserialize(float, "1.5"), 1.5)
+
+  def test_lookup_is_memoized(self):
+    self.registry.find_deserializer(int, "5")
+    self.assertIn((int, str), self.registry._deserializers)
+
+  def test_register_resets_cache(self):
+    self.assertIsNone(self.registry.find_deserializer(Size, 1))
+    self.assertIsNone(self.registry.find_serializer(Size.S))
+
+    self.registry.register_transformation(EnumTransformation())
+    self.assertEqual(self.registry.deserialize(Size, 2), Size.M)
+    self.assertEqual(self.registry.serialize(Size.S), 1)
+    self.assertTrue(self.registry.need_chain_serialize(Size.S))
+
+
+if __name__ == "__main__":
+  unittest.main()
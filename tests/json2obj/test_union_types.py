@@ -69,6 +69,28 @@ class MixedUnions(SerializableObject):
   typed: Union[str, float] = None
 
 
+class IntFirstUnion(SerializableObject):
+  value: int | str = None
+
+
+class Circle(SerializableObject):
+  kind: str = "circle"
+  radius: float = 0.0
+
+
+class Square(SerializableObject):
+  kind: str = "square"
+  side: float = 0.0
+
+
+class Drawing(SerializableObject):
+  __discriminator__ = {
+    "shape": "kind"
+  }
+
+  shape: Circle | Square | None = None
+
+
 class TestNativeUnionType(unittest.TestCase):
   """Tests for X | Y syntax (types.UnionType, Python 3.10+)."""
 
@@ -172,6 +194,72 @@ class TestMixedUnionTypes(unittest.TestCase):
     self.assertIsNone(obj.typed)
 
 
+class TestUnionResolution(unittest.TestCase):
+  def test_failed_members_do_not_leak_errors(self):
+    self.assertEqual(IntFirstUnion({"value": "hello"}).value, "hello")
+    self.assertEqual(IntFirstUnion({"value": "5"}).value, 5)
+
+  def test_candidates_cached_by_value_type(self):
+    self.assertEqual(IntFirstUnion({"value": 7}).value, 7)
+    self.assertEqual(IntFirstUnion({"value": "x"}).value, "x")
+
+    converter = IntFirstUnion.__plan__.fields[0].converter
+    self.assertEqual([c.type for c in converter.candidates[int]], [int])
+    self.assertEqual([c.type for c in converter.candidates[str]], [int, str])
+
+  def test_unresolvable(self):
+    with self.assertRaises(ValueError):
+      IntFirstUnion({"value": 1.5})
+
+  def test_discriminator(self):
+    circle = Drawing({"shape": {"kind": "circle", "radius": 2.0}})
+    self.assertIsInstance(circle.shape, Circle)
+    self.assertEqual(circle.shape.radius, 2.0)
+
+    square = Drawing({"shape": {"kind": "square", "side": 3.0}})
+    self.assertIsInstance(square.shape, Square)
+    self.assertIsNone(Drawing({"shape": None}).shape)
+    self.assertEqual(Drawing.validate({"shape": {"kind": "square", "side": 1.0}}), [])
+
+  def test_discriminator_errors(self):
+    with self.assertRaises(ValueError):
+      Drawing({"shape": {"kind": "triangle"}})
+
+    with self.assertRaises(ValueError):
+      Drawing({"shape": {"kind": "square", "radius": 2.0}})
+
+    self.assertEqual(len(Drawing.validate({"shape": {"side": 1.0}})), 1)
+
+  def test_discriminator_requires_union(self):
+    class Broken(SerializableObject):
+      __discriminator__ = {"shape": "kind"}
+      shape: Circle = None
+
+    with self.assertRaises(TypeError):
+      Broken({})
+
+
+  def test_discriminator_must_be_unique(self):
+    class Oval(SerializableObject):
+      kind: str = "circle"
+      width: float = 0.0
+
+    class Shape(SerializableObject):
+      width: float = 0.0
+
+    class SameValue(SerializableObject):
+      __discriminator__ = {"shape": "kind"}
+      shape: Circle | Oval = None
+
+    class NoValue(SerializableObject):
+      __discriminator__ = {"shape": "kind"}
+      shape: Circle | Shape = None
+
+    with self.assertRaisesRegex(ValueError, "'Circle' and 'Oval'"):
+      SameValue({})
+    with self.assertRaisesRegex(ValueError, "'Shape' has no default"):
+      NoValue({})
+
 if __name__ == "__main__":
   unittest.main()
 
@@ -0,0 +1,126 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+import unittest
+from enum import Enum
+from unittest import mock
+
+from apputils.json2obj import SerializableObject
+
+
+class Level(Enum):
+  LOW = 1
+  HIGH = 2
+
+
+class Tag(SerializableObject):
+  name: str = ""
+
+
+class Event(SerializableObject):
+  __mapping__ = {
+    "event_id": "event-id"
+  }
+
+  event_id: int = 0
+  level: Level = Level.LOW
+  value: int | str = None
+  tags: list[Tag] = []
+  counters: dict[str, int] = {}
+  parent: Tag = None
+
+
+class LooseEvent(Event):
+  __strict__ = False
+
+
+class Batch(SerializableObject):
+  tags: list[Tag] = []
+  ids: list[int] = []
+  names: list[str] = []
+
+
+class TestValidate(unittest.TestCase):
+  valid = {
+    "event-id": "15",
+    "level": 2,
+    "value": "x",
+    "tags": [{"name": "a"}],
+    "counters": {"a": 1},
+    "parent": {"name": "p"}
+  }
+
+  def test_valid_document(self):
+    self.assertEqual(Event.validate(self.valid), [])
+    self.assertEqual(Event.validate('{"event-id": 1, "tags": []}'), [])
+    Event(self.valid)
+
+  def test_no_objects_created(self):
+    with mock.patch.object(Tag, "__init__", side_effect=AssertionError("object was created")):
+      self.assertEqual(Event.validate(self.valid), [])
+
+  def test_reports_all_errors(self):
+    errors = Event.validate({
+      "event-id": "abc",
+      "level": 5,
+      "value": 1.5,
+      "tags": [{"name": "a"}, {"name": "b", "color": "red"}, 5],
+      "counters": {"a": "x"},
+      "parent": "p",
+      "unknown": True
+    })
+    self.assertEqual(len(errors), 8, errors)
+    self.assertTrue(any(e.startswith("Event.event_id:") for e in errors))
+    self.assertTrue(any(e.startswith("Event.level:") for e in errors))
+    self.assertTrue(any(e.startswith("Event.value:") and "Union" in e for e in errors))
+    self.assertTrue(any(e.startswith("Event.tags[1]:") and "color" in e for e in errors))
+    self.assertTrue(any(e.startswith("Event.tags[2]:") for e in errors))
+    self.assertTrue(any(e.startswith("Event.counters['a']:") for e in errors))
+    self.assertTrue(any(e.startswith("Event.parent:") for e in errors))
+    self.assertTrue(any("'unknown: bool'" in e for e in errors))
+
+  def test_not_hashable_enum_value(self):
+    errors = Event.validate({"level": [1]})
+    self.assertEqual(len(errors), 1, errors)
+    self.assertTrue(errors[0].startswith("Event.level:"))
+
+    with self.assertRaises(ValueError):
+      Event({"level": [1]})
+    self.assertEqual(len(LooseEvent({"level": {"a": 1}}).__error__), 1)
+
+  def test_none_list_items_agree_with_constructor(self):
+    for doc in ({"tags": [None]}, {"names": [None]}):
+      with self.subTest(doc=doc):
+        self.assertEqual(Batch.validate(doc), [])
+        Batch(doc)
+
+    self.assertEqual(len(Batch.validate({"ids": [1, None]})), 1)
+    with self.assertRaises(ValueError):
+      Batch({"ids": [1, None]})
+
+  def test_unknown_keys_only_in_strict_mode(self):
+    self.assertEqual(LooseEvent.validate({"unknown": 1}), [])
+    self.assertEqual(len(Event.validate({"unknown": 1})), 1)
+
+  def test_not_an_object(self):
+    self.assertEqual(len(Event.validate("[1, 2]")), 1)
+    self.assertEqual(len(Event.validate("{broken")), 1)
+
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,114 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+import io
+import unittest
+from datetime import datetime
+from enum import Enum
+
+from apputils.json2obj import SerializableObject, SODumpType
+from apputils.json2obj.writer import dump_array, dump_ndjson
+from apputils.jsonbackend import dumps
+
+
+class Kind(Enum):
+  A = "a"
+  B = "b"
+
+
+class Item(SerializableObject):
+  name: str = ""
+  kind: Kind = Kind.A
+
+
+class Document(SerializableObject):
+  __mapping__ = {
+    "doc_id": "doc-id"
+  }
+  __grouping__ = {
+    "links": "_url"
+  }
+
+  doc_id: int = 0
+  title: str = None
+  created: datetime = None
+  items: list[Item] = []
+  index: dict[str, Item] = {}
+  tags: list = []
+  empty: dict = {}
+
+
+class TestStreamWriter(unittest.TestCase):
+  data = {
+    "doc-id": 1,
+    "title": "Quote \" and \n line",
+    "created": 1765361826.5,
+    "items": [{"name": "x", "kind": "b"}, {"name": "y"}],
+    "index": {"k": {"name": "z"}},
+    "tags": ["t1", 2, None, True],
+    "self_url": "http://localhost"
+  }
+
+  def test_same_output_as_dump(self):
+    doc = Document(self.data)
+    for indent in (None, 0, 2, 4):
+      for minimal in (False, True):
+        for fast in (False, True):
+          fp = io.StringIO()
+          doc.dump_to(fp, indent=indent, minimal=minimal, fast=fast)
+          self.assertEqual(fp.getvalue(), doc.dump(indent=indent, minimal=minimal, fast=fast),
+                           f"indent={indent}, minimal={minimal}, fast={fast}")
+
+  def test_binary_stream(self):
+    doc = Document(self.data)
+    fp = io.BytesIO()
+    doc.dump_to(fp)
+    self.assertEqual(fp.getvalue().decode("utf-8"), doc.to_json())
+
+  def test_yaml(self):
+    doc = Document(self.data)
+    fp = io.StringIO()
+    doc.dump_to(fp, _type=SODumpType.YAML)
+    self.assertEqual(fp.getvalue(), doc.dump(_type=SODumpType.YAML))
+
+    fp = io.StringIO()
+    Item().dump_to(fp, _type=SODumpType.YAML, minimal=True)
+    self.assertEqual(fp.getvalue(), Item().dump(_type=SODumpType.YAML, minimal=True))
+
+  def test_array(self):
+    items = [Item({"name": str(i)}) for i in range(3)]
+    for indent in (None, 2):
+      for fast in (False, True):
+        fp = io.StringIO()
+        dump_array((i for i in items), fp, indent=indent, fast=fast)
+        self.assertEqual(fp.getvalue(), dumps([i.serialize() for i in items], indent=indent, fast=fast))
+
+    fp = io.StringIO()
+    dump_array([], fp)
+    self.assertEqual(fp.getvalue(), "[]")
+
+  def test_ndjson(self):
+    items = [Item({"name": str(i)}) for i in range(3)]
+    fp = io.BytesIO()
+    dump_ndjson(items, fp)
+    fp.seek(0)
+    self.assertEqual([i.name for i in Item.iter_ndjson(fp)], ["0", "1", "2"])
+
+
+if __name__ == "__main__":
+  unittest.main()
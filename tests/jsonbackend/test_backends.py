@@ -0,0 +1,124 @@
+#  Licensed to the Apache Software Foundation (ASF) under one or more
+#  contributor license agreements.  See the NOTICE file distributed with
+#  this work for additional information regarding copyright ownership.
+#  The ASF licenses this file to You under the Apache License, Version 2.0
+#  (the "License"); you may not use this file except in compliance with
+#  the License.  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+#
+#  Github: https://github.com/hapylestat/apputils
+#
+#
+import json
+import math
+import unittest
+from unittest import mock
+from datetime import datetime
+
+from apputils import jsonbackend
+from apputils.jsonbackend import JSONBackend, OrjsonBackend, UjsonBackend
+
+
+def available_backends() -> list[JSONBackend]:
+  backends = [JSONBackend()]
+  for clazz in (OrjsonBackend, UjsonBackend):
+    try:
+      backends.append(clazz())
+    except ImportError:
+      pass
+  return backends
+
+
+class TestBackends(unittest.TestCase):
+  def test_loads(self):
+    for backend in available_backends():
+      with self.subTest(backend=backend.name):
+        self.assertEqual(backend.loads('{"a": [1, "b"]}'), {"a": [1, "b"]})
+        self.assertEqual(backend.loads(b'{"a": null}'), {"a": None})
+        with self.assertRaises(json.JSONDecodeError):
+          backend.loads("{broken")
+
+  def test_dumps(self):
+    data = {"a": [1, 2.5, None, True], "b": {"c": "d/e"}, 1: "int key"}
+    for backend in available_backends():
+      with self.subTest(backend=backend.name):
+        self.assertIsInstance(backend.dumps(data), str)
+        self.assertIsInstance(backend.dumpb(data), bytes)
+        self.assertEqual(json.loads(backend.dumps(data)), json.loads(json.dumps(data)))
+        self.assertEqual(json.loads(backend.dumpb(data, indent=4)), json.loads(json.dumps(data)))
+        self.assertEqual(backend.loads(backend.dumps(2 ** 70)), 2 ** 70)
+
+  def test_big_int(self):
+    for backend in available_backends():
+      with self.subTest(backend=backend.name):
+        self.assertEqual(backend.loads('{"id": 123456789012345678901234567890}'), {"id": 123456789012345678901234567890})
+        self.assertEqual(backend.loads(b'[18446744073709551616, -18446744073709551616]'), [2 ** 64, -2 ** 64])
+        self.assertEqual(backend.loads('["12345678901234567890123", 1]'), ["12345678901234567890123", 1])
+
+  def test_64_bit_edges(self):
+    for backend in available_backends():
+      for value in (2 ** 64 - 1, 2 ** 64, -2 ** 63, -2 ** 63 - 1):
+        with self.subTest(backend=backend.name, value=value):
+          result = backend.loads(f'{{"v": {value}}}')["v"]
+          self.assertEqual(result, value)
+          self.assertIs(type(result), int)
+
+  def test_big_int_across_scan_blocks(self):
+    with mock.patch.object(jsonbackend, "_SCAN_BLOCK", 16):
+      for offset in range(20):
+        data = " " * offset + str(-2 ** 63 - 1)
+        with self.subTest(offset=offset):
+          self.assertTrue(jsonbackend._has_big_int(data))
+          self.assertTrue(jsonbackend._has_big_int(data.encode()))
+      self.assertFalse(jsonbackend._has_big_int("[" + "123456789012345678, " * 10 + "1]"))
+
+  def test_non_finite_floats(self):
+    for backend in available_backends():
+      with self.subTest(backend=backend.name):
+        value = backend.loads('[NaN, Infinity, -Infinity]')
+        self.assertTrue(math.isnan(value[0]))
+        self.assertEqual(value[1:], [math.inf, -math.inf])
+        self.assertEqual(backend.dumps({"a": [math.nan, math.inf, None]}), '{"a": [NaN, Infinity, null]}')
+        self.assertEqual(backend.dumpb([-math.inf]), b"[-Infinity]")
+
+  def test_unsupported_types(self):
+    for backend in available_backends():
+      with self.subTest(backend=backend.name):
+        with self.assertRaises(TypeError):
+          backend.dumps({"t": datetime.now()})
+
+  def test_indent_fallback(self):
+    for backend in available_backends():
+      with self.subTest(backend=backend.name):
+        self.assertEqual(backend.dumps({"a": 1}, indent=3), json.dumps({"a": 1}, indent=3))
+
+  def test_set_backend(self):
+    try:
+      self.assertEqual(jsonbackend.set_backend("json").name, "json")
+      self.assertEqual(jsonbackend.dumps({"a": 1}), '{"a": 1}')
+      self.assertRaises(ValueError, jsonbackend.set_backend, "unknown")
+    finally:
+      jsonbackend.set_backend()
+
+
+  def test_stdlib_format_by_default(self):
+    obj = {"a": [1, "ł"], "b": None}
+    try:
+      for backend in available_backends():
+        with self.subTest(backend=backend.name):
+          jsonbackend.set_backend(backend.name)
+          self.assertEqual(jsonbackend.dumps(obj), json.dumps(obj))
+          self.assertEqual(jsonbackend.dumpb(obj), json.dumps(obj).encode("utf-8"))
+          self.assertEqual(jsonbackend.dumps(obj, fast=True), backend.dumps(obj))
+    finally:
+      jsonbackend.set_backend()
+
+if __name__ == "__main__":
+  unittest.main()